@@ -0,0 +1,25 @@
+"""Add heartbeat timestamp to jobs for long-running lease renewal
+
+Revision ID: 20261019_0005
+Revises: 20260225_0004
+Create Date: 2026-10-19 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0005"
+down_revision = "20260225_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "heartbeat_at")
@@ -0,0 +1,32 @@
+"""Add parent job links for fan-out child jobs
+
+Revision ID: 20261019_0006
+Revises: 20261019_0005
+Create Date: 2026-10-19 00:10:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0006"
+down_revision = "20261019_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("parent_job_id", sa.String(length=36), nullable=True))
+    op.create_index(op.f("ix_jobs_parent_job_id"), "jobs", ["parent_job_id"], unique=False)
+    # Batch mode so SQLite, which cannot add a constraint to an existing table, rebuilds it instead.
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.create_foreign_key("fk_jobs_parent_job_id_jobs", "jobs", ["parent_job_id"], ["id"], ondelete="SET NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_constraint("fk_jobs_parent_job_id_jobs", type_="foreignkey")
+    op.drop_index(op.f("ix_jobs_parent_job_id"), table_name="jobs")
+    op.drop_column("jobs", "parent_job_id")
@@ -0,0 +1,32 @@
+"""Add named queues and priorities to jobs
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19 00:20:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0007"
+down_revision = "20261019_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("queue", sa.String(length=32), nullable=False, server_default="bulk"))
+    op.add_column("jobs", sa.Column("priority", sa.Integer(), nullable=False, server_default="0"))
+    op.execute("UPDATE jobs SET queue = 'interactive' WHERE job_type IN ('analyze', 'branch_replay')")
+    op.create_index(op.f("ix_jobs_queue"), "jobs", ["queue"], unique=False)
+    op.create_index("ix_jobs_status_priority_next_run_at", "jobs", ["status", "priority", "next_run_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_priority_next_run_at", table_name="jobs")
+    op.drop_index(op.f("ix_jobs_queue"), table_name="jobs")
+    op.drop_column("jobs", "priority")
+    op.drop_column("jobs", "queue")
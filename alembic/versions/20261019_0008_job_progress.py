@@ -0,0 +1,38 @@
+"""Add job progress records
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19 00:30:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0008"
+down_revision = "20261019_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_progress",
+        sa.Column("job_id", sa.String(length=36), nullable=False),
+        sa.Column("done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total", sa.Integer(), nullable=True),
+        sa.Column("unit", sa.String(length=32), nullable=False, server_default="items"),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("partial", sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column("throughput", sa.Float(), nullable=True),
+        sa.Column("eta_seconds", sa.Float(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_progress")
@@ -0,0 +1,28 @@
+"""Index created_at on tables listed and swept by retention
+
+Revision ID: 20261019_0009
+Revises: 20261019_0008
+Create Date: 2026-10-19 00:40:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261019_0009"
+down_revision = "20261019_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_jobs_created_at"), "jobs", ["created_at"], unique=False)
+    op.create_index(op.f("ix_audit_logs_created_at"), "audit_logs", ["created_at"], unique=False)
+    op.create_index(op.f("ix_policy_decisions_created_at"), "policy_decisions", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_policy_decisions_created_at"), table_name="policy_decisions")
+    op.drop_index(op.f("ix_audit_logs_created_at"), table_name="audit_logs")
+    op.drop_index(op.f("ix_jobs_created_at"), table_name="jobs")
@@ -0,0 +1,51 @@
+"""Add branch ancestry closure table
+
+Revision ID: 20261019_0010
+Revises: 20261019_0009
+Create Date: 2026-10-19 00:50:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0010"
+down_revision = "20261019_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "branch_ancestry",
+        sa.Column("ancestor_id", sa.String(length=36), nullable=False),
+        sa.Column("descendant_id", sa.String(length=36), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["branches.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["branches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index("ix_branch_ancestry_descendant_depth", "branch_ancestry", ["descendant_id", "depth"], unique=False)
+    op.create_index("ix_branch_ancestry_ancestor_depth", "branch_ancestry", ["ancestor_id", "depth"], unique=False)
+    op.execute(
+        """
+        INSERT INTO branch_ancestry (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE closure (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM branches
+            UNION ALL
+            SELECT b.parent_branch_id, c.descendant_id, c.depth + 1
+            FROM closure c JOIN branches b ON b.id = c.ancestor_id
+            WHERE b.parent_branch_id IS NOT NULL
+        )
+        SELECT closure.ancestor_id, closure.descendant_id, closure.depth
+        FROM closure JOIN branches a ON a.id = closure.ancestor_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_branch_ancestry_ancestor_depth", table_name="branch_ancestry")
+    op.drop_index("ix_branch_ancestry_descendant_depth", table_name="branch_ancestry")
+    op.drop_table("branch_ancestry")
@@ -0,0 +1,24 @@
+"""Index atoms by document, level and ordinal for ordered atom reads
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19 01:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_atoms_document_level_ordinal", "atoms", ["document_id", "atom_level", "ordinal"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_atoms_document_level_ordinal", table_name="atoms")
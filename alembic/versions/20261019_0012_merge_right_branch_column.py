@@ -0,0 +1,49 @@
+"""Copy merge events' right_branch_id into an indexed column
+
+Revision ID: 20261019_0012
+Revises: 20261019_0011
+Create Date: 2026-10-19 01:10:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0012"
+down_revision = "20261019_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("branch_events", sa.Column("merge_right_branch_id", sa.String(length=36), nullable=True))
+    op.create_index(
+        "ix_branch_events_branch_merge_right",
+        "branch_events",
+        ["branch_id", "merge_right_branch_id"],
+        unique=False,
+    )
+    branch_events = sa.table(
+        "branch_events",
+        sa.column("id", sa.String()),
+        sa.column("event_type", sa.String()),
+        sa.column("event_payload", sa.JSON()),
+        sa.column("merge_right_branch_id", sa.String()),
+    )
+    bind = op.get_bind()
+    merges = bind.execute(
+        sa.select(branch_events.c.id, branch_events.c.event_payload).where(branch_events.c.event_type == "merge")
+    ).all()
+    for event_id, payload in merges:
+        right_branch_id = str((payload or {}).get("right_branch_id") or "").strip()
+        if right_branch_id:
+            bind.execute(
+                branch_events.update().where(branch_events.c.id == event_id).values(merge_right_branch_id=right_branch_id)
+            )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_branch_events_branch_merge_right", table_name="branch_events")
+    op.drop_column("branch_events", "merge_right_branch_id")
@@ -0,0 +1,62 @@
+"""Move remix artifacts' request_key out of metadata into an indexed column
+
+Revision ID: 20261019_0013
+Revises: 20261019_0012
+Create Date: 2026-10-19 02:10:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0013"
+down_revision = "20261019_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("remix_artifacts", sa.Column("request_key", sa.String(length=64), nullable=True))
+    op.create_index("ix_remix_artifacts_request_key", "remix_artifacts", ["request_key"], unique=False)
+    remix_artifacts = sa.table(
+        "remix_artifacts",
+        sa.column("id", sa.String()),
+        sa.column("artifact_metadata", sa.JSON()),
+        sa.column("request_key", sa.String()),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(remix_artifacts.c.id, remix_artifacts.c.artifact_metadata)).all()
+    for artifact_id, metadata in rows:
+        request_key = (metadata or {}).get("request_key")
+        if request_key:
+            metadata = {key: value for key, value in metadata.items() if key != "request_key"}
+            bind.execute(
+                remix_artifacts.update()
+                .where(remix_artifacts.c.id == artifact_id)
+                .values(request_key=request_key, artifact_metadata=metadata)
+            )
+
+
+def downgrade() -> None:
+    remix_artifacts = sa.table(
+        "remix_artifacts",
+        sa.column("id", sa.String()),
+        sa.column("artifact_metadata", sa.JSON()),
+        sa.column("request_key", sa.String()),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(remix_artifacts.c.id, remix_artifacts.c.artifact_metadata, remix_artifacts.c.request_key).where(
+            remix_artifacts.c.request_key.is_not(None)
+        )
+    ).all()
+    for artifact_id, metadata, request_key in rows:
+        bind.execute(
+            remix_artifacts.update()
+            .where(remix_artifacts.c.id == artifact_id)
+            .values(artifact_metadata={**(metadata or {}), "request_key": request_key})
+        )
+    op.drop_index("ix_remix_artifacts_request_key", table_name="remix_artifacts")
+    op.drop_column("remix_artifacts", "request_key")
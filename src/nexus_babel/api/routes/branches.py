@@ -215,10 +215,23 @@ def merge_branches(
     response_model=BranchVisualizationResponse,
     dependencies=[Depends(require_auth("viewer"))],
 )
-def branch_visualization(branch_id: str, request: Request) -> BranchVisualizationResponse:
+def branch_visualization(
+    branch_id: str,
+    request: Request,
+    max_depth: int | None = Query(default=None, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=10000),
+    offset: int = Query(default=0, ge=0),
+) -> BranchVisualizationResponse:
     session = open_session(request)
     try:
-        return BranchVisualizationResponse(**request.app.state.evolution_service.get_visualization(session=session, branch_id=branch_id))
+        data = request.app.state.evolution_service.get_visualization(
+            session=session,
+            branch_id=branch_id,
+            max_depth=max_depth,
+            offset=offset,
+            limit=limit,
+        )
+        return BranchVisualizationResponse(**data)
     except Exception as exc:
         raise to_http_exception(exc, default_status=404) from exc
     finally:
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 
 from nexus_babel.api.deps import enforce_mode, open_session, require_auth
@@ -8,9 +15,12 @@
 from nexus_babel.models import Job
 from nexus_babel.schemas import JobStatusResponse, JobSubmitRequest, JobSubmitResponse
 from nexus_babel.services.auth import AuthContext
+from nexus_babel.services.jobs import TERMINAL_JOB_STATUSES
 
 router = APIRouter()
 
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 @router.post("/jobs/submit", response_model=JobSubmitResponse)
 def submit_job(
@@ -33,6 +43,8 @@ def submit_job(
             idempotency_key=payload.idempotency_key,
             created_by=auth_context.owner,
             max_attempts=payload.max_attempts,
+            queue=payload.queue,
+            priority=payload.priority,
         )
         if payload.execution_mode == "sync":
             request.app.state.job_service.execute(session, job)
@@ -42,6 +54,8 @@ def submit_job(
             status=job.status,
             job_type=job.job_type,
             execution_mode=job.execution_mode,  # type: ignore[arg-type]
+            queue=job.queue,
+            priority=job.priority,
         )
     except HTTPException:
         session.rollback()
@@ -65,6 +79,65 @@ def get_job(job_id: str, request: Request) -> JobStatusResponse:
         session.close()
 
 
+def _job_snapshot(request: Request, job_id: str) -> dict[str, Any] | None:
+    session = open_session(request)
+    try:
+        return request.app.state.job_service.get_job_status(session=session, job_id=job_id)
+    finally:
+        session.close()
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _job_event_stream(request: Request, job_id: str, poll_seconds: float) -> AsyncIterator[str]:
+    last_sent: str | None = None
+    idle_seconds = 0.0
+    while True:
+        snapshot = await run_in_threadpool(_job_snapshot, request, job_id)
+        if snapshot is None:
+            # Deleted mid-stream, e.g. archived by a retention sweep.
+            yield _sse("result", {"job_id": job_id, "status": "deleted", "result": None, "error_text": "Job no longer exists"})
+            return
+        finished = snapshot["status"] in TERMINAL_JOB_STATUSES
+        # Running jobs may have checkpointed partial results (e.g. audit findings so far).
+        progress = {key: snapshot[key] for key in ("job_id", "status", "progress")}
+        if not finished and snapshot["result"]:
+            progress["partial_result"] = snapshot["result"]
+        encoded = json.dumps(progress, default=str, sort_keys=True)
+        if encoded != last_sent:
+            yield _sse("progress", progress)
+            last_sent = encoded
+            idle_seconds = 0.0
+        elif idle_seconds >= SSE_KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            idle_seconds = 0.0
+        if finished:
+            yield _sse("result", {key: snapshot[key] for key in ("job_id", "status", "result", "error_text")})
+            return
+        if await request.is_disconnected():
+            return
+        await asyncio.sleep(poll_seconds)
+        idle_seconds += poll_seconds
+
+
+@router.get("/jobs/{job_id}/events", dependencies=[Depends(require_auth("viewer"))])
+def stream_job_events(
+    job_id: str,
+    request: Request,
+    poll_seconds: float | None = Query(default=None, ge=0.05, le=30.0),
+) -> StreamingResponse:
+    if _job_snapshot(request, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    interval = poll_seconds or request.app.state.settings.job_events_poll_seconds
+    return StreamingResponse(
+        _job_event_stream(request, job_id, interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/jobs", dependencies=[Depends(require_auth("viewer"))])
 def list_jobs(request: Request, limit: int = Query(default=100, ge=1, le=1000)) -> dict:
     session = open_session(request)
@@ -76,9 +149,12 @@ def list_jobs(request: Request, limit: int = Query(default=100, ge=1, le=1000))
                     "job_id": j.id,
                     "job_type": j.job_type,
                     "status": j.status,
+                    "queue": j.queue,
+                    "priority": j.priority,
                     "execution_mode": j.execution_mode,
                     "attempt_count": j.attempt_count,
                     "max_attempts": j.max_attempts,
+                    "parent_job_id": j.parent_job_id,
                     "created_at": j.created_at,
                     "updated_at": j.updated_at,
                 }
@@ -13,8 +13,11 @@
     RemixComposeResponse,
     RemixRequest,
     RemixResponse,
+    RemixSweepRequest,
+    RemixSweepResponse,
 )
 from nexus_babel.services.auth import AuthContext
+from nexus_babel.services.remix_sweep import sweep_combinations
 
 router = APIRouter()
 
@@ -42,6 +45,7 @@ def remix_compose(
             persist_artifact=payload.persist_artifact,
         )
         session.commit()
+        request.app.state.metrics.inc("remix.compose.cache_hit" if result.get("cache_hit") else "remix.compose.cache_miss")
         artifact = result.get("remix_artifact")
         branch = result.get("branch")
         event = result.get("event")
@@ -61,6 +65,7 @@ def remix_compose(
             new_branch_id=getattr(branch, "id", None),
             event_id=getattr(event, "id", None),
             diff_summary=(event.diff_summary if event is not None else {}),
+            cache_hit=bool(result.get("cache_hit")),
         )
     except HTTPException:
         session.rollback()
@@ -73,6 +78,57 @@ def remix_compose(
         session.close()
 
 
+@router.post("/remix/sweep", response_model=RemixSweepResponse)
+def remix_sweep(
+    payload: RemixSweepRequest,
+    request: Request,
+    auth_context: AuthContext = Depends(require_auth("operator")),  # noqa: B008
+) -> RemixSweepResponse:
+    session = open_session(request)
+    try:
+        enforce_mode(request, auth_context, payload.mode)
+        sweep_args = {
+            "source_document_id": payload.source_document_id,
+            "source_branch_id": payload.source_branch_id,
+            "target_document_id": payload.target_document_id,
+            "target_branch_id": payload.target_branch_id,
+            "strategies": list(payload.strategies),
+            "seeds": list(payload.seeds),
+            "mode": payload.mode,
+            "atom_levels": list(payload.atom_levels or []),
+            "persist_artifacts": payload.persist_artifacts,
+            "include_results": payload.include_results,
+            "workers": payload.workers,
+        }
+        if payload.execution_mode == "async":
+            if not request.app.state.settings.async_jobs_enabled:
+                raise HTTPException(status_code=400, detail="Async jobs are disabled by feature flag")
+            # Reject oversized sweeps now rather than in the worker.
+            sweep_combinations(sweep_args["strategies"], sweep_args["seeds"])
+            job = request.app.state.job_service.submit(
+                session=session,
+                job_type="remix_sweep",
+                payload=sweep_args,
+                execution_mode="async",
+                created_by=auth_context.owner,
+            )
+            session.commit()
+            return RemixSweepResponse(job_id=job.id, status=job.status)
+
+        result = request.app.state.remix_service.sweep(session=session, **sweep_args)
+        session.commit()
+        return RemixSweepResponse(status="completed", summary=result["summary"], results=result["results"])
+    except HTTPException:
+        session.rollback()
+        raise
+    except Exception as exc:
+        session.rollback()
+        default_status = 404 if isinstance(exc, LookupError) else 400
+        raise to_http_exception(exc, default_status=default_status) from exc
+    finally:
+        session.close()
+
+
 @router.get("/remix/{remix_artifact_id}", response_model=RemixArtifactResponse, dependencies=[Depends(require_auth("viewer"))])
 def remix_artifact_detail(remix_artifact_id: str, request: Request) -> RemixArtifactResponse:
     session = open_session(request)
@@ -25,6 +25,58 @@ class Settings(BaseSettings):
     worker_poll_seconds: float = 1.0
     worker_lease_seconds: int = 30
     worker_name: str = "nexus-worker"
+    worker_prefetch_count: int = 4
+    worker_stale_recovery_seconds: float = 15.0
+    worker_heartbeat_seconds: float = 10.0
+    worker_heartbeat_timeout_seconds: float = 60.0
+    worker_wakeup_enabled: bool = True
+    worker_idle_max_seconds: float = 30.0
+    worker_signal_dir: Path | None = None
+    worker_queues: list[str] = Field(default_factory=list)
+    job_queue_routes: dict[str, str] = Field(
+        default_factory=lambda: {
+            "analyze": "interactive",
+            "branch_replay": "interactive",
+            "branch_compaction": "bulk",
+            "branch_replay_batch": "bulk",
+            "ingest_batch": "bulk",
+            "ingest_chunk": "bulk",
+            "ingest_reduce": "bulk",
+            "integrity_audit": "bulk",
+            "remix_sweep": "bulk",
+            "retention_sweep": "bulk",
+        }
+    )
+    job_queue_weights: dict[str, int] = Field(default_factory=lambda: {"interactive": 4, "bulk": 1})
+    job_default_queue: str = "bulk"
+    ingest_fanout_chunk_size: int = 1
+    integrity_audit_page_size: int = 500
+    job_progress_interval_seconds: float = 1.0
+    job_events_poll_seconds: float = 1.0
+    retention_ttl_days: dict[str, float] = Field(
+        default_factory=lambda: {
+            "jobs": 30,
+            "job_attempts": 30,
+            "job_artifacts": 30,
+            "audit_logs": 180,
+            "policy_decisions": 180,
+        }
+    )
+    retention_batch_size: int = 1000
+    retention_interval_hours: float | None = None
+    branch_text_cache_chars: int = 32_000_000
+    replay_cache_chars: int = 64_000_000
+    replay_cache_dir: Path | None = None
+    visualization_cache_entries: int = 256
+    remix_cache_entries: int = 256
+    remix_sweep_workers: int = 0
+    replay_batch_workers: int = 0
+    branch_compaction_min_age_days: float = 30.0
+    branch_compaction_min_chain_length: int = 8
+    branch_compaction_batch_size: int = 1000
+    checkpoint_target_replay_ms: float = 50.0
+    checkpoint_max_events: int = 10
+    checkpoint_compression_level: int = 1
     corpus_root: Path = Field(default_factory=lambda: Path.cwd())
     object_storage_root: Path = Field(default_factory=lambda: Path.cwd() / "object_storage")
     seed_registry_path: Path = Field(default_factory=lambda: Path.cwd() / "docs" / "alexandria_babel" / "seed_corpus_registry.yaml")
@@ -22,10 +22,12 @@
 from nexus_babel.services.governance import GovernanceService
 from nexus_babel.services.hypergraph import HypergraphProjector
 from nexus_babel.services.ingestion import IngestionService
+from nexus_babel.services.job_wakeup import JobWakeup
 from nexus_babel.services.jobs import JobService
 from nexus_babel.services.metrics import MetricsService
 from nexus_babel.services.plugins import PluginRegistry
 from nexus_babel.services.remix import RemixService
+from nexus_babel.services.retention import RetentionService
 from nexus_babel.services.rhetoric import RhetoricalAnalyzer
 from nexus_babel.services.seed_corpus import SeedCorpusService
 
@@ -117,22 +119,34 @@ async def lifespan(app: FastAPI):
     app.state.rhetorical_analyzer = RhetoricalAnalyzer()
     app.state.analysis_service = AnalysisService(app.state.rhetorical_analyzer, app.state.plugin_registry)
     app.state.governance_service = GovernanceService()
-    app.state.evolution_service = EvolutionService()
+    app.state.evolution_service = EvolutionService(settings=settings)
     app.state.ingestion_service = IngestionService(settings=settings, hypergraph=app.state.hypergraph)
     app.state.remix_service = RemixService(
         evolution_service=app.state.evolution_service,
         governance_service=app.state.governance_service,
+        result_cache_entries=settings.remix_cache_entries,
+        sweep_workers=settings.remix_sweep_workers,
     )
     app.state.seed_corpus_service = SeedCorpusService(
         seeds_dir=settings.corpus_root / "seeds",
         registry_path=settings.seed_registry_path,
     )
+    app.state.retention_service = RetentionService(settings=settings)
+    app.state.job_wakeup = JobWakeup(
+        database_url=settings.database_url,
+        signal_dir=settings.worker_signal_dir,
+        enabled=settings.worker_wakeup_enabled,
+    )
+    app.state.job_wakeup.attach(app.state.db.SessionLocal)
     app.state.job_service = JobService(
         settings=settings,
         ingestion_service=app.state.ingestion_service,
         analysis_service=app.state.analysis_service,
         evolution_service=app.state.evolution_service,
         hypergraph=app.state.hypergraph,
+        wakeup=app.state.job_wakeup,
+        retention_service=app.state.retention_service,
+        remix_service=app.state.remix_service,
     )
 
     @app.middleware("http")
@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -87,6 +87,11 @@ class Atom(Base):
 
     document: Mapped[Document] = relationship(back_populates="atoms")
 
+    __table_args__ = (
+        # Serves ordered per-level atom reads (remix contexts) without a sort.
+        Index("ix_atoms_document_level_ordinal", "document_id", "atom_level", "ordinal"),
+    )
+
 
 class AnalysisRun(Base):
     __tablename__ = "analysis_runs"
@@ -136,10 +141,16 @@ class BranchEvent(Base):
     event_hash: Mapped[str] = mapped_column(String(128), index=True)
     diff_summary: Mapped[dict] = mapped_column(JSON, default=dict)
     result_snapshot: Mapped[dict] = mapped_column(JSON, default=dict)
+    # The payload's right_branch_id for merge events, copied out so merge edges can be walked by index.
+    merge_right_branch_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
     branch: Mapped[Branch] = relationship(back_populates="events")
 
+    __table_args__ = (
+        Index("ix_branch_events_branch_merge_right", "branch_id", "merge_right_branch_id"),
+    )
+
 
 class RemixArtifact(Base):
     __tablename__ = "remix_artifacts"
@@ -166,6 +177,8 @@ class RemixArtifact(Base):
     )
     lineage_graph_refs: Mapped[dict] = mapped_column(JSON, default=dict)
     artifact_metadata: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Key of the compose/sweep request that produced the artifact, for reuse by identical requests.
+    request_key: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
 
     source_links: Mapped[list[RemixSourceLink]] = relationship(back_populates="remix_artifact", cascade="all, delete-orphan")
@@ -215,7 +228,7 @@ class PolicyDecision(Base):
     redactions: Mapped[list] = mapped_column(JSON, default=list)
     decision_trace: Mapped[dict] = mapped_column(JSON, default=dict)
     audit_id: Mapped[str] = mapped_column(String(36), index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
 
 
 class User(Base):
@@ -248,7 +261,7 @@ class AuditLog(Base):
     mode: Mapped[str] = mapped_column(String(16), index=True)
     actor: Mapped[str] = mapped_column(String(128), default="system")
     details: Mapped[dict] = mapped_column(JSON, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
 
 
 class Job(Base):
@@ -257,6 +270,8 @@ class Job(Base):
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     job_type: Mapped[str] = mapped_column(String(64), index=True)
     status: Mapped[str] = mapped_column(String(32), default="queued", index=True)
+    queue: Mapped[str] = mapped_column(String(32), default="bulk", index=True)
+    priority: Mapped[int] = mapped_column(Integer, default=0)
     payload: Mapped[dict] = mapped_column(JSON, default=dict)
     result: Mapped[dict] = mapped_column(JSON, default=dict)
     error_text: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -267,8 +282,15 @@ class Job(Base):
     next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
     lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
     lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Named to match the constraint the 20261019_0006 migration adds.
+    parent_job_id: Mapped[str | None] = mapped_column(
+        ForeignKey("jobs.id", ondelete="SET NULL", name="fk_jobs_parent_job_id_jobs"),
+        nullable=True,
+        index=True,
+    )
     created_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
     attempts: Mapped[list[JobAttempt]] = relationship(back_populates="job", cascade="all, delete-orphan")
@@ -276,6 +298,7 @@ class Job(Base):
 
     __table_args__ = (
         UniqueConstraint("job_type", "idempotency_key", name="uq_job_idempotency"),
+        Index("ix_jobs_status_priority_next_run_at", "status", "priority", "next_run_at"),
     )
 
 
@@ -307,6 +330,20 @@ class JobArtifact(Base):
     job: Mapped[Job] = relationship(back_populates="artifacts")
 
 
+class JobProgress(Base):
+    __tablename__ = "job_progress"
+
+    job_id: Mapped[str] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    done: Mapped[int] = mapped_column(Integer, default=0)
+    total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    unit: Mapped[str] = mapped_column(String(32), default="items")
+    message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    partial: Mapped[dict] = mapped_column(JSON, default=dict)
+    throughput: Mapped[float | None] = mapped_column(Float, nullable=True)
+    eta_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+
 class LayerOutput(Base):
     __tablename__ = "layer_outputs"
 
@@ -356,3 +393,16 @@ class BranchCheckpoint(Base):
     __table_args__ = (
         UniqueConstraint("branch_id", "event_index", name="uq_branch_checkpoint"),
     )
+
+
+class BranchAncestry(Base):
+    __tablename__ = "branch_ancestry"
+
+    ancestor_id: Mapped[str] = mapped_column(ForeignKey("branches.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[str] = mapped_column(ForeignKey("branches.id", ondelete="CASCADE"), primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        Index("ix_branch_ancestry_descendant_depth", "descendant_id", "depth"),
+        Index("ix_branch_ancestry_ancestor_depth", "ancestor_id", "depth"),
+    )
@@ -9,7 +9,7 @@
 Mode = Literal["RAW", "PUBLIC"]
 ExecutionMode = Literal["sync", "async", "shadow"]
 RemixStrategy = Literal["interleave", "thematic_blend", "temporal_layer", "glyph_collide"]
-MergeStrategy = Literal["left_wins", "right_wins", "interleave"]
+MergeStrategy = Literal["left_wins", "right_wins", "interleave", "three_way"]
 
 
 class GlyphSeed(BaseModel):
@@ -179,6 +179,8 @@ class BranchVisualizationSummary(BaseModel):
     lineage_depth: int
     secondary_lineage_branch_count: int = 0
     merge_secondary_edge_count: int = 0
+    max_depth: int | None = None
+    depth_truncated: bool = False
 
 
 class BranchVisualizationResponse(BaseModel):
@@ -187,6 +189,9 @@ class BranchVisualizationResponse(BaseModel):
     nodes: list[BranchVisualizationNode] = Field(default_factory=list)
     edges: list[BranchVisualizationEdge] = Field(default_factory=list)
     summary: BranchVisualizationSummary
+    total: int = 0
+    offset: int = 0
+    limit: int | None = None
 
 
 class RhetoricalAnalysisRequest(BaseModel):
@@ -223,6 +228,8 @@ class JobSubmitRequest(BaseModel):
     execution_mode: ExecutionMode = "async"
     idempotency_key: str | None = None
     max_attempts: int = Field(default=3, ge=1, le=10)
+    queue: str | None = None
+    priority: int = Field(default=0, ge=-100, le=100)
 
 
 class JobSubmitResponse(BaseModel):
@@ -230,6 +237,8 @@ class JobSubmitResponse(BaseModel):
     status: str
     job_type: str
     execution_mode: ExecutionMode
+    queue: str
+    priority: int = 0
 
 
 class JobAttemptView(BaseModel):
@@ -248,10 +257,24 @@ class JobArtifactView(BaseModel):
     created_at: datetime
 
 
+class JobProgressView(BaseModel):
+    done: int
+    total: int | None = None
+    unit: str = "items"
+    percent: float | None = None
+    throughput: float | None = None
+    eta_seconds: float | None = None
+    message: str | None = None
+    partial: dict[str, Any] = Field(default_factory=dict)
+    updated_at: datetime | None = None
+
+
 class JobStatusResponse(BaseModel):
     job_id: str
     job_type: str
     status: str
+    queue: str
+    priority: int = 0
     payload: dict[str, Any] = Field(default_factory=dict)
     result: dict[str, Any] = Field(default_factory=dict)
     error_text: str | None = None
@@ -262,6 +285,10 @@ class JobStatusResponse(BaseModel):
     next_run_at: datetime
     lease_owner: str | None = None
     lease_expires_at: datetime | None = None
+    heartbeat_at: datetime | None = None
+    parent_job_id: str | None = None
+    child_status_counts: dict[str, int] = Field(default_factory=dict)
+    progress: JobProgressView | None = None
     created_by: str | None = None
     created_at: datetime
     updated_at: datetime
@@ -297,9 +324,11 @@ class BranchCompareResponse(BaseModel):
     left_hash: str
     right_hash: str
     distance: int
+    distance_exact: bool = True
     same: bool
     preview_left: str
     preview_right: str
+    diff: dict[str, Any] = Field(default_factory=dict)
 
 
 class RemixRequest(BaseModel):
@@ -354,6 +383,29 @@ class RemixComposeResponse(BaseModel):
     new_branch_id: str | None = None
     event_id: str | None = None
     diff_summary: dict[str, Any] = Field(default_factory=dict)
+    cache_hit: bool = False
+
+
+class RemixSweepRequest(BaseModel):
+    source_document_id: str | None = None
+    source_branch_id: str | None = None
+    target_document_id: str | None = None
+    target_branch_id: str | None = None
+    strategies: list[RemixStrategy] = Field(min_length=1)
+    seeds: list[int] = Field(min_length=1)
+    mode: Mode = "PUBLIC"
+    atom_levels: list[str] = Field(default_factory=list)
+    persist_artifacts: bool = True
+    include_results: bool = False
+    execution_mode: Literal["sync", "async"] = "sync"
+    workers: int | None = Field(default=None, ge=1)
+
+
+class RemixSweepResponse(BaseModel):
+    job_id: str | None = None
+    status: str
+    summary: dict[str, Any] = Field(default_factory=dict)
+    results: list[dict[str, Any]] = Field(default_factory=list)
 
 
 class RemixSourceLinkView(BaseModel):
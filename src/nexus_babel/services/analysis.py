@@ -9,6 +9,7 @@
 from sqlalchemy.orm import Session
 
 from nexus_babel.models import AnalysisRun, Branch, Document, LayerOutput
+from nexus_babel.services.evolution_text import materialize_branch_text
 from nexus_babel.services.plugins import PluginRegistry
 from nexus_babel.services.rhetoric import RhetoricalAnalyzer
 from nexus_babel.services.text_utils import split_paragraphs, split_sentences, tokenize_words
@@ -48,7 +49,7 @@ def analyze(
             branch = session.scalar(select(Branch).where(Branch.id == branch_id))
             if not branch:
                 raise ValueError(f"branch_id {branch_id} not found")
-            text = str((branch.state_snapshot or {}).get("current_text", ""))
+            text = materialize_branch_text(session, branch)
             hypergraph_ids = {"branch_id": branch.id}
             source_metadata = dict(branch.state_snapshot or {})
         else:
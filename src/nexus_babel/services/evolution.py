@@ -2,16 +2,51 @@
 
 import hashlib
 import json
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any
+from uuid import uuid4
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from nexus_babel.models import Branch, BranchCheckpoint, BranchEvent, Document
-from nexus_babel.services import evolution_events, evolution_merge, evolution_replay, evolution_visualization
+from nexus_babel.config import Settings
+from nexus_babel.models import Branch, BranchCheckpoint, BranchEvent, Document, utcnow
+from nexus_babel.services import (
+    evolution_ancestry,
+    evolution_bulk_replay,
+    evolution_checkpoints,
+    evolution_compaction,
+    evolution_diff,
+    evolution_events,
+    evolution_merge,
+    evolution_replay,
+    evolution_text,
+    evolution_visualization,
+)
 from nexus_babel.services.evolution_types import DriftResult
 
 
+@dataclass
+class _ChainHead:
+    branch_id: str | None
+    root_document_id: str | None
+    text: str
+    text_hash: str
+    lineage_event_count: int
+    replay_debt: dict[str, Any]
+    branch_version: int
+
+
+def _merge_right_branch_id(event_type: str, payload: dict[str, Any]) -> str | None:
+    if event_type != "merge":
+        return None
+    return str(payload.get("right_branch_id") or "").strip() or None
+
+
 class EvolutionService:
     NATURAL_MAP = dict(evolution_events.NATURAL_MAP)
     REVERSE_NATURAL_MAP = dict(evolution_events.REVERSE_NATURAL_MAP)
@@ -19,6 +54,30 @@ class EvolutionService:
     PHASES = set(evolution_events.PHASES)
     MERGE_STRATEGIES = set(evolution_events.MERGE_STRATEGIES)
 
+    def __init__(self, settings: Settings | None = None):
+        self.checkpoint_policy = evolution_checkpoints.CheckpointPolicy()
+        if settings is not None:
+            self.checkpoint_policy = evolution_checkpoints.CheckpointPolicy(
+                target_replay_ms=settings.checkpoint_target_replay_ms,
+                max_events=settings.checkpoint_max_events,
+                compression_level=settings.checkpoint_compression_level,
+            )
+        cache_chars = settings.branch_text_cache_chars if settings else evolution_text.DEFAULT_TEXT_CACHE_CHARS
+        self.text_cache = evolution_text.TextLRUCache(cache_chars)
+        # Replayed lineage texts keyed by (branch_id, text_hash from the branch's snapshot), shared by
+        # timeline, replay, compare and merge.
+        self.replay_cache = evolution_text.TextLRUCache(
+            settings.replay_cache_chars if settings else evolution_text.DEFAULT_TEXT_CACHE_CHARS,
+            persist_dir=settings.replay_cache_dir if settings else None,
+        )
+        self.replay_batch_workers = settings.replay_batch_workers if settings else 1
+        self.compaction_min_age_days = settings.branch_compaction_min_age_days if settings else 30.0
+        self.compaction_min_chain_length = settings.branch_compaction_min_chain_length if settings else 8
+        self.compaction_batch_size = settings.branch_compaction_batch_size if settings else 1000
+        self.visualization_cache = evolution_visualization.GraphLRUCache(
+            settings.visualization_cache_entries if settings else evolution_visualization.DEFAULT_GRAPH_CACHE_ENTRIES
+        )
+
     def evolve_branch(
         self,
         session: Session,
@@ -29,78 +88,17 @@ def evolve_branch(
         mode: str,
     ) -> tuple[Branch, BranchEvent]:
         payload = self._validate_event_payload(event_type, event_payload)
-        parent = None
-        lineage_event_count = 0
-        if parent_branch_id:
-            parent = session.scalar(select(Branch).where(Branch.id == parent_branch_id))
-            if not parent:
-                raise ValueError(f"Parent branch {parent_branch_id} not found")
-            root_document_id = parent.root_document_id
-            base_text = str((parent.state_snapshot or {}).get("current_text", ""))
-            lineage_event_count = self._lineage_event_count(session, parent)
-            expected_parent_event_index = payload.get("expected_parent_event_index")
-            if expected_parent_event_index is not None and int(expected_parent_event_index) != lineage_event_count:
-                raise ValueError(
-                    f"Optimistic concurrency violation: expected_parent_event_index={expected_parent_event_index} actual={lineage_event_count}"
-                )
-        else:
-            if not root_document_id:
-                raise ValueError("root_document_id is required when parent_branch_id is not provided")
-            doc = session.scalar(select(Document).where(Document.id == root_document_id))
-            if not doc:
-                raise ValueError(f"Root document {root_document_id} not found")
-            base_text = str((doc.provenance or {}).get("extracted_text", ""))
-
-        drift = self._apply_event(base_text, event_type=event_type, event_payload=payload)
-        new_hash = hashlib.sha256(drift.output_text.encode("utf-8")).hexdigest()
+        head = self._chain_head(session, parent_branch_id, root_document_id)
+        new_branch, event, checkpoint, next_head = self._link(head, event_type, payload, mode)
 
-        new_branch = Branch(
-            parent_branch_id=parent.id if parent else None,
-            root_document_id=root_document_id,
-            name=f"branch-{event_type}",
-            mode=mode.upper(),
-            state_snapshot={
-                "current_text": drift.output_text,
-                "phase": payload.get("phase", "expansion"),
-                "text_hash": new_hash,
-            },
-            branch_version=(parent.branch_version + 1) if parent else 1,
-        )
         session.add(new_branch)
         session.flush()
-
-        current_event_index = self._next_event_index(session, new_branch.id)
-        event_hash = hashlib.sha256(
-            f"{new_branch.id}:{current_event_index}:{event_type}:{json.dumps(payload, sort_keys=True)}:{new_hash}".encode("utf-8")
-        ).hexdigest()
-
-        event = BranchEvent(
-            branch_id=new_branch.id,
-            event_index=current_event_index,
-            event_type=event_type,
-            event_payload=payload,
-            payload_schema_version="v2",
-            event_hash=event_hash,
-            diff_summary=drift.diff_summary,
-            result_snapshot={
-                "text_hash": new_hash,
-                "preview": drift.output_text[:500],
-            },
-        )
+        evolution_ancestry.record_branch_ancestry(session, new_branch)
+        self.text_cache.put((new_branch.id, next_head.text_hash), next_head.text)
         session.add(event)
         session.flush()
-
-        total_lineage_events = lineage_event_count + 1
-        if total_lineage_events % 10 == 0:
-            session.add(
-                BranchCheckpoint(
-                    branch_id=new_branch.id,
-                    event_index=total_lineage_events,
-                    snapshot_hash=new_hash,
-                    snapshot_compressed=self._compress_snapshot(new_branch.state_snapshot),
-                )
-            )
-
+        if checkpoint is not None:
+            session.add(checkpoint)
         return new_branch, event
 
     def multi_evolve(
@@ -114,43 +112,165 @@ def multi_evolve(
         if not events:
             raise ValueError("events must not be empty")
 
-        created_pairs: list[tuple[Branch, BranchEvent]] = []
-        current_parent_branch_id = parent_branch_id
-        current_root_document_id = root_document_id
-
+        steps: list[tuple[str, dict[str, Any]]] = []
         for idx, item in enumerate(events):
             event_type = str((item or {}).get("event_type", "")).strip()
             event_payload = dict((item or {}).get("event_payload") or {})
             if not event_type:
                 raise ValueError(f"events[{idx}].event_type is required")
+            steps.append((event_type, self._validate_event_payload(event_type, event_payload)))
+
+        # The running text, lineage count and replay debt stay in memory, so the chain costs one parent
+        # lookup up front and a few bulk inserts at the end regardless of its length.
+        head = self._chain_head(session, parent_branch_id, root_document_id)
+        branches: list[Branch] = []
+        created_events: list[BranchEvent] = []
+        checkpoints: list[BranchCheckpoint] = []
+        for event_type, payload in steps:
+            branch, event, checkpoint, head = self._link(head, event_type, payload, mode)
+            branches.append(branch)
+            created_events.append(event)
+            if checkpoint is not None:
+                checkpoints.append(checkpoint)
+
+        session.add_all(branches)
+        session.flush()
+        evolution_ancestry.record_chain_ancestry(session, parent_branch_id, [branch.id for branch in branches])
+        session.add_all(created_events)
+        session.add_all(checkpoints)
+        session.flush()
+
+        final_branch = branches[-1]
+        self.text_cache.put((final_branch.id, head.text_hash), head.text)
+        return {
+            "branches": branches,
+            "events": created_events,
+            "branch_ids": [branch.id for branch in branches],
+            "event_ids": [event.id for event in created_events],
+            "final_branch_id": final_branch.id,
+            "event_count": len(branches),
+            "final_text_hash": head.text_hash,
+            "final_preview": head.text[:500],
+        }
+
+    def _chain_head(self, session: Session, parent_branch_id: str | None, root_document_id: str | None) -> _ChainHead:
+        if parent_branch_id:
+            parent = session.scalar(select(Branch).where(Branch.id == parent_branch_id))
+            if not parent:
+                raise ValueError(f"Parent branch {parent_branch_id} not found")
+            text = self.branch_text(session, parent)
+            lineage_event_count = self._lineage_event_count(session, parent)
+            return _ChainHead(
+                branch_id=parent.id,
+                root_document_id=parent.root_document_id,
+                text=text,
+                text_hash=str((parent.state_snapshot or {}).get("text_hash") or hashlib.sha256(text.encode("utf-8")).hexdigest()),
+                lineage_event_count=lineage_event_count,
+                replay_debt=self._replay_debt(session, parent, lineage_event_count),
+                branch_version=parent.branch_version,
+            )
+        if not root_document_id:
+            raise ValueError("root_document_id is required when parent_branch_id is not provided")
+        doc = session.scalar(select(Document).where(Document.id == root_document_id))
+        if not doc:
+            raise ValueError(f"Root document {root_document_id} not found")
+        text = str((doc.provenance or {}).get("extracted_text", ""))
+        return _ChainHead(
+            branch_id=None,
+            root_document_id=root_document_id,
+            text=text,
+            text_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            lineage_event_count=0,
+            replay_debt={"events": 0, "cost_ms": 0.0},
+            branch_version=0,
+        )
 
-            branch, event = self.evolve_branch(
-                session=session,
-                parent_branch_id=current_parent_branch_id,
-                root_document_id=current_root_document_id,
-                event_type=event_type,
-                event_payload=event_payload,
-                mode=mode,
+    def _link(
+        self,
+        head: _ChainHead,
+        event_type: str,
+        payload: dict[str, Any],
+        mode: str,
+    ) -> tuple[Branch, BranchEvent, BranchCheckpoint | None, _ChainHead]:
+        """Build (without persisting) the branch, event and optional checkpoint for one event on ``head``."""
+        expected_parent_event_index = payload.get("expected_parent_event_index")
+        if head.branch_id and expected_parent_event_index is not None and int(expected_parent_event_index) != head.lineage_event_count:
+            raise ValueError(
+                f"Optimistic concurrency violation: expected_parent_event_index={expected_parent_event_index} actual={head.lineage_event_count}"
             )
-            created_pairs.append((branch, event))
-            current_parent_branch_id = branch.id
-            current_root_document_id = branch.root_document_id
 
-        final_branch = created_pairs[-1][0]
-        final_snapshot = dict(final_branch.state_snapshot or {})
-        final_text = str(final_snapshot.get("current_text", ""))
-        final_text_hash = str(final_snapshot.get("text_hash") or hashlib.sha256(final_text.encode("utf-8")).hexdigest())
+        started = time.perf_counter()
+        drift = self._apply_event(head.text, event_type=event_type, event_payload=payload)
+        apply_ms = (time.perf_counter() - started) * 1000.0
+        new_hash = hashlib.sha256(drift.output_text.encode("utf-8")).hexdigest()
 
-        return {
-            "branches": [branch for branch, _ in created_pairs],
-            "events": [event for _, event in created_pairs],
-            "branch_ids": [branch.id for branch, _ in created_pairs],
-            "event_ids": [event.id for _, event in created_pairs],
-            "final_branch_id": final_branch.id,
-            "event_count": len(created_pairs),
-            "final_text_hash": final_text_hash,
-            "final_preview": final_text[:500],
+        total_lineage_events = head.lineage_event_count + 1
+        policy = self.checkpoint_policy
+        replay_debt = policy.next_debt(head.replay_debt, policy.event_cost_ms(event_type, len(head.text), apply_ms))
+        write_checkpoint = policy.should_checkpoint(replay_debt)
+        if write_checkpoint:
+            replay_debt = {"events": 0, "cost_ms": 0.0}
+        state_snapshot: dict[str, Any] = {
+            "phase": payload.get("phase", "expansion"),
+            "text_hash": new_hash,
+            "replay_debt": replay_debt,
         }
+        # Roots keep their text inline; checkpointed branches are keyframes; everything else is a delta.
+        if head.branch_id is None:
+            state_snapshot["current_text"] = drift.output_text
+        elif write_checkpoint:
+            state_snapshot["text_delta"] = {"op": "checkpoint", "event_index": total_lineage_events}
+        else:
+            state_snapshot["text_delta"] = evolution_text.encode_text_delta(head.branch_id, head.text, drift.output_text)
+
+        new_branch = Branch(
+            id=str(uuid4()),
+            parent_branch_id=head.branch_id,
+            root_document_id=head.root_document_id,
+            name=f"branch-{event_type}",
+            mode=mode.upper(),
+            state_snapshot=state_snapshot,
+            branch_version=head.branch_version + 1,
+        )
+        # A freshly created branch has no events yet, so its first event index is always 1.
+        current_event_index = 1
+        event_hash = hashlib.sha256(
+            f"{new_branch.id}:{current_event_index}:{event_type}:{json.dumps(payload, sort_keys=True)}:{new_hash}".encode()
+        ).hexdigest()
+        event = BranchEvent(
+            branch_id=new_branch.id,
+            event_index=current_event_index,
+            event_type=event_type,
+            event_payload=payload,
+            payload_schema_version="v2",
+            event_hash=event_hash,
+            diff_summary=drift.diff_summary,
+            merge_right_branch_id=_merge_right_branch_id(event_type, payload),
+            result_snapshot={
+                "text_hash": new_hash,
+                "preview": drift.output_text[:500],
+            },
+        )
+        checkpoint = None
+        if write_checkpoint:
+            checkpoint = BranchCheckpoint(
+                branch_id=new_branch.id,
+                event_index=total_lineage_events,
+                snapshot_hash=new_hash,
+                snapshot_compressed=self._compress_snapshot(
+                    {"current_text": drift.output_text, "phase": state_snapshot["phase"], "text_hash": new_hash}
+                ),
+            )
+        next_head = _ChainHead(
+            branch_id=new_branch.id,
+            root_document_id=head.root_document_id,
+            text=drift.output_text,
+            text_hash=new_hash,
+            lineage_event_count=total_lineage_events,
+            replay_debt=replay_debt,
+            branch_version=new_branch.branch_version,
+        )
+        return new_branch, event, checkpoint, next_head
 
     def merge_branches(
         self,
@@ -176,14 +296,23 @@ def merge_branches(
         if lca is None and left_branch.root_document_id != right_branch.root_document_id:
             raise ValueError("Branches do not share a common ancestor or root document")
 
-        left_text, _, _ = self._replay_lineage_text(session, left_branch, use_checkpoints=True)
-        right_text, _, _ = self._replay_lineage_text(session, right_branch, use_checkpoints=True)
-        merged_text = self._merge_texts(left_text, right_text, normalized_strategy)
+        left_text = self._replayed_text(session, left_branch)
+        right_text = self._replayed_text(session, right_branch)
+        three_way = None
+        base_text = None
+        if normalized_strategy == "three_way":
+            base_text = self._merge_base_text(session, lca, left_branch)
+            three_way = evolution_merge.three_way_merge(base_text, left_text, right_text)
+            merged_text = three_way.merged_text
+        else:
+            merged_text = self._merge_texts(left_text, right_text, normalized_strategy)
         conflict_semantics = self._build_merge_conflict_semantics(
             left_text=left_text,
             right_text=right_text,
             merged_text=merged_text,
             strategy=normalized_strategy,
+            three_way=three_way,
+            base_text=base_text,
         )
 
         merge_payload = {
@@ -224,21 +353,60 @@ def get_timeline(self, session: Session, branch_id: str) -> dict[str, Any]:
             },
         }
 
-    def get_visualization(self, session: Session, branch_id: str) -> dict[str, Any]:
+    def get_visualization(
+        self,
+        session: Session,
+        branch_id: str,
+        *,
+        max_depth: int | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> dict[str, Any]:
         branch = session.scalar(select(Branch).where(Branch.id == branch_id))
         if not branch:
             raise ValueError(f"Branch {branch_id} not found")
+        if max_depth is not None and max_depth < 0:
+            raise ValueError("max_depth must be >= 0")
+
+        if self._lineage_overridden():
+            graph = self._walk_visualization_graph(session, branch)
+            return evolution_visualization.paginate_visualization_graph(graph, offset=offset, limit=limit)
+
+        # The reachable merge DAG and its head hashes are cheap id-level reads; full branches and
+        # events are only loaded (in two more queries) when the assembled graph is not cached.
+        depths = evolution_visualization.reachable_branch_depths(session, branch.id, max_depth=max_depth)
+        depth_truncated = max_depth is not None and any(depth > max_depth for depth in depths.values())
+        branch_ids = sorted(node_id for node_id, depth in depths.items() if max_depth is None or depth <= max_depth)
+        heads = evolution_visualization.head_event_hashes(session, branch_ids)
+        cache_key = evolution_visualization.graph_cache_key(branch.id, max_depth, heads, branch_ids)
+        graph = self.visualization_cache.get(cache_key)
+        if graph is None:
+            primary_lineage, branches_by_id, branch_events_by_id = evolution_visualization.load_visualization_graph(
+                session, branch, branch_ids
+            )
+            graph = evolution_visualization.assemble_visualization_graph(
+                branch=branch,
+                primary_lineage=primary_lineage,
+                branches_by_id=branches_by_id,
+                branch_events_by_id=branch_events_by_id,
+                max_depth=max_depth,
+                depth_truncated=depth_truncated,
+            )
+            self.visualization_cache.put(cache_key, graph)
+        return evolution_visualization.paginate_visualization_graph(graph, offset=offset, limit=limit)
 
+    def _walk_visualization_graph(self, session: Session, branch: Branch) -> dict[str, Any]:
+        # Node-by-node walk that honours a custom _lineage hook.
         primary_lineage = self._lineage(session, branch)
         branches_by_id: dict[str, Branch] = {node.id: node for node in primary_lineage}
         branch_events_by_id: dict[str, list[BranchEvent]] = {}
-        scan_queue: list[Branch] = list(primary_lineage)
+        scan_queue: deque[Branch] = deque(primary_lineage)
         scanned: set[str] = set()
 
         # Expand graph to include merge secondary parent lineages so secondary-parent
         # edges point to actual nodes in the graph.
         while scan_queue:
-            node = scan_queue.pop(0)
+            node = scan_queue.popleft()
             if node.id in scanned:
                 continue
             scanned.add(node.id)
@@ -253,10 +421,7 @@ def get_visualization(self, session: Session, branch_id: str) -> dict[str, Any]:
                 right_branch_id = str((event.event_payload or {}).get("right_branch_id") or "").strip()
                 if not right_branch_id:
                     continue
-                right_branch = session.scalar(select(Branch).where(Branch.id == right_branch_id))
-                if not right_branch:
-                    continue
-                for secondary_node in self._lineage(session, right_branch):
+                for secondary_node in self._ancestors(session, right_branch_id):
                     if secondary_node.id not in branches_by_id:
                         branches_by_id[secondary_node.id] = secondary_node
                         scan_queue.append(secondary_node)
@@ -268,9 +433,133 @@ def get_visualization(self, session: Session, branch_id: str) -> dict[str, Any]:
             branch_events_by_id=branch_events_by_id,
         )
 
+    def replay_branches(
+        self,
+        session: Session,
+        branch_ids: list[str] | None = None,
+        *,
+        root_document_id: str | None = None,
+        workers: int | None = None,
+        progress: Callable[..., Any] | None = None,
+    ) -> dict[str, Any]:
+        """Replay many branches from their root documents and report expected vs replayed hashes.
+
+        Without ``branch_ids`` every branch (of ``root_document_id``, if given) is verified.
+        """
+        if branch_ids:
+            target_ids = list(dict.fromkeys(str(branch_id) for branch_id in branch_ids))
+            nodes = evolution_bulk_replay.load_replay_forest(session, target_ids)
+        else:
+            nodes = evolution_bulk_replay.load_full_forest(session, root_document_id)
+            target_ids = sorted(nodes)
+        # Worker processes run the stock kernels, so a customised _apply_event keeps replay in-process.
+        apply_event_fn = None if self._apply_event_is_stock() else self._apply_event
+        report = evolution_bulk_replay.replay_forest(
+            session,
+            nodes,
+            target_ids,
+            workers=evolution_bulk_replay.default_worker_count(workers if workers is not None else self.replay_batch_workers),
+            apply_event_fn=apply_event_fn,
+            progress=progress,
+        )
+        return {"root_document_id": root_document_id, **report}
+
+    def compact_branches(
+        self,
+        session: Session,
+        *,
+        min_age_days: float | None = None,
+        min_chain_length: int | None = None,
+        batch_size: int | None = None,
+        root_document_id: str | None = None,
+        dry_run: bool = False,
+        progress: Callable[..., Any] | None = None,
+    ) -> dict[str, Any]:
+        """Delete expired leaf branches and squash long linear chains, committing after every batch.
+
+        Leaves are removed repeatedly, so an abandoned subtree is collected bottom-up. Branches that
+        remix artifacts, analysis runs or merges refer to are kept, as is every branch that still has
+        a descendant other than through a squashed chain.
+        """
+        min_age_days = float(self.compaction_min_age_days if min_age_days is None else min_age_days)
+        min_chain_length = int(min_chain_length or self.compaction_min_chain_length)
+        batch_size = max(int(batch_size or self.compaction_batch_size), 1)
+        cutoff = utcnow() - timedelta(days=min_age_days)
+        report: dict[str, Any] = {
+            "dry_run": dry_run,
+            "cutoff": cutoff.isoformat(),
+            "root_document_id": root_document_id,
+            "batch_size": batch_size,
+            "min_chain_length": min_chain_length,
+            "leaf_branches_deleted": 0,
+            "leaf_batches": 0,
+            "chains_squashed": 0,
+            "chain_branches_removed": 0,
+            "events_moved": 0,
+            "chains_skipped": [],
+        }
+
+        while True:
+            leaf_ids = evolution_compaction.expired_leaf_ids(session, cutoff=cutoff, limit=batch_size, root_document_id=root_document_id)
+            if not leaf_ids:
+                break
+            report["leaf_branches_deleted"] += len(leaf_ids)
+            report["leaf_batches"] += 1
+            if dry_run:
+                # Nothing is deleted, so the parents of these leaves never become leaves themselves.
+                break
+            evolution_compaction.delete_branch_rows(session, leaf_ids)
+            session.commit()
+            if progress is not None:
+                progress(report["leaf_branches_deleted"], None, unit="branches", message=f"deleted leaf batch {report['leaf_batches']}")
+
+        chains = evolution_compaction.find_squash_chains(
+            session, cutoff=cutoff, min_chain_length=min_chain_length, root_document_id=root_document_id
+        )
+        pending = 0
+        for chain in chains:
+            if dry_run:
+                report["chains_squashed"] += 1
+                report["chain_branches_removed"] += len(chain.branch_ids)
+                continue
+            tip = session.get(Branch, chain.tip_id)
+            tip_text = self.branch_text(session, tip)
+            if hashlib.sha256(tip_text.encode("utf-8")).hexdigest() != (tip.state_snapshot or {}).get("text_hash"):
+                # Never fold history into a keyframe that does not reproduce the recorded hash.
+                report["chains_skipped"].append(chain.tip_id)
+                continue
+            report["events_moved"] += evolution_compaction.squash_chain(
+                session,
+                chain,
+                tip_text=tip_text,
+                lineage_event_count=self._lineage_event_count(session, tip),
+                compress_snapshot_fn=self._compress_snapshot,
+            )
+            report["chains_squashed"] += 1
+            report["chain_branches_removed"] += len(chain.branch_ids)
+            pending += len(chain.branch_ids)
+            if pending >= batch_size:
+                session.commit()
+                pending = 0
+                if progress is not None:
+                    progress(report["chains_squashed"], len(chains), unit="chains")
+        if not dry_run:
+            session.commit()
+            # Graph keys cover every reachable head, so stale graphs would only waste entries.
+            self.visualization_cache.clear()
+        return report
+
     def replay_branch(self, session: Session, branch_id: str) -> dict[str, Any]:
-        timeline = self.get_timeline(session, branch_id)
-        replay = timeline["replay_snapshot"]
+        branch = session.scalar(select(Branch).where(Branch.id == branch_id))
+        if not branch:
+            raise ValueError(f"Branch {branch_id} not found")
+        # Unlike the timeline, a replay only reports the event count, so the events are counted rather than loaded.
+        replay_text = self._replayed_text(session, branch)
+        replay = {
+            "text_hash": hashlib.sha256(replay_text.encode("utf-8")).hexdigest(),
+            "preview": replay_text[:500],
+            "event_count": self._lineage_event_count(session, branch),
+        }
         return {
             "branch_id": branch_id,
             "event_count": replay.get("event_count", 0),
@@ -280,27 +569,60 @@ def replay_branch(self, session: Session, branch_id: str) -> dict[str, Any]:
         }
 
     def compare_branches(self, session: Session, left_branch_id: str, right_branch_id: str) -> dict[str, Any]:
-        left = self.replay_branch(session, left_branch_id)
-        right = self.replay_branch(session, right_branch_id)
-        preview_left = left["preview"]
-        preview_right = right["preview"]
-        distance = self._simple_distance(preview_left, preview_right)
+        left_text = self._compare_text(session, left_branch_id)
+        right_text = self._compare_text(session, right_branch_id)
+        left_hash = hashlib.sha256(left_text.encode("utf-8")).hexdigest()
+        right_hash = hashlib.sha256(right_text.encode("utf-8")).hexdigest()
+        comparison = evolution_diff.compare_texts(left_text, right_text)
         return {
             "left_branch_id": left_branch_id,
             "right_branch_id": right_branch_id,
-            "left_hash": left["text_hash"],
-            "right_hash": right["text_hash"],
-            "distance": distance,
-            "same": left["text_hash"] == right["text_hash"],
-            "preview_left": preview_left,
-            "preview_right": preview_right,
+            "left_hash": left_hash,
+            "right_hash": right_hash,
+            "distance": comparison.pop("distance"),
+            "distance_exact": comparison.pop("distance_exact"),
+            "same": left_hash == right_hash,
+            "preview_left": left_text[:500],
+            "preview_right": right_text[:500],
+            "diff": comparison,
         }
 
+    def _compare_text(self, session: Session, branch_id: str) -> str:
+        branch = session.scalar(select(Branch).where(Branch.id == branch_id))
+        if not branch:
+            raise ValueError(f"Branch {branch_id} not found")
+        return self._replayed_text(session, branch)
+
+    def branch_text(self, session: Session, branch: Branch) -> str:
+        return evolution_text.materialize_branch_text(
+            session,
+            branch,
+            cache=self.text_cache,
+            apply_event_fn=self._apply_event,
+            decompress_snapshot_fn=self._decompress_snapshot,
+        )
+
     def _lineage(self, session: Session, branch: Branch) -> list[Branch]:
         return evolution_replay.lineage(session, branch)
 
+    def _lineage_overridden(self) -> bool:
+        # Indexed fast paths only apply while _lineage is the stock implementation.
+        return getattr(self._lineage, "__func__", None) is not EvolutionService._lineage
+
+    def _apply_event_is_stock(self) -> bool:
+        return getattr(self._apply_event, "__func__", None) is EvolutionService._apply_event
+
+    def _ancestors(self, session: Session, branch_id: str) -> list[Branch]:
+        if self._lineage_overridden():
+            branch = session.scalar(select(Branch).where(Branch.id == branch_id))
+            return self._lineage(session, branch) if branch else []
+        evolution_ancestry.ensure_ancestry(session, branch_id)
+        return evolution_ancestry.ancestors(session, branch_id)
+
     def _lineage_event_count(self, session: Session, branch: Branch) -> int:
-        return evolution_replay.lineage_event_count(session, branch, lineage_fn=self._lineage)
+        # One CTE returns ancestors and their event counts unless a custom lineage hook is installed.
+        lineage_fn = self._lineage if self._lineage_overridden() else None
+        return evolution_replay.lineage_event_count(session, branch, lineage_fn=lineage_fn)
 
     def _latest_lineage_checkpoint(self, session: Session, lineage: list[Branch]) -> BranchCheckpoint | None:
         return evolution_replay.latest_lineage_checkpoint(session, lineage)
@@ -318,23 +640,59 @@ def _replay_lineage_text(
         *,
         use_checkpoints: bool = True,
     ) -> tuple[str, list[Branch], list[BranchEvent]]:
-        return evolution_replay.replay_lineage_text(
+        lineage = self._lineage(session, branch)
+        events = self._collect_lineage_events(session, lineage)
+        # A full replay (use_checkpoints=False) is the verification path, so it never reads the cache.
+        cache_key = self._replay_cache_key(session, branch)
+        if use_checkpoints:
+            cached = self.replay_cache.get(cache_key)
+            if cached is not None:
+                return cached, lineage, events
+
+        replay_text, lineage, events = evolution_replay.replay_lineage_text(
             session,
             branch,
             use_checkpoints=use_checkpoints,
-            lineage_fn=self._lineage,
-            collect_events_fn=self._collect_lineage_events,
+            lineage_fn=lambda _session, _branch: lineage,
+            collect_events_fn=lambda _session, _lineage: events,
             resolve_root_text_fn=self._resolve_root_text,
             latest_checkpoint_fn=self._latest_lineage_checkpoint,
             decompress_snapshot_fn=self._decompress_snapshot,
             apply_event_fn=self._apply_event,
         )
+        self.replay_cache.put(cache_key, replay_text)
+        return replay_text, lineage, events
+
+    def _replayed_text(self, session: Session, branch: Branch) -> str:
+        """Replayed lineage text for callers that discard the lineage and events.
+
+        The cache is checked before the lineage is walked, so a hit costs no event reads.
+        """
+        cached = self.replay_cache.get(self._replay_cache_key(session, branch))
+        if cached is not None:
+            return cached
+        text, _, _ = self._replay_lineage_text(session, branch, use_checkpoints=True)
+        return text
+
+    def _replay_cache_key(self, session: Session, branch: Branch) -> tuple[str, str]:
+        # Branches are immutable, so the snapshot's text hash never goes stale; branches written without
+        # one fall back to the hash of their own last event.
+        text_hash = (branch.state_snapshot or {}).get("text_hash")
+        if text_hash:
+            return branch.id, str(text_hash)
+        last_event_hash = session.scalar(
+            select(BranchEvent.event_hash)
+            .where(BranchEvent.branch_id == branch.id)
+            .order_by(BranchEvent.event_index.desc())
+            .limit(1)
+        )
+        return branch.id, last_event_hash or ""
 
     def _find_lca(self, session: Session, left_branch: Branch, right_branch: Branch) -> Branch | None:
-        return evolution_merge.find_lca(session, left_branch, right_branch, lineage_fn=self._lineage)
-
-    def _next_event_index(self, session: Session, branch_id: str) -> int:
-        return evolution_replay.next_event_index(session, branch_id)
+        if self._lineage_overridden():
+            return evolution_merge.find_lca(session, left_branch, right_branch, lineage_fn=self._lineage)
+        evolution_ancestry.ensure_ancestry(session, left_branch.id, right_branch.id)
+        return evolution_ancestry.find_lca(session, left_branch.id, right_branch.id)
 
     def _validate_event_payload(self, event_type: str, payload: dict[str, Any]) -> dict[str, Any]:
         return evolution_events.validate_event_payload(
@@ -354,8 +712,19 @@ def _apply_event(self, text: str, event_type: str, event_payload: dict[str, Any]
             glyph_pool=self.GLYPH_POOL,
         )
 
+    def _replay_debt(self, session: Session, parent: Branch | None, lineage_event_count: int) -> dict[str, Any]:
+        if parent is None:
+            return {"events": 0, "cost_ms": 0.0}
+        debt = (parent.state_snapshot or {}).get("replay_debt")
+        if isinstance(debt, dict):
+            return debt
+        # Branches written before the adaptive policy only know how many events follow the last checkpoint.
+        checkpoint = self._latest_lineage_checkpoint(session, self._lineage(session, parent))
+        since = lineage_event_count - (int(checkpoint.event_index) if checkpoint is not None else 0)
+        return {"events": max(since, 0), "cost_ms": 0.0}
+
     def _compress_snapshot(self, snapshot: dict[str, Any]) -> str:
-        return evolution_replay.compress_snapshot(snapshot)
+        return evolution_replay.compress_snapshot(snapshot, level=self.checkpoint_policy.compression_level)
 
     def _decompress_snapshot(self, payload: str) -> dict[str, Any]:
         return evolution_replay.decompress_snapshot(payload)
@@ -363,6 +732,12 @@ def _decompress_snapshot(self, payload: str) -> dict[str, Any]:
     def _merge_texts(self, left_text: str, right_text: str, strategy: str) -> str:
         return evolution_merge.merge_texts(left_text, right_text, strategy)
 
+    def _merge_base_text(self, session: Session, lca: Branch | None, left_branch: Branch) -> str:
+        # The LCA text comes through the replay cache; unrelated lineages fall back to the shared root document.
+        if lca is None:
+            return self._resolve_root_text(session, left_branch.root_document_id)
+        return self._replayed_text(session, lca)
+
     def _build_merge_conflict_semantics(
         self,
         *,
@@ -370,12 +745,16 @@ def _build_merge_conflict_semantics(
         right_text: str,
         merged_text: str,
         strategy: str,
+        three_way: evolution_merge.ThreeWayMerge | None = None,
+        base_text: str | None = None,
     ) -> dict[str, Any]:
         return evolution_merge.build_merge_conflict_semantics(
             left_text=left_text,
             right_text=right_text,
             merged_text=merged_text,
             strategy=strategy,
+            three_way=three_way,
+            base_text=base_text,
         )
 
     def _common_prefix_chars(self, left: str, right: str) -> int:
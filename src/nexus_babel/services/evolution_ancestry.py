@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from nexus_babel.models import Branch, BranchAncestry
+
+from . import evolution_replay
+
+
+def record_branch_ancestry(session: Session, branch: Branch) -> None:
+    """Index a freshly flushed branch: itself at depth 0 plus every ancestor of its parent one level deeper."""
+    if branch.parent_branch_id:
+        ensure_ancestry(session, branch.parent_branch_id)
+    session.add(BranchAncestry(ancestor_id=branch.id, descendant_id=branch.id, depth=0))
+    if branch.parent_branch_id:
+        session.execute(
+            insert(BranchAncestry).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(BranchAncestry.ancestor_id, literal(branch.id), BranchAncestry.depth + 1).where(
+                    BranchAncestry.descendant_id == branch.parent_branch_id
+                ),
+            )
+        )
+
+
+ANCESTRY_INSERT_BATCH = 10_000
+
+
+def record_chain_ancestry(session: Session, parent_branch_id: str | None, chain_ids: list[str]) -> None:
+    """Index a flushed linear chain (each id the child of the previous, the first a child of ``parent_branch_id``).
+
+    The closure rows are derived in memory from the parent's own rows and inserted in batches through
+    the table (not the mapper), since a chain of n branches writes O(n^2) rows.
+    """
+    base: list[tuple[str, int]] = []
+    if parent_branch_id:
+        ensure_ancestry(session, parent_branch_id)
+        base = [
+            (row.ancestor_id, row.depth)
+            for row in session.execute(
+                select(BranchAncestry.ancestor_id, BranchAncestry.depth).where(BranchAncestry.descendant_id == parent_branch_id)
+            ).all()
+        ]
+    batch: list[dict[str, object]] = []
+    for position, node_id in enumerate(chain_ids):
+        for ancestor in range(position + 1):
+            batch.append({"ancestor_id": chain_ids[ancestor], "descendant_id": node_id, "depth": position - ancestor})
+        for ancestor_id, depth in base:
+            batch.append({"ancestor_id": ancestor_id, "descendant_id": node_id, "depth": depth + position + 1})
+        if len(batch) >= ANCESTRY_INSERT_BATCH:
+            session.execute(insert(BranchAncestry.__table__), batch)
+            batch = []
+    if batch:
+        session.execute(insert(BranchAncestry.__table__), batch)
+
+
+def ensure_ancestry(session: Session, *branch_ids: str) -> None:
+    # Branches created before the closure table existed are indexed lazily from their lineage.
+    wanted = {branch_id for branch_id in branch_ids if branch_id}
+    if not wanted:
+        return
+    indexed = set(
+        session.scalars(
+            select(BranchAncestry.descendant_id).where(
+                BranchAncestry.descendant_id.in_(wanted),
+                BranchAncestry.ancestor_id == BranchAncestry.descendant_id,
+            )
+        ).all()
+    )
+    for branch_id in sorted(wanted - indexed):
+        branch = session.get(Branch, branch_id)
+        if branch is not None:
+            _backfill(session, branch)
+
+
+def _backfill(session: Session, branch: Branch) -> None:
+    chain = [node.id for node in evolution_replay.lineage(session, branch)]
+    indexed = set(
+        session.scalars(
+            select(BranchAncestry.descendant_id).where(
+                BranchAncestry.descendant_id.in_(chain),
+                BranchAncestry.ancestor_id == BranchAncestry.descendant_id,
+            )
+        ).all()
+    )
+    rows = [
+        {"ancestor_id": chain[ancestor], "descendant_id": node_id, "depth": position - ancestor}
+        for position, node_id in enumerate(chain)
+        if node_id not in indexed
+        for ancestor in range(position + 1)
+    ]
+    if rows:
+        session.execute(insert(BranchAncestry), rows)
+
+
+def ancestors(session: Session, branch_id: str) -> list[Branch]:
+    """Root-first primary lineage of ``branch_id``, the branch itself last."""
+    return list(
+        session.scalars(
+            select(Branch)
+            .join(BranchAncestry, BranchAncestry.ancestor_id == Branch.id)
+            .where(BranchAncestry.descendant_id == branch_id)
+            .order_by(BranchAncestry.depth.desc())
+        ).all()
+    )
+
+
+def find_lca(session: Session, left_branch_id: str, right_branch_id: str) -> Branch | None:
+    left = aliased(BranchAncestry)
+    right = aliased(BranchAncestry)
+    # Common ancestors of two nodes on a tree form a chain; the one nearest to the left side is the lowest.
+    return session.scalar(
+        select(Branch)
+        .join(left, left.ancestor_id == Branch.id)
+        .join(right, right.ancestor_id == left.ancestor_id)
+        .where(left.descendant_id == left_branch_id, right.descendant_id == right_branch_id)
+        .order_by(left.depth)
+        .limit(1)
+    )
+
+
+def is_ancestor(session: Session, ancestor_id: str, descendant_id: str) -> bool:
+    return (
+        session.scalar(
+            select(BranchAncestry.depth).where(
+                BranchAncestry.ancestor_id == ancestor_id,
+                BranchAncestry.descendant_id == descendant_id,
+            )
+        )
+        is not None
+    )
+
+
+def lineage_depth(session: Session, branch_id: str) -> int:
+    depth = session.scalar(select(func.max(BranchAncestry.depth)).where(BranchAncestry.descendant_id == branch_id))
+    return 0 if depth is None else int(depth) + 1
+
+
+def descendant_ids(session: Session, branch_id: str, *, include_self: bool = False) -> list[str]:
+    min_depth = 0 if include_self else 1
+    return list(
+        session.scalars(
+            select(BranchAncestry.descendant_id)
+            .where(BranchAncestry.ancestor_id == branch_id, BranchAncestry.depth >= min_depth)
+            .order_by(BranchAncestry.depth, BranchAncestry.descendant_id)
+        ).all()
+    )
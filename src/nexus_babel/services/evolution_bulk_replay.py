@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from nexus_babel.models import Branch, BranchAncestry, BranchEvent
+
+from . import evolution_ancestry, evolution_replay, evolution_text
+from .evolution_types import DriftResult
+
+ApplyEventFn = Callable[[str, str, dict[str, Any]], DriftResult]
+
+IN_CLAUSE_CHUNK = 500
+# Units per worker the forest is split into, so one deep subtree does not leave the other workers idle.
+UNITS_PER_WORKER = 4
+MAX_MISMATCHES_REPORTED = 100
+
+
+@dataclass
+class ReplayNode:
+    branch_id: str
+    parent_id: str | None
+    root_document_id: str | None
+    events: list[tuple[str, dict[str, Any]]]
+    expected_hash: str | None
+    children: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ReplayUnit:
+    """A subtree replayed in one go, starting from the text of its root's parent."""
+
+    start_text: str
+    nodes: list[tuple[str, str | None, list[tuple[str, dict[str, Any]]]]]
+
+
+def _chunks(values: list[str], size: int = IN_CLAUSE_CHUNK) -> Iterator[list[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def load_replay_forest(session: Session, target_ids: list[str]) -> dict[str, ReplayNode]:
+    """Load every target branch plus its ancestors, with events, as a parent/child forest.
+
+    Ancestor sets come from the closure table, so the whole forest costs a handful of bulk queries
+    instead of one lineage walk per branch.
+    """
+    evolution_ancestry.ensure_ancestry(session, *target_ids)
+    wanted: set[str] = set(target_ids)
+    for chunk in _chunks(sorted(target_ids)):
+        wanted.update(
+            session.scalars(select(BranchAncestry.ancestor_id).where(BranchAncestry.descendant_id.in_(chunk)).distinct()).all()
+        )
+    return _forest_for(session, sorted(wanted))
+
+
+def load_full_forest(session: Session, root_document_id: str | None = None) -> dict[str, ReplayNode]:
+    query = select(Branch.id)
+    if root_document_id:
+        query = query.where(Branch.root_document_id == root_document_id)
+    return _forest_for(session, list(session.scalars(query).all()))
+
+
+def _forest_for(session: Session, branch_ids: list[str]) -> dict[str, ReplayNode]:
+    nodes: dict[str, ReplayNode] = {}
+    for chunk in _chunks(branch_ids):
+        for branch in session.scalars(select(Branch).where(Branch.id.in_(chunk))).all():
+            nodes[branch.id] = ReplayNode(
+                branch_id=branch.id,
+                parent_id=branch.parent_branch_id,
+                root_document_id=branch.root_document_id,
+                events=[],
+                expected_hash=(branch.state_snapshot or {}).get("text_hash"),
+            )
+        for event in session.scalars(
+            select(BranchEvent).where(BranchEvent.branch_id.in_(chunk)).order_by(BranchEvent.event_index, BranchEvent.created_at)
+        ).all():
+            nodes[event.branch_id].events.append((event.event_type, dict(event.event_payload or {})))
+    for node in sorted(nodes.values(), key=lambda item: item.branch_id):
+        if node.parent_id in nodes:
+            nodes[node.parent_id].children.append(node.branch_id)
+    return nodes
+
+
+def _replay_events(text: str, events: list[tuple[str, dict[str, Any]]], apply_event_fn: ApplyEventFn) -> str:
+    for event_type, payload in events:
+        text = apply_event_fn(text, event_type, payload).output_text
+    return text
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def replay_unit(unit: ReplayUnit, apply_event_fn: ApplyEventFn | None = None) -> dict[str, str]:
+    """Replay a subtree given in depth-first order and return the text hash of every node.
+
+    A node's text is kept only until its last child has been replayed, so memory follows the depth
+    of the subtree rather than its size.
+    """
+    apply_event_fn = apply_event_fn or evolution_text.default_apply_event
+    remaining_children: dict[str, int] = {}
+    for _, parent_id, _ in unit.nodes:
+        if parent_id is not None:
+            remaining_children[parent_id] = remaining_children.get(parent_id, 0) + 1
+    texts: dict[str, str] = {}
+    hashes: dict[str, str] = {}
+    for branch_id, parent_id, events in unit.nodes:
+        # Only the unit's root has a parent outside the unit; it starts from ``start_text``.
+        base = texts.get(parent_id, unit.start_text)
+        text = _replay_events(base, events, apply_event_fn)
+        hashes[branch_id] = _text_hash(text)
+        if remaining_children.get(branch_id):
+            texts[branch_id] = text
+        if parent_id in texts:
+            remaining_children[parent_id] -= 1
+            if not remaining_children[parent_id]:
+                del texts[parent_id]
+    return hashes
+
+
+def _subtree_order(nodes: dict[str, ReplayNode], root_id: str) -> list[tuple[str, str | None, list[tuple[str, dict[str, Any]]]]]:
+    ordered = []
+    stack = [root_id]
+    while stack:
+        node = nodes[stack.pop()]
+        ordered.append((node.branch_id, node.parent_id, node.events))
+        stack.extend(reversed(node.children))
+    return ordered
+
+
+def _subtree_sizes(nodes: dict[str, ReplayNode], roots: list[str]) -> dict[str, int]:
+    sizes: dict[str, int] = {}
+    for root_id in roots:
+        for branch_id, _, _ in reversed(_subtree_order(nodes, root_id)):
+            sizes[branch_id] = 1 + sum(sizes[child] for child in nodes[branch_id].children)
+    return sizes
+
+
+def plan_units(
+    session: Session,
+    nodes: dict[str, ReplayNode],
+    *,
+    target_units: int,
+    apply_event_fn: ApplyEventFn,
+) -> tuple[list[ReplayUnit], dict[str, str]]:
+    """Split the forest into independent subtrees, replaying split points in-process.
+
+    Roots are the natural units. While there are fewer units than ``target_units``, the largest unit
+    is split at its root: the root is replayed here and each child subtree becomes a unit starting
+    from the root's text. Shared prefixes are therefore replayed exactly once.
+    """
+    # Branches whose parent is missing from the forest cannot be replayed and are reported missing.
+    roots = sorted(branch_id for branch_id, node in nodes.items() if node.parent_id is None)
+    sizes = _subtree_sizes(nodes, roots)
+    root_texts: dict[str | None, str] = {}
+    pending: dict[str, str] = {}
+    for root_id in roots:
+        document_id = nodes[root_id].root_document_id
+        if document_id not in root_texts:
+            root_texts[document_id] = evolution_replay.resolve_root_text(session, document_id)
+        pending[root_id] = root_texts[document_id]
+    hashes: dict[str, str] = {}
+    splits = 0
+    while len(pending) < target_units and splits < target_units * 16:
+        splittable = [branch_id for branch_id in pending if nodes[branch_id].children]
+        if not splittable:
+            break
+        largest = max(splittable, key=lambda branch_id: (sizes[branch_id], branch_id))
+        node = nodes[largest]
+        text = _replay_events(pending.pop(largest), node.events, apply_event_fn)
+        hashes[largest] = _text_hash(text)
+        for child_id in node.children:
+            pending[child_id] = text
+        splits += 1
+
+    units = [ReplayUnit(start_text=start_text, nodes=_subtree_order(nodes, branch_id)) for branch_id, start_text in pending.items()]
+    units.sort(key=lambda unit: len(unit.nodes), reverse=True)
+    return units, hashes
+
+
+def default_worker_count(configured: int | None) -> int:
+    if configured and configured > 0:
+        return int(configured)
+    return max(os.cpu_count() or 1, 1)
+
+
+def replay_forest(
+    session: Session,
+    nodes: dict[str, ReplayNode],
+    target_ids: list[str],
+    *,
+    workers: int = 1,
+    apply_event_fn: ApplyEventFn | None = None,
+    progress: Callable[..., Any] | None = None,
+) -> dict[str, Any]:
+    """Replay every node of the forest once and report expected vs replayed hashes for the targets.
+
+    With ``workers > 1`` the units run in a spawned process pool using the stock event kernels; a
+    custom ``apply_event_fn`` always runs in-process.
+    """
+    started = time.perf_counter()
+    in_process = apply_event_fn is not None or workers <= 1
+    apply_event_fn = apply_event_fn or evolution_text.default_apply_event
+    units, hashes = plan_units(
+        session,
+        nodes,
+        target_units=1 if in_process else workers * UNITS_PER_WORKER,
+        apply_event_fn=apply_event_fn,
+    )
+    total_nodes = sum(len(unit.nodes) for unit in units) + len(hashes)
+    if in_process or len(units) <= 1:
+        for unit in units:
+            hashes.update(replay_unit(unit, apply_event_fn))
+            if progress is not None:
+                progress(len(hashes), total_nodes, unit="branches")
+        pool_workers = 1
+    else:
+        pool_workers = min(workers, len(units))
+        with ProcessPoolExecutor(max_workers=pool_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for unit_hashes in pool.map(replay_unit, units):
+                hashes.update(unit_hashes)
+                if progress is not None:
+                    progress(len(hashes), total_nodes, unit="branches")
+
+    mismatches: list[dict[str, Any]] = []
+    missing: list[str] = []
+    matched = 0
+    for branch_id in target_ids:
+        node = nodes.get(branch_id)
+        if node is None or branch_id not in hashes:
+            missing.append(branch_id)
+            continue
+        if hashes[branch_id] == node.expected_hash:
+            matched += 1
+        else:
+            mismatches.append({"branch_id": branch_id, "expected_hash": node.expected_hash, "replayed_hash": hashes[branch_id]})
+    return {
+        "branch_count": len(target_ids),
+        "replayed_branch_count": len(hashes),
+        "matched": matched,
+        "mismatched": len(mismatches),
+        "missing": len(missing),
+        "deterministic": not mismatches and not missing,
+        "mismatches": mismatches[:MAX_MISMATCHES_REPORTED],
+        "missing_branch_ids": missing[:MAX_MISMATCHES_REPORTED],
+        "unit_count": len(units),
+        "workers": pool_workers,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+    }
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+# Rough single-core replay cost per million characters, used as a floor under the measured apply
+# time so a fast write path (or a warm CPU) cannot talk the policy out of checkpointing a big text.
+EVENT_REPLAY_MS_PER_MCHAR: dict[str, float] = {
+    "natural_drift": 500.0,
+    "reverse_drift": 170.0,
+    "synthetic_mutation": 170.0,
+    "phase_shift": 40.0,
+    "glyph_fusion": 5.0,
+    "merge": 1.0,
+    "remix": 1.0,
+}
+DEFAULT_REPLAY_MS_PER_MCHAR = 100.0
+
+
+@dataclass
+class CheckpointPolicy:
+    """Decides when a branch gets a replay checkpoint.
+
+    Each branch carries the replay debt accumulated since the nearest checkpoint in its lineage
+    (events and estimated milliseconds). A checkpoint is written once that debt would exceed
+    ``target_replay_ms`` or ``max_events``, which bounds replay from any branch regardless of depth.
+    """
+
+    target_replay_ms: float = 50.0
+    max_events: int = 10
+    min_events: int = 1
+    compression_level: int = 1
+    event_cost_ms_per_mchar: dict[str, float] = field(default_factory=lambda: dict(EVENT_REPLAY_MS_PER_MCHAR))
+
+    def event_cost_ms(self, event_type: str, text_chars: int, measured_ms: float) -> float:
+        per_mchar = self.event_cost_ms_per_mchar.get(event_type, DEFAULT_REPLAY_MS_PER_MCHAR)
+        return max(float(measured_ms), text_chars / 1_000_000 * per_mchar)
+
+    def next_debt(self, parent_debt: dict[str, Any], event_cost_ms: float) -> dict[str, Any]:
+        return {
+            "events": int(parent_debt.get("events", 0)) + 1,
+            "cost_ms": round(float(parent_debt.get("cost_ms", 0.0)) + event_cost_ms, 3),
+        }
+
+    def should_checkpoint(self, debt: dict[str, Any]) -> bool:
+        events = int(debt.get("events", 0))
+        if events < max(self.min_events, 1):
+            return False
+        return events >= max(self.max_events, 1) or float(debt.get("cost_ms", 0.0)) >= self.target_replay_ms
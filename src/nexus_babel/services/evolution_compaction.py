@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import Session, aliased
+
+from nexus_babel.models import (
+    AnalysisRun,
+    Branch,
+    BranchAncestry,
+    BranchCheckpoint,
+    BranchEvent,
+    RemixArtifact,
+    RemixSourceLink,
+)
+
+from . import evolution_ancestry
+
+IN_CLAUSE_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class SquashChain:
+    """A linear run of branches (root-first) folded into ``tip_id``, the run's only surviving descendant."""
+
+    branch_ids: tuple[str, ...]
+    tip_id: str
+
+
+@dataclass(frozen=True)
+class BranchRow:
+    id: str
+    parent_id: str | None
+    mode: str
+    expired: bool
+
+
+def _chunks(values: list[str], size: int = IN_CLAUSE_CHUNK) -> Iterator[list[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _referenced_branch_queries() -> list[Any]:
+    # Branches other records point at: remix artifacts and their source links, analysis runs, and the
+    # right-hand side of merges (the merge DAG edges). None of them is ever removed.
+    return [
+        select(RemixArtifact.branch_id).where(RemixArtifact.branch_id.is_not(None)),
+        select(RemixArtifact.source_branch_id).where(RemixArtifact.source_branch_id.is_not(None)),
+        select(RemixArtifact.target_branch_id).where(RemixArtifact.target_branch_id.is_not(None)),
+        select(BranchEvent.branch_id).join(RemixArtifact, RemixArtifact.branch_event_id == BranchEvent.id),
+        select(RemixSourceLink.branch_id).where(RemixSourceLink.branch_id.is_not(None)),
+        select(AnalysisRun.branch_id).where(AnalysisRun.branch_id.is_not(None)),
+        select(BranchEvent.merge_right_branch_id).where(BranchEvent.merge_right_branch_id.is_not(None)),
+    ]
+
+
+def referenced_branch_ids(session: Session) -> set[str]:
+    referenced: set[str] = set()
+    for query in _referenced_branch_queries():
+        referenced.update(str(branch_id) for branch_id in session.scalars(query).all())
+    return referenced
+
+
+def expired_leaf_ids(session: Session, *, cutoff: datetime, limit: int, root_document_id: str | None = None) -> list[str]:
+    """Oldest unreferenced branches created before ``cutoff`` that no other branch descends from."""
+    child = aliased(Branch)
+    query = select(Branch.id).where(
+        Branch.created_at < cutoff,
+        ~exists().where(child.parent_branch_id == Branch.id),
+        *(Branch.id.not_in(referenced) for referenced in _referenced_branch_queries()),
+    )
+    if root_document_id:
+        query = query.where(Branch.root_document_id == root_document_id)
+    return list(session.scalars(query.order_by(Branch.created_at, Branch.id).limit(limit)).all())
+
+
+def delete_branch_rows(session: Session, branch_ids: list[str]) -> None:
+    # Bulk deletes bypass the ORM cascades (and SQLite does not enforce foreign keys), so every
+    # dependent table is cleared explicitly.
+    for chunk in _chunks(branch_ids):
+        session.execute(
+            delete(BranchAncestry)
+            .where(BranchAncestry.descendant_id.in_(chunk) | BranchAncestry.ancestor_id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(delete(BranchCheckpoint).where(BranchCheckpoint.branch_id.in_(chunk)).execution_options(synchronize_session=False))
+        session.execute(delete(BranchEvent).where(BranchEvent.branch_id.in_(chunk)).execution_options(synchronize_session=False))
+        session.execute(delete(Branch).where(Branch.id.in_(chunk)).execution_options(synchronize_session=False))
+
+
+def plan_squash_chains(rows: list[BranchRow], protected: set[str], min_chain_length: int) -> list[SquashChain]:
+    """Find maximal linear runs worth squashing.
+
+    A branch can be folded away when it is expired, unreferenced and has exactly one child. Runs never
+    cross a mode change, and the tip (the first branch past the run) always survives, so chains are
+    disjoint and no chain removes another chain's tip. ``min_chain_length`` counts the tip.
+    """
+    by_id = {row.id: row for row in rows}
+    children: dict[str, list[str]] = {}
+    for row in rows:
+        if row.parent_id is not None:
+            children.setdefault(row.parent_id, []).append(row.id)
+
+    def foldable(branch_id: str) -> bool:
+        row = by_id[branch_id]
+        return row.expired and branch_id not in protected and len(children.get(branch_id, ())) == 1
+
+    chains: list[SquashChain] = []
+    for row in sorted(rows, key=lambda item: item.id):
+        if not foldable(row.id):
+            continue
+        parent = by_id.get(row.parent_id) if row.parent_id else None
+        if parent is not None and foldable(parent.id) and parent.mode == row.mode:
+            continue
+        run = [row.id]
+        current = children[row.id][0]
+        while foldable(current) and by_id[current].mode == row.mode:
+            run.append(current)
+            current = children[current][0]
+        if by_id[current].mode != row.mode:
+            # The tip inherits the run's events, so it must share the run's mode.
+            current = run.pop()
+        if run and len(run) + 1 >= max(min_chain_length, 2):
+            chains.append(SquashChain(branch_ids=tuple(run), tip_id=current))
+    return chains
+
+
+def find_squash_chains(
+    session: Session,
+    *,
+    cutoff: datetime,
+    min_chain_length: int,
+    root_document_id: str | None = None,
+) -> list[SquashChain]:
+    # Only ids, parents, modes and an expiry flag are loaded, so the scan stays small per branch.
+    query = select(Branch.id, Branch.parent_branch_id, Branch.mode, (Branch.created_at < cutoff).label("expired"))
+    if root_document_id:
+        query = query.where(Branch.root_document_id == root_document_id)
+    rows = [
+        BranchRow(id=row.id, parent_id=row.parent_branch_id, mode=str(row.mode), expired=bool(row.expired))
+        for row in session.execute(query).all()
+    ]
+    return plan_squash_chains(rows, referenced_branch_ids(session), min_chain_length)
+
+
+def squash_chain(
+    session: Session,
+    chain: SquashChain,
+    *,
+    tip_text: str,
+    lineage_event_count: int,
+    compress_snapshot_fn: Callable[[dict[str, Any]], str],
+) -> int:
+    """Fold ``chain`` into its tip: the tip takes over the run's events and becomes a keyframe.
+
+    Events keep their ids and hashes and are renumbered in lineage order, so every descendant's
+    lineage event sequence (and therefore its checkpoints and replay) is unchanged. The tip's delta
+    base is removed with the run, so its text is stored as a checkpoint at its lineage position.
+    Returns the number of events moved onto the tip.
+    """
+    tip = session.get(Branch, chain.tip_id)
+    first = session.get(Branch, chain.branch_ids[0])
+    if tip is None or first is None:
+        raise LookupError(f"Branch chain ending at {chain.tip_id} is missing")
+    evolution_ancestry.ensure_ancestry(session, tip.id)
+
+    # Ancestors above the run move |run| levels closer to the tip and everything below it.
+    upper_ids = list(
+        session.scalars(
+            select(BranchAncestry.ancestor_id).where(BranchAncestry.descendant_id == first.id, BranchAncestry.depth >= 1)
+        ).all()
+    )
+    if upper_ids:
+        subtree_ids = evolution_ancestry.descendant_ids(session, tip.id, include_self=True)
+        for subtree_chunk in _chunks(subtree_ids):
+            for upper_chunk in _chunks(upper_ids):
+                session.execute(
+                    update(BranchAncestry)
+                    .where(BranchAncestry.descendant_id.in_(subtree_chunk), BranchAncestry.ancestor_id.in_(upper_chunk))
+                    .values(depth=BranchAncestry.depth - len(chain.branch_ids))
+                    .execution_options(synchronize_session=False)
+                )
+
+    position = {branch_id: offset for offset, branch_id in enumerate((*chain.branch_ids, tip.id))}
+    events = sorted(
+        session.scalars(select(BranchEvent).where(BranchEvent.branch_id.in_(list(position)))).all(),
+        key=lambda event: (position[event.branch_id], event.event_index, event.created_at),
+    )
+    moved = sum(1 for event in events if event.branch_id != tip.id)
+    for event_index, event in enumerate(events, start=1):
+        event.branch_id = tip.id
+        event.event_index = event_index
+
+    snapshot = dict(tip.state_snapshot or {})
+    existing = session.scalar(
+        select(BranchCheckpoint).where(BranchCheckpoint.branch_id == tip.id, BranchCheckpoint.event_index == lineage_event_count)
+    )
+    if existing is None:
+        session.add(
+            BranchCheckpoint(
+                branch_id=tip.id,
+                event_index=lineage_event_count,
+                snapshot_hash=str(snapshot.get("text_hash", "")),
+                snapshot_compressed=compress_snapshot_fn(
+                    {"current_text": tip_text, "phase": snapshot.get("phase"), "text_hash": snapshot.get("text_hash")}
+                ),
+            )
+        )
+    snapshot["text_delta"] = {"op": "checkpoint", "event_index": lineage_event_count}
+    snapshot["replay_debt"] = {"events": 0, "cost_ms": 0.0}
+    tip.state_snapshot = snapshot
+    tip.parent_branch_id = first.parent_branch_id
+    session.flush()
+
+    delete_branch_rows(session, list(chain.branch_ids))
+    return moved
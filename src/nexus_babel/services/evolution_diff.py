@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any
+
+# Words, whitespace runs and single punctuation characters; concatenating the tokens gives the text back.
+_TOKENIZE = re.compile(r"\w+|\s+|[^\w\s]").findall
+
+# Ranges up to this many tokens (both sides together) go straight to Myers; larger ones are first
+# split at patience anchors so the quadratic worst case only ever sees small gaps.
+MYERS_MAX_TOKENS = 20_000
+# Budget for one Myers run, in (tokens x edit distance); a range that needs more is split at anchors.
+MYERS_WORK_BUDGET = 4_000_000
+# Exact character edit distance is computed bit-parallel when (shorter x longer) changed middle fits this
+# and the longer side, which the bit-parallel loop walks one character at a time, fits the per-text cap.
+EXACT_DISTANCE_MAX_CELLS = 400_000_000
+EXACT_DISTANCE_MAX_CHARS = 200_000
+MAX_REPORTED_SPANS = 100
+MAX_SPAN_CHARS = 200
+
+
+@dataclass(frozen=True)
+class Hunk:
+    """A changed region as half-open character ranges of the left and right texts."""
+
+    left_start: int
+    left_end: int
+    right_start: int
+    right_end: int
+
+
+@dataclass
+class TextDiff:
+    hunks: list[Hunk]
+    # True when some region was too large for Myers and had no unique anchors, so it was aligned on
+    # matching token occurrences instead; its hunks are valid but not necessarily minimal.
+    approximate: bool = False
+
+
+def common_prefix_len(left: str, right: str) -> int:
+    # Binary search over slice comparisons keeps the scan in C for megabyte texts.
+    lo, hi = 0, min(len(left), len(right))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if left[lo:mid] == right[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_len(left: str, right: str, limit: int | None = None) -> int:
+    lo, hi = 0, min(len(left), len(right)) if limit is None else limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if left[len(left) - mid : len(left) - lo] == right[len(right) - mid : len(right) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _trim(left: str, right: str) -> tuple[int, int]:
+    prefix = common_prefix_len(left, right)
+    return prefix, common_suffix_len(left, right, min(len(left), len(right)) - prefix)
+
+
+def _joins(before: str, after: str) -> bool:
+    # True when a boundary between these two characters would fall inside a single token.
+    return (before.isalnum() or before == "_") and (after.isalnum() or after == "_") or (before.isspace() and after.isspace())
+
+
+def _token_aligned_trim(left: str, right: str) -> tuple[int, int]:
+    # Back the trimmed prefix and suffix off to token boundaries so hunks always cover whole tokens.
+    prefix, suffix = _trim(left, right)
+    while prefix and any(
+        position < len(text) and _joins(text[prefix - 1], text[position]) for text, position in ((left, prefix), (right, prefix))
+    ):
+        prefix -= 1
+    while suffix and any(
+        len(text) - suffix - 1 >= prefix and _joins(text[len(text) - suffix - 1], text[len(text) - suffix]) for text in (left, right)
+    ):
+        suffix -= 1
+    return prefix, suffix
+
+
+def _offsets(tokens: list[str], start: int) -> list[int]:
+    offsets = [start]
+    position = start
+    for token in tokens:
+        position += len(token)
+        offsets.append(position)
+    return offsets
+
+
+def _myers(a: list[int], b: list[int], max_edits: int) -> list[tuple[int, int, int, int]] | None:
+    """Greedy O((N+M)D) Myers diff; returns hunks as token ranges, or None past ``max_edits``."""
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace: list[dict[int, int]] = []
+    for d in range(min(max_edits, n + m) + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace: list[dict[int, int]], n: int, m: int) -> list[tuple[int, int, int, int]]:
+    snakes: list[tuple[int, int, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        down = k == -d or (k != d and v[k - 1] < v[k + 1])
+        prev_k = k + 1 if down else k - 1
+        prev_x = v[prev_k]
+        start_x = prev_x if down else prev_x + 1
+        if d == 0:
+            start_x = 0
+        if x > start_x:
+            snakes.append((start_x, start_x - k, x - start_x))
+        x, y = prev_x, prev_x - prev_k
+    hunks: list[tuple[int, int, int, int]] = []
+    at_x = at_y = 0
+    for start_x, start_y, length in reversed(snakes):
+        if start_x > at_x or start_y > at_y:
+            hunks.append((at_x, start_x, at_y, start_y))
+        at_x, at_y = start_x + length, start_y + length
+    if at_x < n or at_y < m:
+        hunks.append((at_x, n, at_y, m))
+    return hunks
+
+
+def _longest_chain(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Longest run of ``pairs`` (sorted by left index) whose right indexes also increase (patience sorting)."""
+    if not pairs:
+        return []
+    tails: list[int] = []
+    tail_index: list[int] = []
+    previous: list[int] = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        if pile == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pile] = j
+            tail_index[pile] = index
+        previous[index] = tail_index[pile - 1] if pile else -1
+    chain: list[tuple[int, int]] = []
+    index = tail_index[-1]
+    while index != -1:
+        chain.append(pairs[index])
+        index = previous[index]
+    chain.reverse()
+    return chain
+
+
+def _patience_anchors(a: list[int], alo: int, ahi: int, b: list[int], blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Tokens unique on both sides, kept in their longest order-preserving chain."""
+    counts: dict[int, list[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, 0, i, 0])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    return _longest_chain(sorted((entry[2], entry[3]) for entry in counts.values() if entry[0] == 1 and entry[1] == 1))
+
+
+def _occurrence_anchors(a: list[int], alo: int, ahi: int, b: list[int], blo: int, bhi: int) -> list[tuple[int, int]]:
+    """The k-th occurrence of each token on the left paired with its k-th occurrence on the right, chained.
+
+    Used when a range has no unique tokens to anchor on; it finds a chain whenever the two sides share
+    any token at all, so the range is always split rather than reported as one block.
+    """
+    positions: dict[int, list[int]] = {}
+    for i in range(alo, ahi):
+        positions.setdefault(a[i], []).append(i)
+    seen: dict[int, int] = {}
+    pairs: list[tuple[int, int]] = []
+    for j in range(blo, bhi):
+        left_positions = positions.get(b[j])
+        if left_positions is None:
+            continue
+        occurrence = seen.get(b[j], 0)
+        if occurrence < len(left_positions):
+            pairs.append((left_positions[occurrence], j))
+            seen[b[j]] = occurrence + 1
+    pairs.sort()
+    return _longest_chain(pairs)
+
+
+def _diff_tokens(a: list[int], b: list[int]) -> tuple[list[tuple[int, int, int, int]], bool]:
+    hunks: list[tuple[int, int, int, int]] = []
+    approximate = False
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+        if alo == ahi or blo == bhi:
+            if alo < ahi or blo < bhi:
+                hunks.append((alo, ahi, blo, bhi))
+            continue
+        size = (ahi - alo) + (bhi - blo)
+        if size <= MYERS_MAX_TOKENS:
+            found = _myers(a[alo:ahi], b[blo:bhi], max(MYERS_WORK_BUDGET // size, 1))
+            if found is not None:
+                hunks.extend((alo + i1, alo + i2, blo + j1, blo + j2) for i1, i2, j1, j2 in found)
+                continue
+        anchors = _patience_anchors(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            anchors = _occurrence_anchors(a, alo, ahi, b, blo, bhi)
+            if not anchors:
+                # No token in common: the whole range is one replacement.
+                hunks.append((alo, ahi, blo, bhi))
+                continue
+            approximate = True
+        at_a, at_b = alo, blo
+        for i, j in anchors:
+            stack.append((at_a, i, at_b, j))
+            at_a, at_b = i + 1, j + 1
+        stack.append((at_a, ahi, at_b, bhi))
+    hunks.sort()
+    return hunks, approximate
+
+
+def diff_texts(left: str, right: str) -> TextDiff:
+    """Token-level diff of two full texts.
+
+    The common prefix and suffix (backed off to token boundaries) are trimmed first, the remainder
+    is tokenized, and the token streams are aligned with Myers' algorithm, splitting large ranges at
+    patience anchors.
+    """
+    prefix, suffix = _token_aligned_trim(left, right)
+    left_tokens = _TOKENIZE(left[prefix : len(left) - suffix])
+    right_tokens = _TOKENIZE(right[prefix : len(right) - suffix])
+    ids: dict[str, int] = {}
+    a = [ids.setdefault(token, len(ids)) for token in left_tokens]
+    b = [ids.setdefault(token, len(ids)) for token in right_tokens]
+    token_hunks, approximate = _diff_tokens(a, b)
+    left_offsets = _offsets(left_tokens, prefix)
+    right_offsets = _offsets(right_tokens, prefix)
+    return TextDiff(
+        hunks=[Hunk(left_offsets[i1], left_offsets[i2], right_offsets[j1], right_offsets[j2]) for i1, i2, j1, j2 in token_hunks],
+        approximate=approximate,
+    )
+
+
+def _bit_parallel_distance(pattern: str, text: str) -> int:
+    """Levenshtein distance via Myers' bit-vector algorithm, one big-int word per pattern."""
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+    peq: dict[str, int] = {}
+    for index, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << index)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def _fits_exact(left: str, right: str, max_cells: int, max_chars: int) -> bool:
+    return not left or not right or (len(left) * len(right) <= max_cells and max(len(left), len(right)) <= max_chars)
+
+
+def _span_distance(left: str, right: str, max_cells: int, max_chars: int) -> tuple[int, bool]:
+    if not _fits_exact(left, right, max_cells, max_chars):
+        return max(len(left), len(right)), False
+    shorter, longer = (left, right) if len(left) <= len(right) else (right, left)
+    return _bit_parallel_distance(shorter, longer), True
+
+
+def edit_distance(
+    left: str,
+    right: str,
+    *,
+    diff: TextDiff | None = None,
+    max_cells: int = EXACT_DISTANCE_MAX_CELLS,
+    max_chars: int = EXACT_DISTANCE_MAX_CHARS,
+) -> tuple[int, bool]:
+    """Character edit distance and whether it is exact.
+
+    Trimming the common prefix and suffix never changes the distance, so near-identical texts are
+    cheap. When the changed middle is too large (in cells, or in the length of either side), the
+    distances of the individual diff hunks are summed instead, which is an upper bound.
+    """
+    prefix, suffix = _trim(left, right)
+    left_middle = left[prefix : len(left) - suffix]
+    right_middle = right[prefix : len(right) - suffix]
+    if _fits_exact(left_middle, right_middle, max_cells, max_chars):
+        return _span_distance(left_middle, right_middle, max_cells, max_chars)
+    diff = diff or diff_texts(left, right)
+    total = 0
+    for hunk in diff.hunks:
+        distance, _ = _span_distance(
+            left[hunk.left_start : hunk.left_end], right[hunk.right_start : hunk.right_end], max_cells, max_chars
+        )
+        total += distance
+    return total, False
+
+
+def describe_spans(
+    left: str,
+    right: str,
+    hunks: list[Hunk],
+    *,
+    max_spans: int = MAX_REPORTED_SPANS,
+    max_span_chars: int = MAX_SPAN_CHARS,
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "left_start": hunk.left_start,
+            "left_end": hunk.left_end,
+            "right_start": hunk.right_start,
+            "right_end": hunk.right_end,
+            "left_text": left[hunk.left_start : min(hunk.left_end, hunk.left_start + max_span_chars)],
+            "right_text": right[hunk.right_start : min(hunk.right_end, hunk.right_start + max_span_chars)],
+        }
+        for hunk in hunks[:max_spans]
+    ]
+
+
+def compare_texts(left: str, right: str, *, max_spans: int = MAX_REPORTED_SPANS) -> dict[str, Any]:
+    """Distance plus a bounded description of the changed spans between two full texts."""
+    diff = diff_texts(left, right)
+    distance, exact = edit_distance(left, right, diff=diff)
+    return {
+        "distance": distance,
+        "distance_exact": exact,
+        "hunk_count": len(diff.hunks),
+        "left_changed_chars": sum(hunk.left_end - hunk.left_start for hunk in diff.hunks),
+        "right_changed_chars": sum(hunk.right_end - hunk.right_start for hunk in diff.hunks),
+        "changed_spans": describe_spans(left, right, diff.hunks, max_spans=max_spans),
+        "spans_truncated": len(diff.hunks) > max_spans,
+        "approximate": diff.approximate,
+    }
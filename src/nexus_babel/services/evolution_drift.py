@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from functools import lru_cache
+from operator import itemgetter
+
+RUN_CACHE_SIZE = 1 << 16
+# Below this many characters the reference cascade beats splitting the text into runs and memoizing them.
+MIN_CASCADE_CHARS = 32_768
+
+
+def sequential_natural_drift(text: str, natural_map: dict[str, str]) -> tuple[str, int]:
+    """Reference cascade: one count and one case-insensitive substitution pass per rule, in map order."""
+    out = text
+    replacements = 0
+    for old, new in natural_map.items():
+        count = out.lower().count(old)
+        replacements += count
+        out = re.sub(old, new, out, flags=re.IGNORECASE)
+    return out, replacements
+
+
+def sequential_reverse_drift(text: str, reverse_natural_map: dict[str, str]) -> tuple[str, int]:
+    """Reference cascade for reverse drift: longest keys first, literal case-insensitive substitution."""
+    out = text
+    reversals = 0
+    for old, new in _reverse_rules(reverse_natural_map):
+        out, count = re.subn(re.escape(old), new, out, flags=re.IGNORECASE)
+        reversals += count
+    return out, reversals
+
+
+def _reverse_rules(reverse_natural_map: dict[str, str]) -> list[tuple[str, str]]:
+    return sorted(reverse_natural_map.items(), key=lambda pair: len(pair[0]), reverse=True)
+
+
+# Case partners that str.lower/upper/title/casefold/swapcase of a character do not reach, but that
+# ``re.IGNORECASE`` matches or whose lower() contains the character (for example İ, ı, ſ and the Kelvin
+# sign). Derived once from a scan of every code point; the drift tests re-check it against that scan.
+_EXTRA_CASE_PARTNERS = {
+    "i": "\u0130\u0131",
+    "k": "\u212a",
+    "s": "\u017f",
+    "\u00e5": "\u212b",
+    "\u00df": "\u1e9e",
+    "\u0307": "\u0130",
+    "\u03b2": "\u03d0",
+    "\u03b5": "\u03f5",
+    "\u03b8": "\u03d1\u03f4",
+    "\u03b9": "\u0345\u1fbe",
+    "\u03ba": "\u03f0",
+    "\u03bc": "\u00b5",
+    "\u03c0": "\u03d6",
+    "\u03c1": "\u03f1",
+    "\u03c3": "\u03c2",
+    "\u03c6": "\u03d5",
+    "\u03c9": "\u2126",
+    "\u0432": "\u1c80",
+    "\u0434": "\u1c81",
+    "\u043e": "\u1c82",
+    "\u0441": "\u1c83",
+    "\u0442": "\u1c84\u1c85",
+    "\u044a": "\u1c86",
+    "\u0463": "\u1c87",
+    "\u1e61": "\u1e9b",
+    "\ua64b": "\u1c88",
+}
+
+
+def active_chars(pattern_chars: frozenset[str]) -> str:
+    """Every character that can take part in a match of the pattern characters.
+
+    That is anything the patterns match case-insensitively under ``re`` rules, plus anything whose
+    lower() form contains a pattern character (relevant to the natural drift counts). It is the
+    closure of the pattern characters under their case mappings and ``_EXTRA_CASE_PARTNERS``.
+    """
+    active: set[str] = set()
+    pending = list(pattern_chars)
+    while pending:
+        char = pending.pop()
+        if char in active:
+            continue
+        active.add(char)
+        for mapped in (char.lower(), char.upper(), char.title(), char.casefold(), char.swapcase()):
+            if len(mapped) == 1:
+                pending.append(mapped)
+        pending.extend(_EXTRA_CASE_PARTNERS.get(char, ""))
+    return "".join(sorted(active))
+
+
+class DriftCascade:
+    """A sequential rewrite cascade applied in one scan of the text.
+
+    No rule can match across a character outside the cascade's active alphabet, and such characters
+    are never rewritten, so the cascade decomposes over maximal runs of active characters. The text is
+    scanned once; each distinct run goes through the reference cascade once and is then memoized, so
+    output and counts are identical to running every rule over the whole text.
+    """
+
+    def __init__(self, cascade: Callable[[str], tuple[str, int]], pattern_chars: frozenset[str]):
+        self._split_runs = re.compile("([" + re.escape(active_chars(pattern_chars)) + "]+)").split
+        self._cascade_run = lru_cache(maxsize=RUN_CACHE_SIZE)(cascade)
+
+    def apply(self, text: str) -> tuple[str, int]:
+        # split() with a capturing group alternates [gap, run, gap, run, ..., gap]; mapping the C-level
+        # cache over the runs keeps the per-run work out of Python bytecode on cache hits.
+        parts = self._split_runs(text)
+        results = list(map(self._cascade_run, parts[1::2]))
+        parts[1::2] = map(itemgetter(0), results)
+        return "".join(parts), sum(map(itemgetter(1), results))
+
+
+def _plain_letters(keys: tuple[str, ...]) -> bool:
+    # Natural drift keys are used as regular expressions; only plain letters are literal.
+    return all(key and key.isalpha() for key in keys)
+
+
+@lru_cache(maxsize=8)
+def _natural_cascade(rules: tuple[tuple[str, str], ...]) -> DriftCascade | None:
+    if not _plain_letters(tuple(old for old, _ in rules)):
+        return None
+    natural_map = dict(rules)
+    return DriftCascade(lambda run: sequential_natural_drift(run, natural_map), frozenset("".join(natural_map)))
+
+
+@lru_cache(maxsize=8)
+def _reverse_cascade(rules: tuple[tuple[str, str], ...]) -> DriftCascade | None:
+    if not all(old for old, _ in rules):
+        return None
+    reverse_map = dict(rules)
+    return DriftCascade(lambda run: sequential_reverse_drift(run, reverse_map), frozenset("".join(reverse_map)))
+
+
+def natural_drift(text: str, natural_map: dict[str, str]) -> tuple[str, int]:
+    if len(text) < MIN_CASCADE_CHARS:
+        return sequential_natural_drift(text, natural_map)
+    cascade = _natural_cascade(tuple(natural_map.items()))
+    if cascade is None:
+        return sequential_natural_drift(text, natural_map)
+    return cascade.apply(text)
+
+
+def reverse_drift(text: str, reverse_natural_map: dict[str, str]) -> tuple[str, int]:
+    if len(text) < MIN_CASCADE_CHARS:
+        return sequential_reverse_drift(text, reverse_natural_map)
+    cascade = _reverse_cascade(tuple(reverse_natural_map.items()))
+    if cascade is None:
+        return sequential_reverse_drift(text, reverse_natural_map)
+    return cascade.apply(text)
@@ -2,9 +2,9 @@
 
 import hashlib
 import random
-import re
 from typing import Any, Sequence
 
+from . import evolution_drift, evolution_kernels
 from .evolution_types import DriftResult
 
 NATURAL_MAP = {
@@ -57,7 +57,7 @@
 
 GLYPH_POOL = ["∆", "Æ", "Ω", "§", "☲", "⟁", "Ψ", "Φ", "Θ", "Ξ"]
 PHASES = {"expansion", "peak", "compression", "rebirth"}
-MERGE_STRATEGIES = {"left_wins", "right_wins", "interleave"}
+MERGE_STRATEGIES = {"left_wins", "right_wins", "interleave", "three_way"}
 
 
 def validate_event_payload(
@@ -146,22 +146,12 @@ def apply_event(
     before_chars = len(text)
 
     if event_type == "natural_drift":
-        out = text
-        replacements = 0
-        for old, new in natural_map.items():
-            count = out.lower().count(old)
-            replacements += count
-            out = re.sub(old, new, out, flags=re.IGNORECASE)
+        out, replacements = evolution_drift.natural_drift(text, natural_map)
         return DriftResult(out, {"event": event_type, "replacements": replacements, "before_chars": before_chars, "after_chars": len(out)})
 
     if event_type == "synthetic_mutation":
-        words = re.findall(r"\w+|\W+", text)
-        mutations = 0
-        for idx, token in enumerate(words):
-            if token.isalpha() and rng.random() < float(event_payload.get("mutation_rate", 0.08)):
-                words[idx] = rng.choice(list(glyph_pool))
-                mutations += 1
-        out = "".join(words)
+        mutation_rate = float(event_payload.get("mutation_rate", 0.08))
+        out, mutations = evolution_kernels.mutate_words(text, rng, mutation_rate, glyph_pool)
         return DriftResult(out, {"event": event_type, "mutations": mutations, "before_chars": before_chars, "after_chars": len(out)})
 
     if event_type == "phase_shift":
@@ -175,21 +165,10 @@ def apply_event(
             intensity = max(acceleration * (1.0 - (phase_idx - 2) * 0.3), 0.2)
 
         if phase == "compression":
-            chars = list(text)
-            removals = 0
-            for i in range(len(chars) - 1, -1, -1):
-                if chars[i].lower() in "aeiou" and rng.random() < min(intensity * 0.6, 1.0):
-                    chars.pop(i)
-                    removals += 1
-            out = "".join(chars)
+            out, _ = evolution_kernels.drop_vowels(text, rng, min(intensity * 0.6, 1.0))
         elif phase == "rebirth":
-            chars = list(text)
-            removals = 0
-            for i in range(len(chars) - 1, -1, -1):
-                if chars[i].lower() in "aeiou" and rng.random() < min(intensity * 0.4, 1.0):
-                    chars.pop(i)
-                    removals += 1
-            out = f"{''.join(chars)}\n\n⟁ SONG-BIRTH ⟁"
+            kept, _ = evolution_kernels.drop_vowels(text, rng, min(intensity * 0.4, 1.0))
+            out = f"{kept}\n\n⟁ SONG-BIRTH ⟁"
         elif phase == "peak":
             out = text.upper()
             if intensity > 1.5:
@@ -227,12 +206,7 @@ def apply_event(
         return DriftResult(remixed_text, {"event": event_type, "strategy": strategy, "before_chars": before_chars, "after_chars": len(remixed_text)})
 
     if event_type == "reverse_drift":
-        out = text
-        reversals = 0
-        reverse_pairs = sorted(reverse_natural_map.items(), key=lambda pair: len(pair[0]), reverse=True)
-        for old, new in reverse_pairs:
-            out, count = re.subn(re.escape(old), new, out, flags=re.IGNORECASE)
-            reversals += count
+        out, reversals = evolution_drift.reverse_drift(text, reverse_natural_map)
         return DriftResult(
             out,
             {
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+import re
+from collections.abc import Sequence
+
+# Exactly the characters whose lower() is a substring of "aeiou", which is what the reference
+# kernels test per character.
+_SPLIT_VOWELS = re.compile(r"([aeiouAEIOU])").split
+_SPLIT_WORDS = re.compile(r"(\w+)").split
+
+
+def drop_vowels(text: str, rng: random.Random, probability: float) -> tuple[str, int]:
+    """Drop each vowel with ``probability``, drawing in the reference order (last character first).
+
+    Splitting on vowels yields [span, vowel, span, ..., span]; dropped vowels are blanked in place and
+    the list joined once, so the cost is linear instead of one list shift per removal.
+    """
+    parts = _SPLIT_VOWELS(text)
+    draw = rng.random
+    removals = 0
+    for idx in range(len(parts) - 2, 0, -2):
+        if draw() < probability:
+            parts[idx] = ""
+            removals += 1
+    return "".join(parts), removals
+
+
+def mutate_words(text: str, rng: random.Random, rate: float, glyph_pool: Sequence[str]) -> tuple[str, int]:
+    """Replace alphabetic words with random glyphs, consuming the RNG exactly like the reference kernel.
+
+    Non-word runs never draw from the RNG, so only the ``\\w+`` tokens at odd split positions are
+    visited, and the glyph pool is materialized once rather than per mutation.
+    """
+    parts = _SPLIT_WORDS(text)
+    pool = list(glyph_pool)
+    draw = rng.random
+    choice = rng.choice
+    mutations = 0
+    for idx in range(1, len(parts), 2):
+        if parts[idx].isalpha() and draw() < rate:
+            parts[idx] = choice(pool)
+            mutations += 1
+    return "".join(parts), mutations
+
+
+def drop_vowels_reference(text: str, rng: random.Random, probability: float) -> tuple[str, int]:
+    chars = list(text)
+    removals = 0
+    for i in range(len(chars) - 1, -1, -1):
+        if chars[i].lower() in "aeiou" and rng.random() < probability:
+            chars.pop(i)
+            removals += 1
+    return "".join(chars), removals
+
+
+def mutate_words_reference(text: str, rng: random.Random, rate: float, glyph_pool: Sequence[str]) -> tuple[str, int]:
+    words = re.findall(r"\w+|\W+", text)
+    mutations = 0
+    for idx, token in enumerate(words):
+        if token.isalpha() and rng.random() < rate:
+            words[idx] = rng.choice(list(glyph_pool))
+            mutations += 1
+    return "".join(words), mutations
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import hashlib
-from typing import Any, Callable
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
 from sqlalchemy.orm import Session
 
 from nexus_babel.models import Branch
 
+from . import evolution_diff
+
+# Merge payloads are stored on the event, so fewer regions are described than for an ad-hoc compare.
+MAX_CONFLICT_REGIONS = 20
+
 
 def find_lca(
     session: Session,
@@ -26,7 +33,93 @@ def find_lca(
     return lca
 
 
-def merge_texts(left_text: str, right_text: str, strategy: str) -> str:
+@dataclass
+class ThreeWayMerge:
+    merged_text: str
+    left_hunk_count: int
+    right_hunk_count: int
+    applied_left: int = 0
+    applied_right: int = 0
+    identical_changes: int = 0
+    conflicts: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _replay_region(base_text: str, start: int, end: int, text: str, hunks: list[evolution_diff.Hunk]) -> str:
+    # Rebuild one side's version of base[start:end] from its hunks inside that region.
+    out: list[str] = []
+    at = start
+    for hunk in hunks:
+        out.append(base_text[at : hunk.left_start])
+        out.append(text[hunk.right_start : hunk.right_end])
+        at = hunk.left_end
+    out.append(base_text[at:end])
+    return "".join(out)
+
+
+def three_way_merge(base_text: str, left_text: str, right_text: str) -> ThreeWayMerge:
+    """diff3-style merge of left and right against their common ancestor text.
+
+    Both sides are diffed against the base; hunks whose base ranges do not overlap are applied
+    automatically, identical changes are applied once, and overlapping different changes are recorded
+    as conflicts and resolved to the left side (the merge branch's parent).
+    """
+    left_hunks = evolution_diff.diff_texts(base_text, left_text).hunks
+    right_hunks = evolution_diff.diff_texts(base_text, right_text).hunks
+    tagged = sorted(
+        [(hunk.left_start, hunk.left_end, 0, hunk) for hunk in left_hunks]
+        + [(hunk.left_start, hunk.left_end, 1, hunk) for hunk in right_hunks],
+        key=lambda item: (item[0], item[1], item[2]),
+    )
+    result = ThreeWayMerge(merged_text="", left_hunk_count=len(left_hunks), right_hunk_count=len(right_hunks))
+    out: list[str] = []
+    at = 0
+    index = 0
+    while index < len(tagged):
+        start, end, _, _ = tagged[index]
+        group = [tagged[index]]
+        index += 1
+        # Overlapping base ranges, or two insertions at the same point, belong to one region.
+        while index < len(tagged) and (tagged[index][0] < end or tagged[index][0] == start):
+            end = max(end, tagged[index][1])
+            group.append(tagged[index])
+            index += 1
+        out.append(base_text[at:start])
+        left_group = [hunk for _, _, side, hunk in group if side == 0]
+        right_group = [hunk for _, _, side, hunk in group if side == 1]
+        left_version = _replay_region(base_text, start, end, left_text, left_group)
+        if not right_group:
+            out.append(left_version)
+            result.applied_left += len(left_group)
+        elif not left_group:
+            out.append(_replay_region(base_text, start, end, right_text, right_group))
+            result.applied_right += len(right_group)
+        else:
+            right_version = _replay_region(base_text, start, end, right_text, right_group)
+            out.append(left_version)
+            if left_version == right_version:
+                result.identical_changes += 1
+            else:
+                result.conflicts.append(
+                    {
+                        "base_start": start,
+                        "base_end": end,
+                        "base_text": base_text[start : min(end, start + evolution_diff.MAX_SPAN_CHARS)],
+                        "left_text": left_version[: evolution_diff.MAX_SPAN_CHARS],
+                        "right_text": right_version[: evolution_diff.MAX_SPAN_CHARS],
+                        "resolution": "left",
+                    }
+                )
+        at = end
+    out.append(base_text[at:])
+    result.merged_text = "".join(out)
+    return result
+
+
+def merge_texts(left_text: str, right_text: str, strategy: str, *, base_text: str | None = None) -> str:
+    if strategy == "three_way":
+        if base_text is None:
+            raise ValueError("three_way merge requires the common ancestor text")
+        return three_way_merge(base_text, left_text, right_text).merged_text
     if strategy == "left_wins":
         return left_text
     if strategy == "right_wins":
@@ -50,12 +143,16 @@ def build_merge_conflict_semantics(
     right_text: str,
     merged_text: str,
     strategy: str,
+    three_way: ThreeWayMerge | None = None,
+    base_text: str | None = None,
 ) -> dict[str, Any]:
     left_words = left_text.split()
     right_words = right_text.split()
     merged_words = merged_text.split()
     left_word_set = set(left_words)
     right_word_set = set(right_words)
+    diff = evolution_diff.diff_texts(left_text, right_text)
+    edit_distance, edit_distance_exact = evolution_diff.edit_distance(left_text, right_text, diff=diff)
     left_hash = hashlib.sha256(left_text.encode("utf-8")).hexdigest()
     right_hash = hashlib.sha256(right_text.encode("utf-8")).hexdigest()
     inputs_identical = left_hash == right_hash
@@ -66,18 +163,22 @@ def build_merge_conflict_semantics(
         resolution = "left_preferred"
     elif strategy == "right_wins":
         resolution = "right_preferred"
+    elif three_way is not None:
+        resolution = "three_way_conflicts_left_preferred" if three_way.conflicts else "three_way_clean"
     else:
         resolution = "interleaved_union"
 
-    return {
+    semantics: dict[str, Any] = {
         "resolution": resolution,
         "strategy_effect": {
             "left_wins": "preserve_left",
             "right_wins": "preserve_right",
             "interleave": "word_interleave",
+            "three_way": "ancestor_hunk_merge",
         }.get(strategy, "unknown"),
         "inputs_identical": inputs_identical,
-        "drops_non_selected_input": strategy in {"left_wins", "right_wins"} and not inputs_identical,
+        "drops_non_selected_input": (strategy in {"left_wins", "right_wins"} and not inputs_identical)
+        or bool(three_way is not None and three_way.conflicts),
         "left_chars": len(left_text),
         "right_chars": len(right_text),
         "merged_chars": len(merged_text),
@@ -89,25 +190,35 @@ def build_merge_conflict_semantics(
         "right_only_word_count": len(right_word_set - left_word_set),
         "common_prefix_chars": common_prefix_chars(left_text, right_text),
         "common_suffix_chars": common_suffix_chars(left_text, right_text),
+        "edit_distance": edit_distance,
+        "edit_distance_exact": edit_distance_exact,
+        "conflict_region_count": len(diff.hunks),
+        "conflict_regions": evolution_diff.describe_spans(left_text, right_text, diff.hunks, max_spans=MAX_CONFLICT_REGIONS),
+        "conflict_regions_truncated": len(diff.hunks) > MAX_CONFLICT_REGIONS,
+        "diff_approximate": diff.approximate,
     }
+    if three_way is not None:
+        semantics["three_way"] = {
+            "base_text_hash": hashlib.sha256((base_text or "").encode("utf-8")).hexdigest(),
+            "base_chars": len(base_text or ""),
+            "left_hunk_count": three_way.left_hunk_count,
+            "right_hunk_count": three_way.right_hunk_count,
+            "applied_left_hunks": three_way.applied_left,
+            "applied_right_hunks": three_way.applied_right,
+            "identical_changes": three_way.identical_changes,
+            "conflict_hunk_count": len(three_way.conflicts),
+            "conflict_hunks": three_way.conflicts[:MAX_CONFLICT_REGIONS],
+            "conflict_hunks_truncated": len(three_way.conflicts) > MAX_CONFLICT_REGIONS,
+        }
+    return semantics
 
 
 def common_prefix_chars(left: str, right: str) -> int:
-    count = 0
-    for left_char, right_char in zip(left, right):
-        if left_char != right_char:
-            break
-        count += 1
-    return count
+    return evolution_diff.common_prefix_len(left, right)
 
 
 def common_suffix_chars(left: str, right: str) -> int:
-    count = 0
-    for left_char, right_char in zip(reversed(left), reversed(right)):
-        if left_char != right_char:
-            break
-        count += 1
-    return count
+    return evolution_diff.common_suffix_len(left, right)
 
 
 def simple_distance(left: str, right: str) -> int:
@@ -5,37 +5,58 @@
 import zlib
 from typing import Any, Callable
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, func, literal_column, select
+from sqlalchemy.orm import Session, aliased
 
 from nexus_babel.models import Branch, BranchCheckpoint, BranchEvent, Document
 from .evolution_types import DriftResult
 
 
+def _ancestry_cte(branch_id: str):
+    # Walks parent_branch_id upwards from the branch; depth 0 is the branch itself. The depth seed is
+    # an inline SQL literal so Postgres types both recursive terms as integer.
+    ancestry = (
+        select(Branch.id.label("branch_id"), Branch.parent_branch_id.label("parent_id"), literal_column("0", Integer).label("depth"))
+        .where(Branch.id == branch_id)
+        .cte("lineage_ancestry", recursive=True)
+    )
+    parent = aliased(Branch)
+    return ancestry.union_all(
+        select(parent.id, parent.parent_branch_id, ancestry.c.depth + 1).join(ancestry, parent.id == ancestry.c.parent_id)
+    )
+
+
+def lineage_with_event_counts(session: Session, branch: Branch) -> list[tuple[Branch, int]]:
+    """Root-first ancestry of ``branch`` with each node's event count, in a single query."""
+    ancestry = _ancestry_cte(branch.id)
+    event_count = (
+        select(func.count(BranchEvent.id)).where(BranchEvent.branch_id == ancestry.c.branch_id).scalar_subquery()
+    )
+    rows = session.execute(
+        select(Branch, event_count).join(ancestry, Branch.id == ancestry.c.branch_id).order_by(ancestry.c.depth.desc())
+    ).all()
+    return [(node, int(count or 0)) for node, count in rows]
+
+
 def lineage(session: Session, branch: Branch) -> list[Branch]:
-    result = [branch]
-    current = branch
-    while current.parent_branch_id:
-        parent = session.scalar(select(Branch).where(Branch.id == current.parent_branch_id))
-        if not parent:
-            break
-        result.append(parent)
-        current = parent
-    result.reverse()
-    return result
+    ancestry = _ancestry_cte(branch.id)
+    return list(
+        session.scalars(select(Branch).join(ancestry, Branch.id == ancestry.c.branch_id).order_by(ancestry.c.depth.desc())).all()
+    )
 
 
 def lineage_event_count(
     session: Session,
     branch: Branch,
     *,
-    lineage_fn: Callable[[Session, Branch], list[Branch]] = lineage,
+    lineage_fn: Callable[[Session, Branch], list[Branch]] | None = None,
 ) -> int:
-    lineage_nodes = lineage_fn(session, branch)
-    count = 0
-    for node in lineage_nodes:
-        count += int(session.scalar(select(func.count(BranchEvent.id)).where(BranchEvent.branch_id == node.id)) or 0)
-    return count
+    if lineage_fn is None:
+        return sum(count for _, count in lineage_with_event_counts(session, branch))
+    lineage_ids = [node.id for node in lineage_fn(session, branch)]
+    if not lineage_ids:
+        return 0
+    return int(session.scalar(select(func.count(BranchEvent.id)).where(BranchEvent.branch_id.in_(lineage_ids))) or 0)
 
 
 def latest_lineage_checkpoint(session: Session, lineage_nodes: list[Branch]) -> BranchCheckpoint | None:
@@ -50,16 +71,16 @@ def latest_lineage_checkpoint(session: Session, lineage_nodes: list[Branch]) ->
 
 
 def collect_lineage_events(session: Session, lineage_nodes: list[Branch]) -> list[BranchEvent]:
-    events: list[BranchEvent] = []
-    for node in lineage_nodes:
-        events.extend(
-            session.scalars(
-                select(BranchEvent)
-                .where(BranchEvent.branch_id == node.id)
-                .order_by(BranchEvent.event_index, BranchEvent.created_at)
-            ).all()
-        )
-    return events
+    position = {node.id: offset for offset, node in enumerate(lineage_nodes)}
+    if not position:
+        return []
+    events = session.scalars(
+        select(BranchEvent)
+        .where(BranchEvent.branch_id.in_(list(position)))
+        .order_by(BranchEvent.event_index, BranchEvent.created_at)
+    ).all()
+    # Stable sort keeps the per-branch (event_index, created_at) order inside lineage order.
+    return sorted(events, key=lambda event: position[event.branch_id])
 
 
 def resolve_root_text(session: Session, root_document_id: str | None) -> str:
@@ -107,9 +128,9 @@ def next_event_index(session: Session, branch_id: str) -> int:
     return int(max_index or 0) + 1
 
 
-def compress_snapshot(snapshot: dict[str, Any]) -> str:
+def compress_snapshot(snapshot: dict[str, Any], *, level: int = 9) -> str:
     encoded = json.dumps(snapshot, sort_keys=True).encode("utf-8")
-    compressed = zlib.compress(encoded, level=9)
+    compressed = zlib.compress(encoded, level=level)
     return base64.b64encode(compressed).decode("ascii")
 
 
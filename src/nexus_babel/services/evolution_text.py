@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from nexus_babel.models import Branch, BranchCheckpoint, BranchEvent
+
+from . import evolution_diff, evolution_events, evolution_replay
+from .evolution_types import DriftResult
+
+DEFAULT_TEXT_CACHE_CHARS = 32_000_000
+# A splice is only kept when its inserted span is at most this fraction of the new text; otherwise
+# the branch's own (deterministic) event is the cheaper delta to store.
+SPLICE_MAX_INSERT_RATIO = 0.25
+
+
+class TextLRUCache:
+    """Thread-safe LRU of texts bounded by total characters rather than entry count.
+
+    With ``persist_dir`` set, entries are also written through to gzip files there and reloaded on a
+    memory miss, so a restarted process starts warm.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_TEXT_CACHE_CHARS, *, persist_dir: Path | None = None):
+        self.max_chars = max(int(max_chars), 0)
+        self.persist_dir = persist_dir
+        self.size_chars = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[str, str]) -> str | None:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+        text = self._read_persisted(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, text)
+        return text
+
+    def put(self, key: tuple[str, str], text: str) -> None:
+        self._remember(key, text)
+        self._write_persisted(key, text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_chars = 0
+
+    def _remember(self, key: tuple[str, str], text: str) -> None:
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_chars -= len(previous)
+            self._entries[key] = text
+            self.size_chars += len(text)
+            while self.size_chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_chars -= len(evicted)
+
+    def _path(self, key: tuple[str, str]) -> Path | None:
+        if self.persist_dir is None:
+            return None
+        digest = hashlib.sha256("\x00".join(key).encode("utf-8")).hexdigest()
+        return self.persist_dir / digest[:2] / f"{digest}.txt.gz"
+
+    def _read_persisted(self, key: tuple[str, str]) -> str | None:
+        path = self._path(key)
+        if path is None or not path.is_file():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                return handle.read()
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def _write_persisted(self, key: tuple[str, str], text: str) -> None:
+        path = self._path(key)
+        if path is None or path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as handle:
+                handle.write(text)
+            tmp.replace(path)
+        except OSError:
+            # The disk tier is best-effort; the in-memory entry is already in place.
+            return
+
+
+def encode_text_delta(base_branch_id: str, base_text: str, text: str) -> dict[str, Any]:
+    prefix = evolution_diff.common_prefix_len(base_text, text)
+    suffix = evolution_diff.common_suffix_len(base_text, text, min(len(base_text), len(text)) - prefix)
+    inserted = text[prefix : len(text) - suffix]
+    if len(inserted) <= len(text) * SPLICE_MAX_INSERT_RATIO:
+        return {"op": "splice", "base_branch_id": base_branch_id, "prefix": prefix, "suffix": suffix, "insert": inserted}
+    return {"op": "replay", "base_branch_id": base_branch_id}
+
+
+def apply_splice(base_text: str, delta: dict[str, Any]) -> str:
+    prefix = int(delta["prefix"])
+    suffix = int(delta["suffix"])
+    return base_text[:prefix] + str(delta["insert"]) + base_text[len(base_text) - suffix :]
+
+
+def default_apply_event(text: str, event_type: str, event_payload: dict[str, Any]) -> DriftResult:
+    return evolution_events.apply_event(
+        text,
+        event_type,
+        event_payload,
+        natural_map=evolution_events.NATURAL_MAP,
+        reverse_natural_map=evolution_events.REVERSE_NATURAL_MAP,
+        glyph_pool=evolution_events.GLYPH_POOL,
+    )
+
+
+def materialize_branch_text(
+    session: Session,
+    branch: Branch,
+    *,
+    cache: TextLRUCache | None = None,
+    apply_event_fn: Callable[[str, str, dict[str, Any]], DriftResult] = default_apply_event,
+    decompress_snapshot_fn: Callable[[str], dict[str, Any]] = evolution_replay.decompress_snapshot,
+) -> str:
+    """Return a branch's full text from its stored form.
+
+    Root branches (and branches written before delta storage) keep ``current_text`` inline; keyframes
+    live in the branch's checkpoint; every other branch holds a splice or replays its own event against
+    its parent. Each branch materialized along the way is added to ``cache``.
+    """
+    pending: list[Branch] = []
+    node: Branch | None = branch
+    text: str | None = None
+    while node is not None:
+        snapshot = node.state_snapshot or {}
+        if "current_text" in snapshot:
+            text = str(snapshot.get("current_text", ""))
+            break
+        if cache is not None:
+            text = cache.get((node.id, str(snapshot.get("text_hash", ""))))
+            if text is not None:
+                break
+        delta = snapshot.get("text_delta") or {}
+        if delta.get("op") == "checkpoint":
+            checkpoint = session.scalar(
+                select(BranchCheckpoint)
+                .where(BranchCheckpoint.branch_id == node.id)
+                .order_by(BranchCheckpoint.event_index.desc())
+            )
+            if checkpoint is not None:
+                text = str(decompress_snapshot_fn(checkpoint.snapshot_compressed).get("current_text", ""))
+                if cache is not None:
+                    cache.put((node.id, str(snapshot.get("text_hash", ""))), text)
+                break
+        pending.append(node)
+        base_branch_id = delta.get("base_branch_id") or node.parent_branch_id
+        if not base_branch_id:
+            break
+        node = session.get(Branch, base_branch_id)
+        if node is None:
+            raise LookupError(f"Base branch {base_branch_id} for branch text is missing")
+
+    if text is None:
+        text = evolution_replay.resolve_root_text(session, branch.root_document_id)
+    if not pending:
+        return text
+
+    replay_ids = [item.id for item in pending if ((item.state_snapshot or {}).get("text_delta") or {}).get("op") != "splice"]
+    events_by_branch: dict[str, list[BranchEvent]] = {}
+    if replay_ids:
+        for event in session.scalars(
+            select(BranchEvent).where(BranchEvent.branch_id.in_(replay_ids)).order_by(BranchEvent.event_index, BranchEvent.created_at)
+        ).all():
+            events_by_branch.setdefault(event.branch_id, []).append(event)
+
+    for item in reversed(pending):
+        snapshot = item.state_snapshot or {}
+        delta = snapshot.get("text_delta") or {}
+        if delta.get("op") == "splice":
+            text = apply_splice(text, delta)
+        else:
+            for event in events_by_branch.get(item.id, []):
+                text = apply_event_fn(text, event.event_type, event.event_payload).output_text
+        if cache is not None:
+            cache.put((item.id, str(snapshot.get("text_hash", ""))), text)
+    return text
@@ -39,6 +39,8 @@ class VisualizationSummary(TypedDict):
     lineage_depth: int
     secondary_lineage_branch_count: int
     merge_secondary_edge_count: int
+    max_depth: int | None
+    depth_truncated: bool
 
 
 class MergeConflictSemantics(TypedDict, total=False):
@@ -57,4 +59,11 @@ class MergeConflictSemantics(TypedDict, total=False):
     right_only_word_count: int
     common_prefix_chars: int
     common_suffix_chars: int
+    edit_distance: int
+    edit_distance_exact: bool
+    conflict_region_count: int
+    conflict_regions: list[dict[str, Any]]
+    conflict_regions_truncated: bool
+    diff_approximate: bool
+    three_way: NotRequired[dict[str, Any]]
     note: NotRequired[str]
@@ -1,9 +1,148 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Any
 
+from sqlalchemy import Integer, String, func, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session
+
 from nexus_babel.models import Branch, BranchEvent
 
+DEFAULT_GRAPH_CACHE_ENTRIES = 256
+
+
+class GraphLRUCache:
+    """Thread-safe LRU of assembled visualization graphs keyed by their head event hashes."""
+
+    def __init__(self, max_entries: int = DEFAULT_GRAPH_CACHE_ENTRIES):
+        self.max_entries = max(int(max_entries), 0)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            graph = self._entries.get(key)
+            if graph is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return graph
+
+    def put(self, key: str, graph: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = graph
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _reachable_cte(branch_id: str, max_depth: int | None):
+    # Graph edges point from a branch to its primary parent and, for merge events, to the merge's
+    # right-hand branch. Both kinds are folded into one edge relation so the recursive term
+    # references the CTE once, which keeps it portable between SQLite and PostgreSQL. Each step
+    # looks edges up by child id: branches by primary key, merge edges through the
+    # (branch_id, merge_right_branch_id) index.
+    edges = union_all(
+        select(Branch.id.label("child_id"), Branch.parent_branch_id.label("parent_id")).where(Branch.parent_branch_id.is_not(None)),
+        select(BranchEvent.branch_id.label("child_id"), BranchEvent.merge_right_branch_id.label("parent_id")).where(
+            BranchEvent.merge_right_branch_id.is_not(None)
+        ),
+    ).subquery("visualization_edges")
+    reach = select(
+        literal(branch_id, String).label("branch_id"),
+        literal_column("0", Integer).label("depth"),
+    ).cte("visualization_reach", recursive=True)
+    step = select(edges.c.parent_id, reach.c.depth + 1).join(reach, edges.c.child_id == reach.c.branch_id)
+    if max_depth is not None:
+        # One level past the limit is fetched so callers can tell whether the graph was cut.
+        step = step.where(reach.c.depth <= max_depth)
+    return reach.union(step)
+
+
+def reachable_branch_depths(session: Session, branch_id: str, *, max_depth: int | None = None) -> dict[str, int]:
+    """Shortest hop distance from ``branch_id`` to every branch reachable through parent and merge edges."""
+    reach = _reachable_cte(branch_id, max_depth)
+    rows = session.execute(select(reach.c.branch_id, func.min(reach.c.depth)).group_by(reach.c.branch_id)).all()
+    return {str(row[0]): int(row[1]) for row in rows}
+
+
+def head_event_hashes(session: Session, branch_ids: list[str]) -> dict[str, str]:
+    """Hash of the last event on each branch, read as a narrow projection."""
+    heads: dict[str, tuple[int, str]] = {}
+    if not branch_ids:
+        return {}
+    for branch_id, event_index, event_hash in session.execute(
+        select(BranchEvent.branch_id, BranchEvent.event_index, BranchEvent.event_hash).where(BranchEvent.branch_id.in_(branch_ids))
+    ).all():
+        current = heads.get(branch_id)
+        if current is None or event_index >= current[0]:
+            heads[branch_id] = (event_index, event_hash)
+    return {branch_id: event_hash for branch_id, (_, event_hash) in heads.items()}
+
+
+def graph_cache_key(branch_id: str, max_depth: int | None, heads: dict[str, str], branch_ids: list[str]) -> str:
+    digest = hashlib.sha256(f"{branch_id}:{max_depth}".encode())
+    for node_id in sorted(branch_ids):
+        digest.update(f"|{node_id}={heads.get(node_id, '')}".encode())
+    return digest.hexdigest()
+
+
+def load_visualization_graph(
+    session: Session,
+    branch: Branch,
+    branch_ids: list[str],
+) -> tuple[list[Branch], dict[str, Branch], dict[str, list[BranchEvent]]]:
+    """Load branches and events of a reachable set in two queries and derive the primary lineage."""
+    branches_by_id: dict[str, Branch] = {branch.id: branch}
+    for node in session.scalars(select(Branch).where(Branch.id.in_(branch_ids))).all():
+        branches_by_id[node.id] = node
+    branch_events_by_id: dict[str, list[BranchEvent]] = {node_id: [] for node_id in branches_by_id}
+    for event in session.scalars(
+        select(BranchEvent).where(BranchEvent.branch_id.in_(branch_ids)).order_by(BranchEvent.event_index, BranchEvent.created_at)
+    ).all():
+        branch_events_by_id.setdefault(event.branch_id, []).append(event)
+
+    primary_lineage: list[Branch] = []
+    node: Branch | None = branch
+    while node is not None:
+        primary_lineage.append(node)
+        node = branches_by_id.get(node.parent_branch_id) if node.parent_branch_id else None
+    primary_lineage.reverse()
+    return primary_lineage, branches_by_id, branch_events_by_id
+
+
+def paginate_visualization_graph(graph: dict[str, Any], *, offset: int = 0, limit: int | None = None) -> dict[str, Any]:
+    """Slice the node list; each edge is returned with the page holding its target node."""
+    nodes = graph["nodes"]
+    page_nodes = nodes[offset:] if limit is None else nodes[offset : offset + limit]
+    if len(page_nodes) == len(nodes):
+        page_edges = graph["edges"]
+    else:
+        page_ids = {node["id"] for node in page_nodes}
+        page_edges = [edge for edge in graph["edges"] if edge["target"] in page_ids]
+    return {
+        **graph,
+        "nodes": page_nodes,
+        "edges": page_edges,
+        "total": len(nodes),
+        "offset": offset,
+        "limit": limit,
+    }
+
 
 def assemble_visualization_graph(
     *,
@@ -11,6 +150,8 @@ def assemble_visualization_graph(
     primary_lineage: list[Branch],
     branches_by_id: dict[str, Branch],
     branch_events_by_id: dict[str, list[BranchEvent]],
+    max_depth: int | None = None,
+    depth_truncated: bool = False,
 ) -> dict[str, Any]:
     primary_branch_ids = {node.id for node in primary_lineage}
     lineage = list(primary_lineage) + sorted(
@@ -116,5 +257,7 @@ def assemble_visualization_graph(
             "lineage_depth": len(primary_lineage),
             "secondary_lineage_branch_count": len(secondary_branch_ids),
             "merge_secondary_edge_count": merge_secondary_edge_count,
+            "max_depth": max_depth,
+            "depth_truncated": depth_truncated,
         },
     }
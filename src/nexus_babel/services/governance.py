@@ -3,6 +3,7 @@
 import hashlib
 import re
 from typing import Iterable
+from uuid import uuid4
 
 from sqlalchemy import desc, select
 from sqlalchemy.orm import Session
@@ -43,6 +44,10 @@ def ensure_default_policies(self, session: Session, blocked_terms: Iterable[str]
             )
 
     def evaluate(self, session: Session, candidate_output: str, mode: str) -> dict:
+        return self.evaluate_many(session, [candidate_output], mode)[0]
+
+    def evaluate_many(self, session: Session, candidate_outputs: list[str], mode: str) -> list[dict]:
+        """Evaluate several outputs under one policy lookup, writing their audit rows in a single flush."""
         normalized_mode = mode.upper()
         now = utcnow()
         policy_row = session.scalar(
@@ -55,6 +60,51 @@ def evaluate(self, session: Session, candidate_output: str, mode: str) -> dict:
         if not policy_row:
             raise ValueError(f"Policy for mode {normalized_mode} not found")
 
+        results: list[dict] = []
+        rows: list[AuditLog | PolicyDecision] = []
+        for candidate_output in candidate_outputs:
+            result = self._judge(policy_row, candidate_output, normalized_mode)
+            audit = AuditLog(
+                id=str(uuid4()),
+                action="governance.evaluate",
+                mode=normalized_mode,
+                actor="system",
+                details={
+                    "input_preview": candidate_output[:240],
+                    "policy_hits": result["policy_hits"],
+                    "policy_version": policy_row.policy_version,
+                    "allow": result["allow"],
+                    "decision_trace": result["decision_trace"],
+                },
+            )
+            decision = PolicyDecision(
+                id=str(uuid4()),
+                mode=normalized_mode,
+                input_hash=hashlib.sha256(candidate_output.encode("utf-8")).hexdigest(),
+                allow=result["allow"],
+                policy_hits=result["policy_hits"],
+                redactions=result["redactions"],
+                decision_trace=result["decision_trace"],
+                audit_id=audit.id,
+            )
+            rows += [audit, decision]
+            results.append({**result, "audit_id": audit.id, "decision_id": decision.id})
+        session.add_all(rows)
+        session.flush()
+        return [
+            {
+                "allow": result["allow"],
+                "policy_hits": result["policy_hits"],
+                "redactions": result["redactions"],
+                "audit_id": result["audit_id"],
+                "decision_id": result["decision_id"],
+                "redacted_text": result["redacted_text"],
+                "decision_trace": result["decision_trace"],
+            }
+            for result in results
+        ]
+
+    def _judge(self, policy_row: ModePolicy, candidate_output: str, normalized_mode: str) -> dict:
         policy = policy_row.policy or {}
         blocked_terms = [t.lower() for t in policy.get("blocked_terms", [])]
         redaction_style = policy.get("redaction_style", "[REDACTED]")
@@ -100,39 +150,10 @@ def evaluate(self, session: Session, candidate_output: str, mode: str) -> dict:
             "allow": allow,
         }
 
-        audit = AuditLog(
-            action="governance.evaluate",
-            mode=normalized_mode,
-            actor="system",
-            details={
-                "input_preview": candidate_output[:240],
-                "policy_hits": policy_hits,
-                "policy_version": policy_row.policy_version,
-                "allow": allow,
-                "decision_trace": decision_trace,
-            },
-        )
-        session.add(audit)
-        session.flush()
-
-        decision = PolicyDecision(
-            mode=normalized_mode,
-            input_hash=hashlib.sha256(candidate_output.encode("utf-8")).hexdigest(),
-            allow=allow,
-            policy_hits=policy_hits,
-            redactions=redactions,
-            decision_trace=decision_trace,
-            audit_id=audit.id,
-        )
-        session.add(decision)
-        session.flush()
-
         return {
             "allow": allow,
             "policy_hits": policy_hits,
             "redactions": redactions,
-            "audit_id": audit.id,
-            "decision_id": decision.id,
             "redacted_text": redacted_text,
             "decision_trace": decision_trace,
         }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -7,7 +8,6 @@
 
 from nexus_babel.models import Document
 
-
 PROJECTION_CHUNK_SIZE = 500
 
 
@@ -89,45 +89,76 @@ def _clear_local_projection(self, doc_node_id: str) -> None:
         self.local.nodes.pop(doc_node_id, None)
 
     def integrity_for_document(self, document: Document) -> dict[str, Any]:
-        expected = int(document.atom_count or 0)
-        projected = int(document.graph_projected_atom_count or 0)
-        base = {
-            "document_id": document.id,
-            "document_nodes": 1,
-            "atom_nodes": projected,
-            "contains_edges": projected,
-            "expected_atom_nodes": expected,
-            "projection_status": document.graph_projection_status,
-            "neo4j_verified": False,
-            "neo4j_document_nodes": None,
-            "neo4j_atom_nodes": None,
-            "neo4j_contains_edges": None,
-            "consistent": document.graph_projection_status == "complete" and expected == projected,
-        }
-
-        if not self._driver:
-            return base
+        return self.integrity_for_documents(
+            [
+                {
+                    "id": document.id,
+                    "atom_count": document.atom_count,
+                    "graph_projected_atom_count": document.graph_projected_atom_count,
+                    "graph_projection_status": document.graph_projection_status,
+                }
+            ]
+        )[0]
+
+    def integrity_for_documents(self, documents: list[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        """Integrity reports for a page of documents, verified against Neo4j in a single query.
+
+        ``documents`` only needs ``id``, ``atom_count``, ``graph_projected_atom_count`` and
+        ``graph_projection_status``, so callers can pass projected rows instead of full ORM objects.
+        """
+        reports = []
+        for document in documents:
+            expected = int(document["atom_count"] or 0)
+            projected = int(document["graph_projected_atom_count"] or 0)
+            status = document["graph_projection_status"]
+            reports.append(
+                {
+                    "document_id": document["id"],
+                    "document_nodes": 1,
+                    "atom_nodes": projected,
+                    "contains_edges": projected,
+                    "expected_atom_nodes": expected,
+                    "projection_status": status,
+                    "neo4j_verified": False,
+                    "neo4j_document_nodes": None,
+                    "neo4j_atom_nodes": None,
+                    "neo4j_contains_edges": None,
+                    "consistent": status == "complete" and expected == projected,
+                }
+            )
+
+        if not self._driver or not reports:
+            return reports
 
         with self._driver.session() as neo_session:
-            record = neo_session.run(
-                "MATCH (d:Document {id: $id}) "
+            records = neo_session.run(
+                "UNWIND $ids AS id "
+                "OPTIONAL MATCH (d:Document {id: id}) "
                 "OPTIONAL MATCH (d)-[r:CONTAINS]->(a:Atom) "
-                "RETURN count(DISTINCT d) AS document_nodes, count(DISTINCT a) AS atom_nodes, count(r) AS contains_edges",
-                id=document.id,
-            ).single()
-
-        neo_document_nodes = int(record["document_nodes"]) if record else 0
-        neo_atom_nodes = int(record["atom_nodes"]) if record else 0
-        neo_contains_edges = int(record["contains_edges"]) if record else 0
-
-        return {
-            **base,
-            "neo4j_verified": True,
-            "neo4j_document_nodes": neo_document_nodes,
-            "neo4j_atom_nodes": neo_atom_nodes,
-            "neo4j_contains_edges": neo_contains_edges,
-            "consistent": base["consistent"] and neo_document_nodes == 1 and neo_atom_nodes == expected and neo_contains_edges == expected,
-        }
+                "RETURN id, count(DISTINCT d) AS document_nodes, count(DISTINCT a) AS atom_nodes, count(r) AS contains_edges",
+                ids=[report["document_id"] for report in reports],
+            ).data()
+        counts = {record["id"]: record for record in records}
+
+        for report in reports:
+            record = counts.get(report["document_id"])
+            neo_document_nodes = int(record["document_nodes"]) if record else 0
+            neo_atom_nodes = int(record["atom_nodes"]) if record else 0
+            neo_contains_edges = int(record["contains_edges"]) if record else 0
+            expected = report["expected_atom_nodes"]
+            report.update(
+                {
+                    "neo4j_verified": True,
+                    "neo4j_document_nodes": neo_document_nodes,
+                    "neo4j_atom_nodes": neo_atom_nodes,
+                    "neo4j_contains_edges": neo_contains_edges,
+                    "consistent": report["consistent"]
+                    and neo_document_nodes == 1
+                    and neo_atom_nodes == expected
+                    and neo_contains_edges == expected,
+                }
+            )
+        return reports
 
     def query(
         self,
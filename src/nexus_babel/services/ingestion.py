@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -17,6 +18,7 @@
     new_batch_accumulator,
     process_ingest_path,
 )
+from nexus_babel.services.ingestion_types import IngestionBatchAccumulator
 from nexus_babel.services.text_utils import resolve_atomization_selection
 
 
@@ -32,25 +34,39 @@ def ingest_batch(
         modalities: list[str],
         parse_options: dict[str, Any],
     ) -> dict[str, Any]:
+        job, selected_paths, ingest_scope = self.start_batch(
+            session,
+            source_paths=source_paths,
+            modalities=modalities,
+            parse_options=parse_options,
+        )
+        accumulator = self.ingest_paths(session, job, selected_paths, ingest_scope=ingest_scope)
+        return self.finish_batch(session, job, accumulator, ingest_scope=ingest_scope)
+
+    def start_batch(
+        self,
+        session: Session,
+        *,
+        source_paths: list[str],
+        modalities: list[str],
+        parse_options: dict[str, Any],
+    ) -> tuple[IngestJob, list[Path], str]:
         ingest_scope = "partial" if source_paths else "full"
         selected_paths = (
             [self._resolve_path(p) for p in source_paths]
             if source_paths
             else collect_current_corpus_paths(self.settings.corpus_root)
         )
-        modality_filter = {m.lower() for m in modalities} if modalities else set()
         atom_tracks, atom_levels = resolve_atomization_selection(
             atom_tracks=parse_options.get("atom_tracks"),
             atom_levels=parse_options.get("atom_levels"),
         )
-        atomize_enabled = bool(parse_options.get("atomize", True))
-        force_reingest = bool(parse_options.get("force", False))
         normalized_parse_options = build_normalized_parse_options(
             parse_options=parse_options,
             atom_tracks=atom_tracks,
             atom_levels=atom_levels,
-            atomize_enabled=atomize_enabled,
-            force_reingest=force_reingest,
+            atomize_enabled=bool(parse_options.get("atomize", True)),
+            force_reingest=bool(parse_options.get("force", False)),
         )
 
         job = IngestJob(
@@ -63,31 +79,61 @@ def ingest_batch(
         )
         session.add(job)
         session.flush()
+        return job, selected_paths, ingest_scope
+
+    def ingest_paths(
+        self,
+        session: Session,
+        job: IngestJob,
+        paths: list[Path],
+        *,
+        ingest_scope: str,
+        progress: Callable[..., Any] | None = None,
+    ) -> IngestionBatchAccumulator:
+        request_payload = job.request_payload or {}
+        modalities = request_payload.get("modalities") or []
+        parse_options = request_payload.get("parse_options") or {}
+        modality_filter = {m.lower() for m in modalities}
 
         accumulator = new_batch_accumulator()
-        for path in selected_paths:
+        for index, path in enumerate(paths, start=1):
             process_ingest_path(
                 session=session,
                 path=path,
                 modality_filter=modality_filter,
-                force_reingest=force_reingest,
-                atomize_enabled=atomize_enabled,
-                atom_tracks=atom_tracks,
-                atom_levels=atom_levels,
+                force_reingest=bool(parse_options.get("force", False)),
+                atomize_enabled=bool(parse_options.get("atomize", True)),
+                atom_tracks=list(parse_options.get("atom_tracks", [])),
+                atom_levels=list(parse_options.get("atom_levels", [])),
                 ingest_scope=ingest_scope,
                 object_storage_root=self.settings.object_storage_root,
                 hypergraph=self.hypergraph,
                 accumulator=accumulator,
             )
+            if progress is not None:
+                progress(index, len(paths), unit="files", partial={"documents_ingested": accumulator.documents_ingested})
+        return accumulator
 
+    def finish_batch(
+        self,
+        session: Session,
+        job: IngestJob,
+        accumulator: IngestionBatchAccumulator,
+        *,
+        ingest_scope: str,
+    ) -> dict[str, Any]:
         apply_canonicalization(session)
         self._apply_cross_modal_links(session, accumulator.updated_doc_ids)
         return finalize_job(job, accumulator=accumulator, ingest_scope=ingest_scope)
 
-    def get_job_status(self, session: Session, job_id: str) -> dict[str, Any]:
+    def get_ingest_job(self, session: Session, job_id: str) -> IngestJob:
         job = session.scalar(select(IngestJob).where(IngestJob.id == job_id))
         if not job:
             raise ValueError(f"Ingest job {job_id} not found")
+        return job
+
+    def get_job_status(self, session: Session, job_id: str) -> dict[str, Any]:
+        job = self.get_ingest_job(session, job_id)
 
         summary = job.result_summary or {}
         return {
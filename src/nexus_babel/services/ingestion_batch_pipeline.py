@@ -33,6 +33,30 @@ def new_batch_accumulator() -> IngestionBatchAccumulator:
     return IngestionBatchAccumulator()
 
 
+def accumulator_to_payload(accumulator: IngestionBatchAccumulator) -> dict[str, Any]:
+    return {
+        "files": accumulator.files,
+        "documents_ingested": accumulator.documents_ingested,
+        "atoms_created": accumulator.atoms_created,
+        "documents_unchanged": accumulator.documents_unchanged,
+        "checksums": accumulator.checksums,
+        "errors": accumulator.errors,
+        "warnings": accumulator.warnings,
+        "updated_doc_ids": sorted(accumulator.updated_doc_ids),
+    }
+
+
+def merge_accumulator_payload(accumulator: IngestionBatchAccumulator, payload: dict[str, Any]) -> None:
+    accumulator.files.extend(payload.get("files", []))
+    accumulator.documents_ingested += int(payload.get("documents_ingested", 0))
+    accumulator.atoms_created += int(payload.get("atoms_created", 0))
+    accumulator.documents_unchanged += int(payload.get("documents_unchanged", 0))
+    accumulator.checksums.extend(payload.get("checksums", []))
+    accumulator.errors.extend(payload.get("errors", []))
+    accumulator.warnings.extend(payload.get("warnings", []))
+    accumulator.updated_doc_ids.update(payload.get("updated_doc_ids", []))
+
+
 def build_normalized_parse_options(
     *,
     parse_options: dict[str, Any],
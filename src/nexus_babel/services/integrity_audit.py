@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from nexus_babel.models import Document
+from nexus_babel.services.hypergraph import HypergraphProjector
+
+AUDIT_PAGE_SIZE = 500
+
+
+def audit_page(session: Session, *, after_document_id: str | None, page_size: int) -> list[dict[str, Any]]:
+    query = select(
+        Document.id,
+        Document.atom_count,
+        Document.graph_projected_atom_count,
+        Document.graph_projection_status,
+    ).where(Document.ingested.is_(True))
+    if after_document_id is not None:
+        query = query.where(Document.id > after_document_id)
+    rows = session.execute(query.order_by(Document.id).limit(page_size)).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def run_integrity_audit(
+    session: Session,
+    hypergraph: HypergraphProjector,
+    *,
+    state: dict[str, Any] | None = None,
+    page_size: int = AUDIT_PAGE_SIZE,
+    checkpoint: Callable[[dict[str, Any]], Any] | None = None,
+    progress: Callable[..., Any] | None = None,
+) -> dict[str, Any]:
+    """Keyset-paged integrity audit over ingested documents.
+
+    ``state`` is a previous checkpoint (the audit job's partial result); the audit resumes after its
+    ``after_document_id`` and keeps the findings already reported. ``checkpoint`` receives the
+    running state after every page, and ``progress`` the documents checked so far.
+    """
+    state = state or {}
+    resume = state.get("checkpoint") or {}
+    after_document_id = resume.get("after_document_id")
+    document_count = int(state.get("document_count", 0)) if after_document_id else 0
+    findings: list[dict[str, Any]] = list(state.get("inconsistencies", [])) if after_document_id else []
+    total = int(session.scalar(select(func.count()).select_from(Document).where(Document.ingested.is_(True))) or 0)
+    page_size = max(int(page_size), 1)
+
+    while True:
+        rows = audit_page(session, after_document_id=after_document_id, page_size=page_size)
+        if not rows:
+            break
+        for integrity in hypergraph.integrity_for_documents(rows):
+            if not integrity.get("consistent"):
+                findings.append({"document_id": integrity["document_id"], "integrity": integrity})
+        document_count += len(rows)
+        after_document_id = rows[-1]["id"]
+        if checkpoint is not None:
+            checkpoint(
+                {
+                    "complete": False,
+                    "document_count": document_count,
+                    "total_documents": total,
+                    "inconsistencies": findings,
+                    "checkpoint": {"after_document_id": after_document_id},
+                }
+            )
+        if progress is not None:
+            progress(document_count, total, unit="documents", partial={"inconsistencies": len(findings)})
+
+    return {
+        "complete": True,
+        "document_count": document_count,
+        "total_documents": total,
+        "inconsistencies": findings,
+        "resumed_from": resume.get("after_document_id"),
+    }
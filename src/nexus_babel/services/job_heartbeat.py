@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Self
+
+from nexus_babel.db import DBManager
+
+logger = logging.getLogger(__name__)
+
+
+class JobHeartbeat:
+    """Background lease renewal for one running job (plus the worker's prefetched jobs).
+
+    Each beat commits in its own session so the renewal is visible to other workers while the job's
+    own transaction is still open.
+    """
+
+    def __init__(
+        self,
+        *,
+        db: DBManager,
+        job_service: Any,
+        job_id: str,
+        worker_name: str,
+        interval_seconds: float,
+        prefetched_job_ids: list[str] | None = None,
+    ):
+        self.db = db
+        self.job_service = job_service
+        self.job_id = job_id
+        self.worker_name = worker_name
+        self.interval_seconds = max(float(interval_seconds), 0.05)
+        self.prefetched_job_ids = list(prefetched_job_ids or [])
+        self.beats = 0
+        self.lease_lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+        self._thread.join()
+
+    def stop(self) -> None:
+        # Called before the job's final commit; a beat still in flight will then find the job
+        # finished, which is expected rather than a lost lease.
+        self._stop.set()
+
+    def beat(self) -> bool:
+        session = self.db.session()
+        try:
+            held = self.job_service.heartbeat(session, self.job_id, self.worker_name)
+            self.job_service.renew_leases(session, self.worker_name, self.prefetched_job_ids)
+            session.commit()
+        except Exception as exc:
+            # SQLite serializes writers, so a beat can lose to the job's own write transaction.
+            session.rollback()
+            logger.debug("Heartbeat for job %s skipped: %s", self.job_id, exc, exc_info=True)
+            return not self.lease_lost
+        finally:
+            session.close()
+        self.beats += 1
+        if not held and not self.lease_lost and not self._stop.is_set():
+            self.lease_lost = True
+            logger.warning("Worker %s lost the lease on job %s while it was running", self.worker_name, self.job_id)
+        return held
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.beat()
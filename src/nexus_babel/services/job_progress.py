@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from nexus_babel.models import JobProgress, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class JobReporter:
+    """Publishes checkpoints and progress for one leased job while it is still running.
+
+    Every write commits in its own short session, because the job's own transaction stays open until
+    the job finishes. On SQLite, once that transaction has written it holds the only write lock, so
+    writes go into it under a savepoint instead and become visible with the job's next commit.
+    Writes are best-effort: a failed write is logged and skipped, never raised into the job.
+    """
+
+    def __init__(
+        self,
+        *,
+        owner_session: Session,
+        job_service: Any,
+        job_id: str,
+        worker_name: str,
+        min_interval_seconds: float = 1.0,
+    ):
+        self.owner_session = owner_session
+        self.job_service = job_service
+        self.job_id = job_id
+        self.worker_name = worker_name
+        self.min_interval_seconds = max(float(min_interval_seconds), 0.0)
+        self._started = time.monotonic()
+        self._base_done: int | None = None
+        self._last_write = float("-inf")
+
+    def checkpoint(self, state: dict[str, Any]) -> bool:
+        return self._write(lambda session: self.job_service.checkpoint(session, self.job_id, self.worker_name, state))
+
+    def progress(
+        self,
+        done: int,
+        total: int | None = None,
+        *,
+        unit: str = "items",
+        message: str | None = None,
+        partial: dict[str, Any] | None = None,
+    ) -> bool:
+        now = time.monotonic()
+        finished = total is not None and done >= total
+        if not finished and now - self._last_write < self.min_interval_seconds:
+            return False
+        self._last_write = now
+        return self._write(
+            lambda session: self._record(session, done=done, total=total, unit=unit, message=message, partial=partial, now=now)
+        )
+
+    def _record(
+        self,
+        session: Session,
+        *,
+        done: int,
+        total: int | None,
+        unit: str,
+        message: str | None,
+        partial: dict[str, Any] | None,
+        now: float,
+    ) -> bool:
+        record = session.get(JobProgress, self.job_id)
+        if record is None:
+            record = JobProgress(job_id=self.job_id)
+            session.add(record)
+        if self._base_done is None:
+            # A resumed attempt starts from the previous attempt's count; rate only covers this one.
+            self._base_done = int(record.done or 0)
+        elapsed = now - self._started
+        throughput = (done - self._base_done) / elapsed if elapsed > 0 and done > self._base_done else None
+        record.done = int(done)
+        record.total = total
+        record.unit = unit
+        record.message = message
+        record.partial = partial or {}
+        record.throughput = throughput
+        record.eta_seconds = (total - done) / throughput if throughput and total is not None else None
+        record.updated_at = utcnow()
+        return True
+
+    def _owner_holds_sqlite_write_lock(self) -> bool:
+        # SQLite has a single writer: once the job's own transaction has written, a side write could
+        # only wait out the busy timeout.
+        owner = self.owner_session
+        if owner.get_bind().dialect.name != "sqlite" or not owner.in_transaction():
+            return False
+        return bool(getattr(owner.connection().connection.dbapi_connection, "in_transaction", False))
+
+    def _write(self, fn: Callable[[Session], bool]) -> bool:
+        if self._owner_holds_sqlite_write_lock():
+            # The savepoint keeps a failed write from disturbing the job's own work.
+            try:
+                with self.owner_session.begin_nested():
+                    return fn(self.owner_session)
+            except Exception as exc:
+                logger.debug("Progress write for job %s skipped: %s", self.job_id, exc, exc_info=True)
+                return False
+        session = Session(bind=self.owner_session.get_bind())
+        try:
+            held = fn(session)
+            session.commit()
+            return held
+        except Exception as exc:
+            session.rollback()
+            logger.debug("Progress write for job %s skipped: %s", self.job_id, exc, exc_info=True)
+            return False
+        finally:
+            session.close()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Protocol
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+JOB_NOTIFY_CHANNEL = "nexus_jobs"
+_PENDING_FLAG = "nexus_job_wakeup_pending"
+
+logger = logging.getLogger(__name__)
+
+
+class WakeupListener(Protocol):
+    wakes_on_submit: bool
+
+    def wait(self, timeout: float) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+class _SleepListener:
+    wakes_on_submit = False
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(max(timeout, 0.0))
+        return False
+
+    def close(self) -> None:
+        return None
+
+
+class _ListenNotifyListener:
+    wakes_on_submit = True
+
+    def __init__(self, engine: Engine, channel: str):
+        self._raw = engine.raw_connection()
+        conn = self._raw.driver_connection
+        conn.autocommit = True
+        conn.execute(f"LISTEN {channel}")
+        self._conn = conn
+
+    def wait(self, timeout: float) -> bool:
+        for _ in self._conn.notifies(timeout=max(timeout, 0.0), stop_after=1):
+            return True
+        return False
+
+    def close(self) -> None:
+        self._raw.invalidate()
+
+
+class _SocketListener:
+    wakes_on_submit = True
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        path.unlink(missing_ok=True)
+        self._sock.bind(str(path))
+
+    def wait(self, timeout: float) -> bool:
+        self._sock.settimeout(max(timeout, 0.001))
+        try:
+            self._sock.recv(64)
+        except (TimeoutError, BlockingIOError):
+            return False
+        # Collapse a burst of submissions into a single wakeup.
+        self._sock.setblocking(False)
+        try:
+            while self._sock.recv(64):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        return True
+
+    def close(self) -> None:
+        self._sock.close()
+        self.path.unlink(missing_ok=True)
+
+
+class JobWakeup:
+    """Wakes idle workers when jobs are submitted.
+
+    Postgres uses LISTEN/NOTIFY, delivered by the database when the submitting transaction commits.
+    Other backends signal worker-owned Unix datagram sockets from an ``after_commit`` hook; where
+    neither is available workers fall back to plain adaptive-backoff polling.
+    """
+
+    def __init__(self, *, database_url: str, signal_dir: Path | None = None, enabled: bool = True):
+        self.enabled = enabled
+        self.uses_listen_notify = database_url.startswith("postgresql")
+        url_key = hashlib.sha256(database_url.encode("utf-8")).hexdigest()[:12]
+        self.signal_dir = signal_dir or Path(tempfile.gettempdir()) / "nexus_babel_jobs" / url_key
+        self._listener_seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def uses_sockets(self) -> bool:
+        return self.enabled and not self.uses_listen_notify and hasattr(socket, "AF_UNIX")
+
+    def attach(self, session_factory: Any) -> None:
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    def mark_submitted(self, session: Session, job_type: str) -> None:
+        if not self.enabled:
+            return
+        if self.uses_listen_notify:
+            session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": JOB_NOTIFY_CHANNEL, "payload": job_type})
+            return
+        session.info[_PENDING_FLAG] = True
+
+    def signal(self) -> int:
+        if not self.uses_sockets or not self.signal_dir.is_dir():
+            return 0
+        delivered = 0
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sender.setblocking(False)
+        try:
+            for path in self.signal_dir.glob("*.sock"):
+                try:
+                    sender.sendto(b"1", str(path))
+                    delivered += 1
+                except BlockingIOError:
+                    # Receiver buffer is full, so it already has a wakeup pending.
+                    delivered += 1
+                except (ConnectionRefusedError, FileNotFoundError):
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    continue
+        finally:
+            sender.close()
+        return delivered
+
+    def listener(self, engine: Engine) -> WakeupListener:
+        if not self.enabled:
+            return _SleepListener()
+        try:
+            if self.uses_listen_notify:
+                return _ListenNotifyListener(engine, JOB_NOTIFY_CHANNEL)
+            if self.uses_sockets:
+                with self._lock:
+                    self._listener_seq += 1
+                    seq = self._listener_seq
+                self.signal_dir.mkdir(parents=True, exist_ok=True)
+                return _SocketListener(self.signal_dir / f"{os.getpid()}-{seq}.sock")
+        except Exception:  # pragma: no cover - falls back to polling
+            logger.warning("Job wakeup listener unavailable; falling back to polling", exc_info=True)
+        return _SleepListener()
+
+    def _after_commit(self, session: Session) -> None:
+        if session.info.pop(_PENDING_FLAG, False):
+            self.signal()
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_PENDING_FLAG, None)
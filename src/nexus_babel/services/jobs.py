@@ -1,26 +1,61 @@
 from __future__ import annotations
 
 import time
-from datetime import timedelta
+from datetime import UTC, timedelta
+from pathlib import Path
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, aliased
 
 from nexus_babel.config import Settings
-from nexus_babel.models import AnalysisRun, Document, Job, JobArtifact, JobAttempt
-from nexus_babel.models import utcnow
+from nexus_babel.models import AnalysisRun, Job, JobArtifact, JobAttempt, JobProgress, utcnow
+from nexus_babel.services.ingestion_batch_pipeline import (
+    accumulator_to_payload,
+    merge_accumulator_payload,
+    new_batch_accumulator,
+)
+from nexus_babel.services.integrity_audit import run_integrity_audit
+from nexus_babel.services.job_progress import JobReporter
+from nexus_babel.services.job_queues import WeightedQueueScheduler
+from nexus_babel.services.job_wakeup import JobWakeup
 
 RETRY_BACKOFF_SECONDS = [2, 10, 30]
+TERMINAL_JOB_STATUSES = ("succeeded", "failed", "cancelled")
+# A job whose work was fanned out to child jobs; it finishes when its reducer does.
+WAITING_JOB_STATUS = "waiting"
+
+
+def _no_pending_children():
+    # A job that has children (e.g. a fan-out reducer) only becomes eligible once every child is done.
+    child = aliased(Job)
+    return ~select(child.id).where(
+        child.parent_job_id == Job.id,
+        child.status.not_in(TERMINAL_JOB_STATUSES),
+    ).exists()
 
 
 class JobService:
-    def __init__(self, settings: Settings, ingestion_service, analysis_service, evolution_service, hypergraph):
+    def __init__(
+        self,
+        settings: Settings,
+        ingestion_service,
+        analysis_service,
+        evolution_service,
+        hypergraph,
+        wakeup: JobWakeup | None = None,
+        retention_service=None,
+        remix_service=None,
+    ):
         self.settings = settings
+        self.wakeup = wakeup
+        self.retention_service = retention_service
+        self.remix_service = remix_service
         self.ingestion_service = ingestion_service
         self.analysis_service = analysis_service
         self.evolution_service = evolution_service
         self.hypergraph = hypergraph
+        self.queue_scheduler = WeightedQueueScheduler(settings.job_queue_weights)
 
     def submit(
         self,
@@ -32,6 +67,9 @@ def submit(
         idempotency_key: str | None = None,
         created_by: str | None = None,
         max_attempts: int = 3,
+        parent_job_id: str | None = None,
+        queue: str | None = None,
+        priority: int = 0,
     ) -> Job:
         if idempotency_key:
             existing = session.scalar(
@@ -43,8 +81,14 @@ def submit(
             if existing:
                 return existing
 
+        queue = queue or self.settings.job_queue_routes.get(job_type, self.settings.job_default_queue)
+        if queue not in self.known_queues():
+            raise ValueError(f"Unknown job queue: {queue}")
+
         job = Job(
             job_type=job_type,
+            queue=queue,
+            priority=int(priority),
             payload=payload,
             execution_mode=execution_mode,
             idempotency_key=idempotency_key,
@@ -52,20 +96,37 @@ def submit(
             created_by=created_by,
             status="queued",
             next_run_at=utcnow(),
+            parent_job_id=parent_job_id,
         )
         session.add(job)
         session.flush()
+        if self.wakeup is not None and execution_mode == "async":
+            self.wakeup.mark_submitted(session, job_type)
         return job
 
+    def known_queues(self) -> list[str]:
+        queues = {self.settings.job_default_queue, *self.settings.job_queue_weights, *self.settings.job_queue_routes.values()}
+        return sorted(queues)
+
     def cancel(self, session: Session, job_id: str) -> Job:
         job = session.scalar(select(Job).where(Job.id == job_id))
         if not job:
             raise ValueError(f"Job {job_id} not found")
-        if job.status in {"succeeded", "failed", "cancelled"}:
+        if job.status in TERMINAL_JOB_STATUSES:
             return job
         job.status = "cancelled"
         job.lease_owner = None
         job.lease_expires_at = None
+        # Children that have not started yet are cancelled with their parent; running ones finish.
+        pending = [job.id]
+        while pending:
+            children = session.scalars(
+                select(Job).where(Job.parent_job_id.in_(pending), Job.status.in_(["queued", "retry_wait"]))
+            ).all()
+            for child in children:
+                child.status = "cancelled"
+            pending = [child.id for child in children]
+        self._settle_fan_out_parent(session, job)
         return job
 
     def get_job(self, session: Session, job_id: str) -> dict[str, Any]:
@@ -74,10 +135,15 @@ def get_job(self, session: Session, job_id: str) -> dict[str, Any]:
             raise ValueError(f"Job {job_id} not found")
         attempts = session.scalars(select(JobAttempt).where(JobAttempt.job_id == job.id).order_by(JobAttempt.started_at)).all()
         artifacts = session.scalars(select(JobArtifact).where(JobArtifact.job_id == job.id).order_by(JobArtifact.created_at)).all()
+        child_counts = session.execute(
+            select(Job.status, func.count()).where(Job.parent_job_id == job.id).group_by(Job.status)
+        ).all()
         return {
             "job_id": job.id,
             "job_type": job.job_type,
             "status": job.status,
+            "queue": job.queue,
+            "priority": job.priority,
             "payload": job.payload,
             "result": job.result,
             "error_text": job.error_text,
@@ -88,6 +154,10 @@ def get_job(self, session: Session, job_id: str) -> dict[str, Any]:
             "next_run_at": job.next_run_at,
             "lease_owner": job.lease_owner,
             "lease_expires_at": job.lease_expires_at,
+            "heartbeat_at": job.heartbeat_at,
+            "parent_job_id": job.parent_job_id,
+            "child_status_counts": {status: int(count) for status, count in child_counts},
+            "progress": self.get_progress(session, job.id, dict(child_counts)),
             "created_by": job.created_by,
             "created_at": job.created_at,
             "updated_at": job.updated_at,
@@ -113,25 +183,230 @@ def get_job(self, session: Session, job_id: str) -> dict[str, Any]:
             ],
         }
 
+    def get_job_status(self, session: Session, job_id: str) -> dict[str, Any] | None:
+        """A job's status columns and progress record, cheap enough to poll; None once it is gone."""
+        row = session.execute(
+            select(Job.id, Job.job_type, Job.status, Job.result, Job.error_text).where(Job.id == job_id)
+        ).first()
+        if row is None:
+            return None
+        return {
+            "job_id": row.id,
+            "job_type": row.job_type,
+            "status": row.status,
+            "result": row.result,
+            "error_text": row.error_text,
+            "progress": self.get_progress(session, row.id),
+        }
+
+    def get_progress(
+        self,
+        session: Session,
+        job_id: str,
+        child_counts: dict[str, int] | None = None,
+    ) -> dict[str, Any] | None:
+        record = session.get(JobProgress, job_id)
+        if record is not None:
+            return {
+                "done": record.done,
+                "total": record.total,
+                "unit": record.unit,
+                "percent": round(100.0 * record.done / record.total, 2) if record.total else None,
+                "throughput": record.throughput,
+                "eta_seconds": record.eta_seconds,
+                "message": record.message,
+                "partial": record.partial or {},
+                "updated_at": record.updated_at,
+            }
+        if child_counts:
+            # Jobs that only coordinate children (e.g. a fan-out reducer) report their children.
+            total = sum(child_counts.values())
+            done = sum(count for status, count in child_counts.items() if status in TERMINAL_JOB_STATUSES)
+            return {
+                "done": done,
+                "total": total,
+                "unit": "child_jobs",
+                "percent": round(100.0 * done / total, 2),
+                "throughput": None,
+                "eta_seconds": None,
+                "message": None,
+                "partial": {"child_status_counts": child_counts},
+                "updated_at": None,
+            }
+        return None
+
     def lease_next(self, session: Session, worker_name: str) -> Job | None:
+        jobs = self.lease_batch(session, worker_name, limit=1)
+        return jobs[0] if jobs else None
+
+    def lease_batch(
+        self,
+        session: Session,
+        worker_name: str,
+        *,
+        limit: int,
+        queues: list[str] | None = None,
+    ) -> list[Job]:
         now = utcnow()
-        job = session.scalar(
-            select(Job)
-            .where(
-                Job.status.in_(["queued", "retry_wait"]),
-                Job.next_run_at <= now,
-                (Job.lease_expires_at.is_(None)) | (Job.lease_expires_at < now),
-            )
-            .order_by(Job.created_at)
-            .limit(1)
+        limit = max(int(limit), 1)
+        subscribed = list(queues) if queues else self.known_queues()
+        claimed_ids: list[str] = []
+        # Split the batch across queues by weight, then hand slots an empty queue could not use to
+        # whichever subscribed queue still has ready work.
+        for queue, slots in self.queue_scheduler.allocate(subscribed, limit):
+            claimed_ids += self._claim(session, worker_name, now, slots, [queue])
+        if len(claimed_ids) < limit and (not queues or len(subscribed) > 1):
+            claimed_ids += self._claim(session, worker_name, now, limit - len(claimed_ids), queues or None)
+        if not claimed_ids:
+            return []
+        return list(
+            session.scalars(
+                select(Job)
+                .where(Job.id.in_(claimed_ids))
+                .order_by(Job.priority.desc(), Job.created_at)
+                .execution_options(populate_existing=True)
+            ).all()
+        )
+
+    def _claim(
+        self,
+        session: Session,
+        worker_name: str,
+        now,
+        limit: int,
+        queues: list[str] | None,
+    ) -> list[str]:
+        eligible = (
+            Job.status.in_(["queued", "retry_wait"]),
+            Job.next_run_at <= now,
+            (Job.lease_expires_at.is_(None)) | (Job.lease_expires_at < now),
+            _no_pending_children(),
+        )
+        if queues is not None:
+            eligible += (Job.queue.in_(queues),)
+        # Claim the most urgent eligible jobs in a single conditional UPDATE. Postgres skips rows
+        # already locked by another worker's claim; SQLite has no row locks and instead relies on the
+        # statement holding the database write lock, so the read-then-claim cannot interleave.
+        candidates = (
+            select(Job.id)
+            .where(*eligible)
+            .order_by(Job.priority.desc(), Job.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(
+            session.execute(
+                update(Job)
+                .where(Job.id.in_(candidates), *eligible)
+                .values(
+                    status="running",
+                    lease_owner=worker_name,
+                    lease_expires_at=now + timedelta(seconds=self.settings.worker_lease_seconds),
+                    heartbeat_at=None,
+                )
+                .returning(Job.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
         )
+
+    def renew_leases(self, session: Session, worker_name: str, job_ids: list[str]) -> int:
+        if not job_ids:
+            return 0
+        result = session.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids), Job.status == "running", Job.lease_owner == worker_name)
+            .values(lease_expires_at=utcnow() + timedelta(seconds=self.settings.worker_lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        return int(result.rowcount or 0)
+
+    def release_leases(self, session: Session, worker_name: str, job_ids: list[str]) -> int:
+        if not job_ids:
+            return 0
+        result = session.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids), Job.status == "running", Job.lease_owner == worker_name)
+            .values(status="queued", lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        return int(result.rowcount or 0)
+
+    def begin_leased(self, session: Session, job_id: str, worker_name: str) -> str | None:
+        job = self._leased_job(session, job_id, worker_name)
         if not job:
             return None
-        job.status = "running"
-        job.lease_owner = worker_name
+        attempt = self._begin_attempt(session, job)
+        now = utcnow()
+        job.heartbeat_at = now
         job.lease_expires_at = now + timedelta(seconds=self.settings.worker_lease_seconds)
+        session.flush()
+        return attempt.id
+
+    def execute_leased(
+        self,
+        session: Session,
+        job_id: str,
+        worker_name: str,
+        *,
+        attempt_id: str | None = None,
+    ) -> Job | None:
+        job = self._leased_job(session, job_id, worker_name)
+        if not job:
+            return None
+        attempt = session.get(JobAttempt, attempt_id) if attempt_id else None
+        # The attempt start is already committed, so checkpoints and progress can be committed
+        # beside the job's own (read-mostly) transaction and survive a worker crash.
+        reporter = JobReporter(
+            owner_session=session,
+            job_service=self,
+            job_id=job_id,
+            worker_name=worker_name,
+            min_interval_seconds=self.settings.job_progress_interval_seconds,
+        )
+        return self.execute(session, job, attempt=attempt, reporter=reporter)
+
+    def checkpoint(self, session: Session, job_id: str, worker_name: str, state: dict[str, Any]) -> bool:
+        result = session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", Job.lease_owner == worker_name)
+            .values(result=state)
+            .execution_options(synchronize_session=False)
+        )
+        return bool(result.rowcount)
+
+    def heartbeat(self, session: Session, job_id: str, worker_name: str) -> bool:
+        now = utcnow()
+        result = session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", Job.lease_owner == worker_name)
+            .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=self.settings.worker_lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        return bool(result.rowcount)
+
+    def _leased_job(self, session: Session, job_id: str, worker_name: str) -> Job | None:
+        job = session.scalar(
+            select(Job).where(Job.id == job_id).execution_options(populate_existing=True)
+        )
+        # A prefetched job may have been cancelled or reclaimed by stale-lease recovery meanwhile.
+        if not job or job.status != "running" or job.lease_owner != worker_name:
+            return None
         return job
 
+    def seconds_until_next_due(self, session: Session, queues: list[str] | None = None) -> float | None:
+        query = select(func.min(Job.next_run_at)).where(
+            Job.status.in_(["queued", "retry_wait"]),
+            _no_pending_children(),
+        )
+        if queues:
+            query = query.where(Job.queue.in_(queues))
+        next_run_at = session.scalar(query)
+        if next_run_at is None:
+            return None
+        if next_run_at.tzinfo is None:
+            next_run_at = next_run_at.replace(tzinfo=UTC)
+        return max((next_run_at - utcnow()).total_seconds(), 0.0)
+
     def process_next(self, session: Session, worker_name: str) -> Job | None:
         job = self.lease_next(session, worker_name)
         if not job:
@@ -139,27 +414,33 @@ def process_next(self, session: Session, worker_name: str) -> Job | None:
         self.execute(session, job)
         return job
 
-    def execute(self, session: Session, job: Job) -> Job:
+    def execute(
+        self,
+        session: Session,
+        job: Job,
+        *,
+        attempt: JobAttempt | None = None,
+        reporter: JobReporter | None = None,
+    ) -> Job:
         if job.status in {"cancelled", "succeeded"}:
             return job
 
-        attempt_no = int(job.attempt_count) + 1
         started = time.perf_counter()
-        attempt = JobAttempt(job_id=job.id, attempt_number=attempt_no, status="running")
-        session.add(attempt)
-        job.attempt_count = attempt_no
-        job.status = "running"
-        job.error_text = None
-        session.flush()
+        if attempt is None:
+            attempt = self._begin_attempt(session, job)
 
         try:
-            result = self._dispatch(session, job)
+            result = self._dispatch(session, job, reporter)
             job.result = result
-            job.status = "succeeded"
             job.lease_owner = None
             job.lease_expires_at = None
             attempt.status = "succeeded"
-            self._create_artifacts(session, job, result)
+            if job.job_type == "ingest_batch" and result.get("fan_out"):
+                # The reducer copies its result and artifact onto this job once the chunks are done.
+                job.status = WAITING_JOB_STATUS
+            else:
+                job.status = "succeeded"
+                self._create_artifacts(session, job, result)
         except Exception as exc:  # pragma: no cover - defensive
             job.error_text = str(exc)
             attempt.status = "failed"
@@ -177,24 +458,58 @@ def execute(self, session: Session, job: Job) -> Job:
             attempt.runtime_ms = runtime_ms
             attempt.finished_at = utcnow()
 
+        if job.parent_job_id and job.status in TERMINAL_JOB_STATUSES and self.wakeup is not None:
+            # The parent may have just become eligible; wake idle workers rather than waiting out a poll.
+            self.wakeup.mark_submitted(session, job.job_type)
+        self._settle_fan_out_parent(session, job)
         return job
 
-    def _dispatch(self, session: Session, job: Job) -> dict[str, Any]:
+    def _settle_fan_out_parent(self, session: Session, job: Job) -> None:
+        """Finish the ingest_batch job that fanned out once its reducer reaches a terminal status."""
+        if job.job_type != "ingest_reduce" or not job.parent_job_id or job.status not in TERMINAL_JOB_STATUSES:
+            return
+        parent = session.get(Job, job.parent_job_id)
+        if parent is None or parent.status != WAITING_JOB_STATUS:
+            return
+        parent.status = job.status
+        parent.error_text = job.error_text
+        if job.status == "succeeded":
+            parent.result = {**(parent.result or {}), **(job.result or {})}
+            self._create_artifacts(session, parent, parent.result)
+
+    def _begin_attempt(self, session: Session, job: Job) -> JobAttempt:
+        attempt_no = int(job.attempt_count) + 1
+        attempt = JobAttempt(job_id=job.id, attempt_number=attempt_no, status="running")
+        session.add(attempt)
+        job.attempt_count = attempt_no
+        job.status = "running"
+        job.error_text = None
+        session.flush()
+        return attempt
+
+    def _dispatch(
+        self,
+        session: Session,
+        job: Job,
+        reporter: JobReporter | None = None,
+    ) -> dict[str, Any]:
         payload = job.payload or {}
         if job.job_type == "ingest_batch":
-            result = self.ingestion_service.ingest_batch(
-                session=session,
-                source_paths=list(payload.get("source_paths", [])),
-                modalities=list(payload.get("modalities", [])),
-                parse_options=dict(payload.get("parse_options", {})),
+            return self._dispatch_ingest_batch(session, job, payload, reporter)
+
+        if job.job_type == "ingest_chunk":
+            ingest_job = self.ingestion_service.get_ingest_job(session, str(payload.get("ingest_job_id")))
+            accumulator = self.ingestion_service.ingest_paths(
+                session,
+                ingest_job,
+                [Path(p) for p in payload.get("source_paths", [])],
+                ingest_scope=str(payload.get("ingest_scope", "partial")),
+                progress=reporter.progress if reporter else None,
             )
-            return {
-                "ingest_job_id": result["job"].id,
-                "documents_ingested": result["documents_ingested"],
-                "atoms_created": result["atoms_created"],
-                "provenance_digest": result["provenance_digest"],
-                "warnings": result.get("warnings", []),
-            }
+            return {"chunk_index": payload.get("chunk_index", 0), **accumulator_to_payload(accumulator)}
+
+        if job.job_type == "ingest_reduce":
+            return self._dispatch_ingest_reduce(session, job, payload)
 
         if job.job_type == "analyze":
             run, result = self.analysis_service.analyze(
@@ -220,17 +535,160 @@ def _dispatch(self, session: Session, job: Job) -> dict[str, Any]:
             replay = self.evolution_service.replay_branch(session=session, branch_id=str(payload.get("branch_id")))
             return replay
 
+        if job.job_type == "branch_replay_batch":
+            branch_ids = payload.get("branch_ids")
+            return self.evolution_service.replay_branches(
+                session=session,
+                branch_ids=[str(branch_id) for branch_id in branch_ids] if branch_ids else None,
+                root_document_id=payload.get("root_document_id"),
+                workers=payload.get("workers"),
+                progress=reporter.progress if reporter else None,
+            )
+
+        if job.job_type == "branch_compaction":
+            # Commits after every batch, like retention sweeps.
+            return self.evolution_service.compact_branches(
+                session,
+                min_age_days=payload.get("min_age_days"),
+                min_chain_length=payload.get("min_chain_length"),
+                batch_size=payload.get("batch_size"),
+                root_document_id=payload.get("root_document_id"),
+                dry_run=bool(payload.get("dry_run", False)),
+                progress=reporter.progress if reporter else None,
+            )
+
+        if job.job_type == "remix_sweep" and self.remix_service is not None:
+            return self.remix_service.sweep(
+                session=session,
+                source_document_id=payload.get("source_document_id"),
+                source_branch_id=payload.get("source_branch_id"),
+                target_document_id=payload.get("target_document_id"),
+                target_branch_id=payload.get("target_branch_id"),
+                strategies=list(payload.get("strategies", [])),
+                seeds=[int(seed) for seed in payload.get("seeds", [])],
+                mode=str(payload.get("mode", "PUBLIC")),
+                atom_levels=list(payload.get("atom_levels", [])),
+                persist_artifacts=bool(payload.get("persist_artifacts", True)),
+                include_results=bool(payload.get("include_results", False)),
+                workers=payload.get("workers"),
+                progress=reporter.progress if reporter else None,
+            )
+
         if job.job_type == "integrity_audit":
-            docs = session.scalars(select(Document).where(Document.ingested.is_(True))).all()
-            findings = []
-            for doc in docs:
-                integrity = self.hypergraph.integrity_for_document(doc)
-                if not integrity.get("consistent"):
-                    findings.append({"document_id": doc.id, "integrity": integrity})
-            return {"document_count": len(docs), "inconsistencies": findings}
+            # A retried attempt resumes from the checkpoint its predecessor committed into the result.
+            return run_integrity_audit(
+                session,
+                self.hypergraph,
+                state=job.result,
+                page_size=int(payload.get("page_size", self.settings.integrity_audit_page_size)),
+                checkpoint=reporter.checkpoint if reporter else None,
+                progress=reporter.progress if reporter else None,
+            )
+
+        if job.job_type == "retention_sweep" and self.retention_service is not None:
+            # Commits after every archived batch so the sweep never holds long table locks.
+            return self.retention_service.sweep(
+                session,
+                ttl_days=payload.get("ttl_days"),
+                batch_size=payload.get("batch_size"),
+                dry_run=bool(payload.get("dry_run", False)),
+                progress=reporter.progress if reporter else None,
+            )
 
         raise ValueError(f"Unsupported job_type: {job.job_type}")
 
+    def _dispatch_ingest_batch(
+        self,
+        session: Session,
+        job: Job,
+        payload: dict[str, Any],
+        reporter: JobReporter | None = None,
+    ) -> dict[str, Any]:
+        ingest_job, selected_paths, ingest_scope = self.ingestion_service.start_batch(
+            session,
+            source_paths=list(payload.get("source_paths", [])),
+            modalities=list(payload.get("modalities", [])),
+            parse_options=dict(payload.get("parse_options", {})),
+        )
+        chunk_size = max(int(payload.get("chunk_size", self.settings.ingest_fanout_chunk_size)), 1)
+        chunks = [selected_paths[i : i + chunk_size] for i in range(0, len(selected_paths), chunk_size)]
+        fan_out = job.execution_mode == "async" and bool(payload.get("fan_out", True)) and len(chunks) > 1
+        if not fan_out:
+            accumulator = self.ingestion_service.ingest_paths(
+                session,
+                ingest_job,
+                selected_paths,
+                ingest_scope=ingest_scope,
+                progress=reporter.progress if reporter else None,
+            )
+            result = self.ingestion_service.finish_batch(session, ingest_job, accumulator, ingest_scope=ingest_scope)
+            return self._ingest_job_result(result)
+
+        # The reducer is the parent of the chunk jobs, so it is only leased once every chunk is done.
+        reducer = self.submit(
+            session,
+            job_type="ingest_reduce",
+            payload={"ingest_job_id": ingest_job.id, "ingest_scope": ingest_scope},
+            created_by=job.created_by,
+            max_attempts=job.max_attempts,
+            parent_job_id=job.id,
+            queue=job.queue,
+            priority=job.priority,
+        )
+        child_ids = [
+            self.submit(
+                session,
+                job_type="ingest_chunk",
+                payload={
+                    "ingest_job_id": ingest_job.id,
+                    "ingest_scope": ingest_scope,
+                    "chunk_index": index,
+                    "source_paths": [str(p) for p in chunk],
+                },
+                created_by=job.created_by,
+                max_attempts=job.max_attempts,
+                parent_job_id=reducer.id,
+                queue=job.queue,
+                priority=job.priority,
+            ).id
+            for index, chunk in enumerate(chunks)
+        ]
+        return {
+            "ingest_job_id": ingest_job.id,
+            "fan_out": True,
+            "reducer_job_id": reducer.id,
+            "child_job_ids": child_ids,
+        }
+
+    def _dispatch_ingest_reduce(self, session: Session, job: Job, payload: dict[str, Any]) -> dict[str, Any]:
+        ingest_job = self.ingestion_service.get_ingest_job(session, str(payload.get("ingest_job_id")))
+        children = session.scalars(select(Job).where(Job.parent_job_id == job.id)).all()
+        accumulator = new_batch_accumulator()
+        for child in sorted(children, key=lambda c: int((c.payload or {}).get("chunk_index", 0))):
+            if child.status == "succeeded":
+                merge_accumulator_payload(accumulator, child.result or {})
+                continue
+            reason = child.error_text or child.status
+            for path in (child.payload or {}).get("source_paths", []):
+                accumulator.files.append({"path": path, "status": "error", "error": reason, "document_id": None})
+            accumulator.errors.append(f"Ingest chunk job {child.id} {child.status}: {reason}")
+        result = self.ingestion_service.finish_batch(
+            session,
+            ingest_job,
+            accumulator,
+            ingest_scope=str(payload.get("ingest_scope", "partial")),
+        )
+        return {**self._ingest_job_result(result), "chunk_count": len(children)}
+
+    def _ingest_job_result(self, result: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "ingest_job_id": result["job"].id,
+            "documents_ingested": result["documents_ingested"],
+            "atoms_created": result["atoms_created"],
+            "provenance_digest": result["provenance_digest"],
+            "warnings": result.get("warnings", []),
+        }
+
     def _create_artifacts(self, session: Session, job: Job, result: dict[str, Any]) -> None:
         artifact_payload = {}
         if job.job_type == "analyze":
@@ -238,7 +696,7 @@ def _create_artifacts(self, session: Session, job: Job, result: dict[str, Any])
                 "analysis_run_id": result.get("analysis_run_id"),
                 "layer_count": len(result.get("layers", {})),
             }
-        elif job.job_type == "ingest_batch":
+        elif job.job_type in {"ingest_batch", "ingest_reduce"}:
             artifact_payload = {
                 "ingest_job_id": result.get("ingest_job_id"),
                 "documents_ingested": result.get("documents_ingested", 0),
@@ -248,6 +706,28 @@ def _create_artifacts(self, session: Session, job: Job, result: dict[str, Any])
                 "branch_id": result.get("branch_id"),
                 "text_hash": result.get("text_hash"),
             }
+        elif job.job_type == "branch_replay_batch":
+            artifact_payload = {
+                "branch_count": result.get("branch_count", 0),
+                "mismatched": result.get("mismatched", 0),
+                "missing": result.get("missing", 0),
+                "deterministic": result.get("deterministic"),
+            }
+        elif job.job_type == "branch_compaction":
+            artifact_payload = {
+                "dry_run": result.get("dry_run"),
+                "leaf_branches_deleted": result.get("leaf_branches_deleted", 0),
+                "chains_squashed": result.get("chains_squashed", 0),
+                "chain_branches_removed": result.get("chain_branches_removed", 0),
+            }
+        elif job.job_type == "remix_sweep":
+            summary = result.get("summary", {})
+            artifact_payload = {
+                "combination_count": summary.get("combination_count", 0),
+                "persisted": summary.get("persisted", 0),
+                "reused": summary.get("reused", 0),
+                "distinct_text_count": summary.get("distinct_text_count", 0),
+            }
         if artifact_payload:
             session.add(
                 JobArtifact(
@@ -259,20 +739,54 @@ def _create_artifacts(self, session: Session, job: Job, result: dict[str, Any])
 
     def complete_stale_leases(self, session: Session, worker_name: str) -> int:
         now = utcnow()
+        heartbeat_cutoff = now - timedelta(seconds=self.settings.worker_heartbeat_timeout_seconds)
+        # An expired lease alone is not proof of a crash: a worker whose heartbeat thread is merely
+        # late is still alive, so only jobs without a recent heartbeat are reclaimed. Rows locked by
+        # a worker committing its result are skipped rather than overwritten.
         stale = session.scalars(
-            select(Job).where(
+            select(Job)
+            .where(
                 Job.status == "running",
                 Job.lease_expires_at.is_not(None),
                 Job.lease_expires_at < now,
+                (Job.heartbeat_at.is_(None)) | (Job.heartbeat_at < heartbeat_cutoff),
             )
+            .with_for_update(skip_locked=True)
         ).all()
         for job in stale:
+            lost_owner = job.lease_owner
+            last_heartbeat = job.heartbeat_at
             job.status = "retry_wait" if job.attempt_count < job.max_attempts else "failed"
             job.lease_owner = worker_name
             job.lease_expires_at = None
+            job.heartbeat_at = None
             if job.status == "retry_wait":
                 job.next_run_at = now + timedelta(seconds=RETRY_BACKOFF_SECONDS[min(job.attempt_count, len(RETRY_BACKOFF_SECONDS) - 1)])
+            if last_heartbeat is not None:
+                reason = f"Worker {lost_owner} stopped heartbeating (last heartbeat {last_heartbeat.isoformat()})"
+                job.error_text = reason
+                for attempt in session.scalars(
+                    select(JobAttempt).where(JobAttempt.job_id == job.id, JobAttempt.status == "running")
+                ).all():
+                    attempt.status = "abandoned"
+                    attempt.error_text = reason
+                    attempt.finished_at = now
+            self._settle_fan_out_parent(session, job)
         return len(stale)
 
+    def schedule_retention(self, session: Session) -> Job | None:
+        interval_hours = self.settings.retention_interval_hours
+        if not interval_hours or self.retention_service is None:
+            return None
+        # One sweep per interval window, however many workers race to schedule it.
+        window = int(utcnow().timestamp() // (float(interval_hours) * 3600.0))
+        return self.submit(
+            session,
+            job_type="retention_sweep",
+            payload={},
+            idempotency_key=f"retention:{window}",
+            created_by="scheduler",
+        )
+
     def last_analysis_run_for_job(self, session: Session, job_id: str) -> AnalysisRun | None:
         return session.scalar(select(AnalysisRun).where(AnalysisRun.job_id == job_id).order_by(AnalysisRun.created_at.desc()))
@@ -3,25 +3,50 @@
 from __future__ import annotations
 
 import random
+import time
+from collections.abc import Callable
 from typing import Any
+from uuid import uuid4
 
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from nexus_babel.models import Branch, BranchEvent, RemixArtifact
-from nexus_babel.services import remix_artifact_persistence, remix_artifact_serialization, remix_strategies
+from nexus_babel.models import Branch, BranchEvent, RemixArtifact, RemixSourceLink
+from nexus_babel.services import (
+    remix_artifact_persistence,
+    remix_artifact_serialization,
+    remix_cache,
+    remix_strategies,
+    remix_sweep,
+)
 from nexus_babel.services.evolution import EvolutionService
+from nexus_babel.services.evolution_bulk_replay import default_worker_count
 from nexus_babel.services.governance import GovernanceService
-from nexus_babel.services.remix_compose import compose_text
+from nexus_babel.services.remix_compose import compose_text, strategy_inputs
 from nexus_babel.services.remix_context import branch_root_doc, resolve_context, resolve_text
-from nexus_babel.services.remix_hashing import build_payload_hash, build_remix_rng, sha256_text
+from nexus_babel.services.remix_hashing import (
+    build_payload_hash,
+    build_remix_rng,
+    build_request_key,
+    build_rng_seed_hex_from_hashes,
+    sha256_text,
+)
 from nexus_babel.services.remix_types import RemixContext
 
 
 class RemixService:
-    def __init__(self, evolution_service: EvolutionService, governance_service: GovernanceService | None = None):
+    def __init__(
+        self,
+        evolution_service: EvolutionService,
+        governance_service: GovernanceService | None = None,
+        *,
+        result_cache_entries: int = remix_cache.DEFAULT_REMIX_CACHE_ENTRIES,
+        sweep_workers: int = 0,
+    ):
         self.evolution = evolution_service
         self.governance = governance_service
+        self.result_cache = remix_cache.RemixResultCache(result_cache_entries)
+        self.sweep_workers = sweep_workers
 
     def remix(
         self,
@@ -68,13 +93,412 @@ def compose(
         create_branch: bool = True,
         persist_artifact: bool = True,
     ) -> dict[str, Any]:
+        """Compose a remix, short-circuiting requests whose result is already known.
+
+        A request identical to an earlier one (same strategy, seed, mode, sources, atom levels, input
+        contents and governance policy) returns the earlier artifact when ``persist_artifact`` is set,
+        or the in-memory result otherwise, without re-resolving, re-composing or re-evaluating.
+        With ``create_branch``, a reused artifact returns the branch it already produced (creating one
+        if it has none); non-persisted results always get a new branch, as before.
+        """
         atom_levels = atom_levels or []
+        request_ids = {
+            "source_document_id": source_document_id,
+            "source_branch_id": source_branch_id,
+            "target_document_id": target_document_id,
+            "target_branch_id": target_branch_id,
+        }
+        request_key = self._request_key(session, strategy=strategy, seed=int(seed), mode=mode, atom_levels=atom_levels, **request_ids)
+        artifact: RemixArtifact | None = None
+        result: dict[str, Any] | None = None
+        if request_key is not None:
+            if persist_artifact:
+                artifact = remix_cache.find_artifact(session, request_key)
+                if artifact is not None:
+                    result = self._result_from_artifact(artifact)
+            else:
+                result = self.result_cache.get(request_key)
+            self.result_cache.record(hit=result is not None, artifact=artifact is not None)
+        cache_hit = result is not None
+
+        if result is None:
+            result = self._compose_result(session, strategy=strategy, seed=int(seed), mode=mode, atom_levels=atom_levels, **request_ids)
+            if persist_artifact:
+                artifact = self._create_artifact(
+                    session=session,
+                    strategy=strategy,
+                    seed=int(seed),
+                    mode=mode,
+                    remixed_text=result["remixed_text"],
+                    text_hash=result["text_hash"],
+                    rng_seed_hex=result["rng_seed_hex"],
+                    payload_hash=result["payload_hash"],
+                    create_branch=create_branch,
+                    governance_decision_id=result["governance_result"].get("decision_id"),
+                    governance_trace=(result["governance_result"].get("decision_trace") or {}),
+                    source_ctx=result["source_ctx"],
+                    target_ctx=result["target_ctx"],
+                    source_atom_refs=result["source_atom_refs"],
+                )
+                artifact.request_key = request_key
+            elif request_key is not None:
+                self.result_cache.put(request_key, {key: value for key, value in result.items() if not key.endswith("_ctx")})
+
+        # Lineage refs only read the request's document and branch ids.
+        source_ref = {"document_id": source_document_id, "branch_id": source_branch_id}
+        target_ref = {"document_id": target_document_id, "branch_id": target_branch_id}
+        branch: Branch | None = None
+        event: BranchEvent | None = None
+        if create_branch:
+            if artifact is not None and cache_hit and artifact.branch_id:
+                branch = session.get(Branch, artifact.branch_id)
+                event = session.get(BranchEvent, artifact.branch_event_id) if artifact.branch_event_id else None
+                if branch is None or event is None:
+                    branch, event = None, None
+            if branch is None:
+                root_doc_id = source_document_id or (
+                    result["source_ctx"].get("root_document_id") if "source_ctx" in result else self._source_root_doc(session, source_branch_id)
+                )
+                branch, event = self.evolution.evolve_branch(
+                    session=session,
+                    parent_branch_id=source_branch_id,
+                    root_document_id=root_doc_id,
+                    event_type="remix",
+                    event_payload={
+                        "seed": int(seed),
+                        "strategy": strategy,
+                        "remixed_text": result["remixed_text"],
+                        "remix_payload_hash": result["payload_hash"],
+                        "source_document_id": source_document_id,
+                        "target_document_id": target_document_id,
+                        "source_branch_id": source_branch_id,
+                        "target_branch_id": target_branch_id,
+                        "atom_levels": atom_levels,
+                        "remix_artifact_id": artifact.id if artifact else None,
+                    },
+                    mode=mode,
+                )
+                if artifact is not None:
+                    artifact.create_branch = True
+                    artifact.branch_id = branch.id
+                    artifact.branch_event_id = event.id
+                    artifact.lineage_graph_refs = self._build_lineage_graph_refs(
+                        source_ctx=source_ref,
+                        target_ctx=target_ref,
+                        branch_id=branch.id,
+                        branch_event_id=event.id,
+                        remix_artifact_id=artifact.id,
+                    )
+        elif artifact is not None and not cache_hit:
+            artifact.lineage_graph_refs = self._build_lineage_graph_refs(
+                source_ctx=source_ref,
+                target_ctx=target_ref,
+                branch_id=None,
+                branch_event_id=None,
+                remix_artifact_id=artifact.id,
+            )
+
+        return {
+            "strategy": strategy,
+            "seed": int(seed),
+            "mode": mode.upper(),
+            "remixed_text": result["remixed_text"],
+            "text_hash": result["text_hash"],
+            "payload_hash": result["payload_hash"],
+            "rng_seed_hex": result["rng_seed_hex"],
+            "source_atom_refs": result["source_atom_refs"],
+            "remix_artifact": artifact,
+            "governance_result": result["governance_result"],
+            "branch": branch,
+            "event": event,
+            "cache_hit": cache_hit,
+        }
+
+    def sweep(
+        self,
+        *,
+        session: Session,
+        source_document_id: str | None,
+        source_branch_id: str | None,
+        target_document_id: str | None,
+        target_branch_id: str | None,
+        strategies: list[str],
+        seeds: list[int],
+        mode: str,
+        atom_levels: list[str] | None = None,
+        persist_artifacts: bool = True,
+        include_results: bool = False,
+        workers: int | None = None,
+        progress: Callable[..., Any] | None = None,
+    ) -> dict[str, Any]:
+        """Compose every strategy x seed combination of one source/target pair.
+
+        Contexts, atoms and input hashes are resolved once for the whole sweep, and each strategy's
+        input texts once per strategy; only the strategy itself runs per combination, in a process
+        pool for large sweeps. Results are identical to the equivalent ``compose`` calls. Persisted
+        artifacts (no branches) and their governance decisions are written in bulk and carry the same
+        request keys as ``compose``, so either path reuses the other's artifacts.
+        """
+        started = time.perf_counter()
+        atom_levels = atom_levels or []
+        combinations = remix_sweep.sweep_combinations(strategies, seeds)
+        request_ids = {
+            "source_document_id": source_document_id,
+            "source_branch_id": source_branch_id,
+            "target_document_id": target_document_id,
+            "target_branch_id": target_branch_id,
+        }
+        request_keys = self._sweep_request_keys(session, combinations, mode=mode, atom_levels=atom_levels, **request_ids)
+        reused: dict[str, dict[str, Any]] = {}
+        if persist_artifacts:
+            reused = self._sweep_existing_artifacts(session, request_keys, include_text=include_results)
+        pending = [combination for combination in combinations if request_keys.get(combination) not in reused]
+
+        rows_by_combination: dict[tuple[str, int], dict[str, Any]] = {}
+        for combination in combinations:
+            artifact = reused.get(request_keys.get(combination))
+            if artifact is not None:
+                rows_by_combination[combination] = {"strategy": combination[0], "seed": combination[1], **artifact, "reused": True}
+
+        pool_workers = 0
+        if pending:
+            source_ctx = resolve_context(
+                session=session,
+                role="source",
+                document_id=source_document_id,
+                branch_id=source_branch_id,
+                atom_levels=atom_levels,
+                branch_text_fn=self.evolution.branch_text,
+            )
+            target_ctx = resolve_context(
+                session=session,
+                role="target",
+                document_id=target_document_id,
+                branch_id=target_branch_id,
+                atom_levels=atom_levels,
+                branch_text_fn=self.evolution.branch_text,
+            )
+            if not source_ctx["text"] or not target_ctx["text"]:
+                raise ValueError("Both source and target must resolve to non-empty text")
+            source_hash = sha256_text(source_ctx["text"])
+            target_hash = sha256_text(target_ctx["text"])
+
+            strategy_texts: dict[str, tuple[str, str]] = {}
+            strategy_refs: dict[str, list[dict[str, Any]]] = {}
+            for strategy in dict.fromkeys(strategy for strategy, _ in pending):
+                source_text, target_text, atom_refs = strategy_inputs(
+                    source_text=source_ctx["text"],
+                    target_text=target_ctx["text"],
+                    strategy=strategy,
+                    source_ctx=source_ctx,
+                    target_ctx=target_ctx,
+                    atom_levels=atom_levels,
+                )
+                strategy_texts[strategy] = (source_text, target_text)
+                strategy_refs[strategy] = list(atom_refs)
+
+            seed_hexes = [
+                build_rng_seed_hex_from_hashes(
+                    strategy=strategy,
+                    seed=seed,
+                    source_hash=source_hash,
+                    target_hash=target_hash,
+                    atom_levels=atom_levels,
+                )
+                for strategy, seed in pending
+            ]
+            reused_count = len(combinations) - len(pending)
+            texts, pool_workers = remix_sweep.run_sweep(
+                strategy_texts,
+                [(strategy, seed_hex) for (strategy, _), seed_hex in zip(pending, seed_hexes)],
+                workers=default_worker_count(workers if workers is not None else self.sweep_workers),
+                progress=(
+                    (lambda done: progress(reused_count + done, len(combinations), unit="combinations"))
+                    if progress is not None
+                    else None
+                ),
+            )
+
+            # Identical outputs share one governance decision.
+            decisions: dict[str, dict[str, Any]] = {}
+            if self.governance is not None:
+                distinct = list(dict.fromkeys(texts))
+                decisions = dict(zip(distinct, self.governance.evaluate_many(session, distinct, mode)))
+
+            new_rows: list[RemixArtifact | RemixSourceLink] = []
+            for (strategy, seed), seed_hex, remixed in zip(pending, seed_hexes, texts):
+                text_hash = sha256_text(remixed)
+                payload_hash = build_payload_hash(
+                    strategy=strategy,
+                    seed=seed,
+                    mode=mode,
+                    atom_levels=atom_levels,
+                    text_hash=text_hash,
+                    **request_ids,
+                )
+                governance_result = decisions.get(remixed, {})
+                artifact_id: str | None = None
+                if persist_artifacts:
+                    artifact_id = str(uuid4())
+                    metadata: dict[str, Any] = {"governance": {"decision_trace": governance_result.get("decision_trace") or {}}}
+                    new_rows.append(
+                        RemixArtifact(
+                            id=artifact_id,
+                            strategy=strategy,
+                            seed=seed,
+                            mode=mode.upper(),
+                            remixed_text=remixed,
+                            text_hash=text_hash,
+                            rng_seed_hex=seed_hex,
+                            payload_hash=payload_hash,
+                            create_branch=False,
+                            governance_decision_id=governance_result.get("decision_id"),
+                            lineage_graph_refs=self._build_lineage_graph_refs(
+                                source_ctx={"document_id": source_document_id, "branch_id": source_branch_id},
+                                target_ctx={"document_id": target_document_id, "branch_id": target_branch_id},
+                                branch_id=None,
+                                branch_event_id=None,
+                                remix_artifact_id=artifact_id,
+                            ),
+                            artifact_metadata=metadata,
+                            request_key=request_keys.get((strategy, seed)),
+                            **request_ids,
+                        )
+                    )
+                    new_rows.extend(
+                        remix_artifact_persistence.build_source_links(
+                            remix_artifact_id=artifact_id,
+                            source_ctx=source_ctx,
+                            target_ctx=target_ctx,
+                            source_atom_refs=strategy_refs[strategy],
+                        )
+                    )
+                rows_by_combination[(strategy, seed)] = {
+                    "strategy": strategy,
+                    "seed": seed,
+                    "text_hash": text_hash,
+                    "payload_hash": payload_hash,
+                    "rng_seed_hex": seed_hex,
+                    "remix_artifact_id": artifact_id,
+                    "governance_decision_id": governance_result.get("decision_id"),
+                    "allow": governance_result.get("allow"),
+                    "remixed_text": remixed,
+                    "reused": False,
+                }
+            if new_rows:
+                session.add_all(new_rows)
+                session.flush()
+
+        rows = [rows_by_combination[combination] for combination in combinations]
+        summary = {
+            **request_ids,
+            "mode": mode.upper(),
+            "atom_levels": atom_levels,
+            "strategies": list(dict.fromkeys(strategy for strategy, _ in combinations)),
+            "seed_count": len({seed for _, seed in combinations}),
+            "combination_count": len(combinations),
+            "persisted": len(pending) if persist_artifacts else 0,
+            "reused": len(combinations) - len(pending),
+            **remix_sweep.summarize(rows),
+            "workers": pool_workers,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+        return {"summary": summary, "results": rows if include_results else []}
+
+    def _sweep_request_keys(
+        self,
+        session: Session,
+        combinations: list[tuple[str, int]],
+        *,
+        mode: str,
+        atom_levels: list[str],
+        source_document_id: str | None,
+        source_branch_id: str | None,
+        target_document_id: str | None,
+        target_branch_id: str | None,
+    ) -> dict[tuple[str, int], str]:
+        # The same keys ``compose`` would compute, fingerprinting the inputs and policy once.
+        source_fingerprint = remix_cache.input_fingerprint(session, source_document_id, source_branch_id)
+        target_fingerprint = remix_cache.input_fingerprint(session, target_document_id, target_branch_id)
+        if source_fingerprint is None or target_fingerprint is None:
+            return {}
+        policy_fingerprint = remix_cache.policy_fingerprint(session, mode) if self.governance is not None else ""
+        return {
+            (strategy, seed): build_request_key(
+                strategy=strategy,
+                seed=seed,
+                mode=mode,
+                source_document_id=source_document_id,
+                source_branch_id=source_branch_id,
+                target_document_id=target_document_id,
+                target_branch_id=target_branch_id,
+                atom_levels=atom_levels,
+                source_fingerprint=source_fingerprint,
+                target_fingerprint=target_fingerprint,
+                policy_fingerprint=policy_fingerprint,
+            )
+            for strategy, seed in combinations
+        }
+
+    def _sweep_existing_artifacts(
+        self,
+        session: Session,
+        request_keys: dict[tuple[str, int], str],
+        *,
+        include_text: bool,
+    ) -> dict[str, dict[str, Any]]:
+        """Result rows of earlier artifacts for any of the sweep's request keys, keyed by request key."""
+        wanted = sorted(set(request_keys.values()))
+        columns = [
+            RemixArtifact.id,
+            RemixArtifact.request_key,
+            RemixArtifact.artifact_metadata,
+            RemixArtifact.text_hash,
+            RemixArtifact.payload_hash,
+            RemixArtifact.rng_seed_hex,
+            RemixArtifact.governance_decision_id,
+        ]
+        if include_text:
+            columns.append(RemixArtifact.remixed_text)
+        found: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(wanted), remix_cache.REQUEST_KEY_CHUNK):
+            query = select(*columns).where(RemixArtifact.request_key.in_(wanted[start : start + remix_cache.REQUEST_KEY_CHUNK]))
+            # Oldest first, matching ``compose``'s choice when a request was persisted more than once.
+            for row in session.execute(query.order_by(RemixArtifact.created_at, RemixArtifact.id)).all():
+                if row.request_key in found:
+                    continue
+                metadata = row.artifact_metadata or {}
+                found[row.request_key] = {
+                    "text_hash": row.text_hash,
+                    "payload_hash": row.payload_hash,
+                    "rng_seed_hex": row.rng_seed_hex,
+                    "remix_artifact_id": row.id,
+                    "governance_decision_id": row.governance_decision_id,
+                    "allow": ((metadata.get("governance") or {}).get("decision_trace") or {}).get("allow"),
+                    "remixed_text": row.remixed_text if include_text else None,
+                }
+        return found
+
+    def _compose_result(
+        self,
+        session: Session,
+        *,
+        strategy: str,
+        seed: int,
+        mode: str,
+        atom_levels: list[str],
+        source_document_id: str | None,
+        source_branch_id: str | None,
+        target_document_id: str | None,
+        target_branch_id: str | None,
+    ) -> dict[str, Any]:
         source_ctx = resolve_context(
             session=session,
             role="source",
             document_id=source_document_id,
             branch_id=source_branch_id,
             atom_levels=atom_levels,
+            branch_text_fn=self.evolution.branch_text,
         )
         target_ctx = resolve_context(
             session=session,
@@ -82,6 +506,7 @@ def compose(
             document_id=target_document_id,
             branch_id=target_branch_id,
             atom_levels=atom_levels,
+            branch_text_fn=self.evolution.branch_text,
         )
 
         source_text = source_ctx["text"]
@@ -91,7 +516,7 @@ def compose(
 
         rng, rng_seed_hex = build_remix_rng(
             strategy=strategy,
-            seed=int(seed),
+            seed=seed,
             source_text=source_text,
             target_text=target_text,
             atom_levels=atom_levels,
@@ -109,7 +534,7 @@ def compose(
         text_hash = sha256_text(remixed)
         payload_hash = build_payload_hash(
             strategy=strategy,
-            seed=int(seed),
+            seed=seed,
             mode=mode,
             source_document_id=source_document_id,
             source_branch_id=source_branch_id,
@@ -120,87 +545,71 @@ def compose(
         )
 
         governance_result: dict[str, Any] = {}
-        governance_decision_id: str | None = None
         if self.governance is not None:
             governance_result = self.governance.evaluate(session=session, candidate_output=remixed, mode=mode)
-            governance_decision_id = governance_result.get("decision_id")
-
-        artifact: RemixArtifact | None = None
-        if persist_artifact:
-            artifact = self._create_artifact(
-                session=session,
-                strategy=strategy,
-                seed=int(seed),
-                mode=mode,
-                remixed_text=remixed,
-                text_hash=text_hash,
-                rng_seed_hex=rng_seed_hex,
-                payload_hash=payload_hash,
-                create_branch=create_branch,
-                governance_decision_id=governance_decision_id,
-                governance_trace=(governance_result.get("decision_trace") or {}),
-                source_ctx=source_ctx,
-                target_ctx=target_ctx,
-                source_atom_refs=source_atom_refs,
-            )
-
-        branch: Branch | None = None
-        event: BranchEvent | None = None
-        if create_branch:
-            root_doc_id = source_document_id or source_ctx.get("root_document_id")
-            branch, event = self.evolution.evolve_branch(
-                session=session,
-                parent_branch_id=source_branch_id,
-                root_document_id=root_doc_id,
-                event_type="remix",
-                event_payload={
-                    "seed": int(seed),
-                    "strategy": strategy,
-                    "remixed_text": remixed,
-                    "remix_payload_hash": payload_hash,
-                    "source_document_id": source_document_id,
-                    "target_document_id": target_document_id,
-                    "source_branch_id": source_branch_id,
-                    "target_branch_id": target_branch_id,
-                    "atom_levels": atom_levels,
-                    "remix_artifact_id": artifact.id if artifact else None,
-                },
-                mode=mode,
-            )
-            if artifact is not None:
-                artifact.branch_id = branch.id
-                artifact.branch_event_id = event.id
-                artifact.lineage_graph_refs = self._build_lineage_graph_refs(
-                    source_ctx=source_ctx,
-                    target_ctx=target_ctx,
-                    branch_id=branch.id,
-                    branch_event_id=event.id,
-                    remix_artifact_id=artifact.id,
-                )
-        elif artifact is not None:
-            artifact.lineage_graph_refs = self._build_lineage_graph_refs(
-                source_ctx=source_ctx,
-                target_ctx=target_ctx,
-                branch_id=None,
-                branch_event_id=None,
-                remix_artifact_id=artifact.id,
-            )
-
         return {
-            "strategy": strategy,
-            "seed": int(seed),
-            "mode": mode.upper(),
             "remixed_text": remixed,
             "text_hash": text_hash,
             "payload_hash": payload_hash,
             "rng_seed_hex": rng_seed_hex,
             "source_atom_refs": source_atom_refs,
-            "remix_artifact": artifact,
             "governance_result": governance_result,
-            "branch": branch,
-            "event": event,
+            "source_ctx": source_ctx,
+            "target_ctx": target_ctx,
         }
 
+    def _request_key(
+        self,
+        session: Session,
+        *,
+        strategy: str,
+        seed: int,
+        mode: str,
+        atom_levels: list[str],
+        source_document_id: str | None,
+        source_branch_id: str | None,
+        target_document_id: str | None,
+        target_branch_id: str | None,
+    ) -> str | None:
+        # Requests whose inputs cannot be fingerprinted (missing rows, legacy branches) are not cached.
+        source_fingerprint = remix_cache.input_fingerprint(session, source_document_id, source_branch_id)
+        target_fingerprint = remix_cache.input_fingerprint(session, target_document_id, target_branch_id)
+        if source_fingerprint is None or target_fingerprint is None:
+            return None
+        return build_request_key(
+            strategy=strategy,
+            seed=seed,
+            mode=mode,
+            source_document_id=source_document_id,
+            source_branch_id=source_branch_id,
+            target_document_id=target_document_id,
+            target_branch_id=target_branch_id,
+            atom_levels=atom_levels,
+            source_fingerprint=source_fingerprint,
+            target_fingerprint=target_fingerprint,
+            policy_fingerprint=remix_cache.policy_fingerprint(session, mode) if self.governance is not None else "",
+        )
+
+    def _result_from_artifact(self, artifact: RemixArtifact) -> dict[str, Any]:
+        governance_trace = ((artifact.artifact_metadata or {}).get("governance") or {}).get("decision_trace") or {}
+        return {
+            "remixed_text": artifact.remixed_text,
+            "text_hash": artifact.text_hash,
+            "payload_hash": artifact.payload_hash,
+            "rng_seed_hex": artifact.rng_seed_hex,
+            "source_atom_refs": [
+                ref for link in sorted(artifact.source_links or [], key=lambda row: row.role != "source") for ref in (link.atom_refs or [])
+            ],
+            "governance_result": (
+                {"decision_id": artifact.governance_decision_id, "decision_trace": governance_trace}
+                if artifact.governance_decision_id
+                else {}
+            ),
+        }
+
+    def _source_root_doc(self, session: Session, source_branch_id: str | None) -> str | None:
+        return self._branch_root_doc(session, source_branch_id) if source_branch_id else None
+
     def get_remix_artifact(self, session: Session, remix_artifact_id: str) -> dict[str, Any]:
         artifact = session.scalar(select(RemixArtifact).where(RemixArtifact.id == remix_artifact_id))
         if not artifact:
@@ -278,7 +687,7 @@ def _build_lineage_graph_refs(
         )
 
     def _resolve_text(self, session: Session, document_id: str | None, branch_id: str | None) -> str:
-        return resolve_text(session, document_id, branch_id)
+        return resolve_text(session, document_id, branch_id, branch_text_fn=self.evolution.branch_text)
 
     def _branch_root_doc(self, session: Session, branch_id: str) -> str | None:
         return branch_root_doc(session, branch_id)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from nexus_babel.models import Branch, Document, ModePolicy, RemixArtifact
+
+DEFAULT_REMIX_CACHE_ENTRIES = 256
+# Request keys per IN clause when looking up a sweep's earlier artifacts.
+REQUEST_KEY_CHUNK = 500
+
+
+class RemixResultCache:
+    """Thread-safe LRU of composed remix results keyed by request key.
+
+    Holds results of compose requests that did not persist an artifact; persisted results are found
+    through their artifact instead. ``artifact_hits`` counts those, ``hits``/``misses`` cover both.
+    Results are copied in and out, so callers never share mutable state with the cache or each other.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_REMIX_CACHE_ENTRIES):
+        self.max_entries = max(int(max_entries), 0)
+        self.hits = 0
+        self.artifact_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, *, hit: bool, artifact: bool = False) -> None:
+        with self._lock:
+            if not hit:
+                self.misses += 1
+                return
+            self.hits += 1
+            if artifact:
+                self.artifact_hits += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "artifact_hits": self.artifact_hits,
+            "misses": self.misses,
+        }
+
+
+def input_fingerprint(session: Session, document_id: str | None, branch_id: str | None) -> str | None:
+    """Identify a remix input's content without materializing it, or None when it cannot be cached.
+
+    Branches are immutable, so their recorded text hash identifies them. Documents can be re-ingested
+    in place, so their checksum and last update time are both part of the fingerprint.
+    """
+    parts: list[str] = []
+    if branch_id:
+        snapshot = session.scalar(select(Branch.state_snapshot).where(Branch.id == branch_id))
+        text_hash = (snapshot or {}).get("text_hash")
+        if not text_hash:
+            return None
+        parts.append(f"branch:{branch_id}:{text_hash}")
+    if document_id:
+        row = session.execute(select(Document.checksum, Document.updated_at).where(Document.id == document_id)).first()
+        if row is None:
+            return None
+        parts.append(f"document:{document_id}:{row.checksum}:{row.updated_at.isoformat() if row.updated_at else ''}")
+    return "|".join(parts) or None
+
+
+def policy_fingerprint(session: Session, mode: str) -> str:
+    # A cached governance decision is only reused while the mode's policy is unchanged.
+    row = session.execute(select(ModePolicy.policy_version, ModePolicy.updated_at).where(ModePolicy.mode == mode.upper())).first()
+    if row is None:
+        return ""
+    return f"{row.policy_version}:{row.updated_at.isoformat() if row.updated_at else ''}"
+
+
+def find_artifact(session: Session, request_key: str) -> RemixArtifact | None:
+    """Oldest persisted artifact produced by the same request, looked up by its indexed request key."""
+    return session.scalar(
+        select(RemixArtifact)
+        .where(RemixArtifact.request_key == request_key)
+        .order_by(RemixArtifact.created_at, RemixArtifact.id)
+        .limit(1)
+    )
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import random
+from collections.abc import Iterable
 
 from nexus_babel.services import remix_strategies
 from nexus_babel.services.remix_context import (
-    join_atoms_for_strategy,
+    atom_separator,
     pick_atom_level,
     preferred_levels_for_strategy,
 )
-from nexus_babel.services.remix_types import RemixAtomRef, RemixContext
+from nexus_babel.services.remix_types import AtomRow, RemixAtomRef, RemixContext
 
 
 def compose_text(
@@ -21,28 +22,52 @@ def compose_text(
     target_ctx: RemixContext,
     atom_levels: list[str],
 ) -> tuple[str, list[RemixAtomRef]]:
+    source_text, target_text, atom_refs = strategy_inputs(
+        source_text=source_text,
+        target_text=target_text,
+        strategy=strategy,
+        source_ctx=source_ctx,
+        target_ctx=target_ctx,
+        atom_levels=atom_levels,
+    )
+    remixed = apply_strategy(source_text, target_text, strategy, rng)
+    return remixed, atom_refs
+
+
+def strategy_inputs(
+    *,
+    source_text: str,
+    target_text: str,
+    strategy: str,
+    source_ctx: RemixContext,
+    target_ctx: RemixContext,
+    atom_levels: list[str],
+) -> tuple[str, str, list[RemixAtomRef]]:
+    """The texts a strategy is applied to, and the atoms they came from; independent of the seed."""
     source_atom_refs: list[RemixAtomRef] = []
     target_atom_refs: list[RemixAtomRef] = []
     if atom_levels:
         preferred = preferred_levels_for_strategy(strategy)
-        selected_source = pick_atom_level(source_ctx.get("atoms_by_level", {}), preferred)
-        selected_target = pick_atom_level(target_ctx.get("atoms_by_level", {}), preferred)
+        selected_source = pick_atom_level(source_ctx.get("atom_levels", []), preferred)
+        selected_target = pick_atom_level(target_ctx.get("atom_levels", []), preferred)
         if selected_source and selected_target:
-            source_atoms = source_ctx["atoms_by_level"][selected_source]
-            target_atoms = target_ctx["atoms_by_level"][selected_target]
-            source_text = join_atoms_for_strategy(source_atoms, selected_source)
-            target_text = join_atoms_for_strategy(target_atoms, selected_target)
-            source_atom_refs = [
-                {"atom_id": a.id, "atom_level": a.atom_level, "ordinal": a.ordinal, "role": "source"}
-                for a in source_atoms
-            ]
-            target_atom_refs = [
-                {"atom_id": a.id, "atom_level": a.atom_level, "ordinal": a.ordinal, "role": "target"}
-                for a in target_atoms
-            ]
+            source_text, source_atom_refs = _join_atom_stream(
+                source_ctx["atom_rows"](selected_source), selected_source, "source"
+            )
+            target_text, target_atom_refs = _join_atom_stream(
+                target_ctx["atom_rows"](selected_target), selected_target, "target"
+            )
+    return source_text, target_text, source_atom_refs + target_atom_refs
 
-    remixed = apply_strategy(source_text, target_text, strategy, rng)
-    return remixed, source_atom_refs + target_atom_refs
+
+def _join_atom_stream(atoms: Iterable[AtomRow], atom_level: str, role: str) -> tuple[str, list[RemixAtomRef]]:
+    # One pass over the streamed rows: only contents and refs are kept, never the rows themselves.
+    contents: list[str] = []
+    refs: list[RemixAtomRef] = []
+    for atom in atoms:
+        contents.append(atom.content)
+        refs.append({"atom_id": atom.id, "atom_level": atom.atom_level, "ordinal": atom.ordinal, "role": role})
+    return atom_separator(atom_level).join(contents), refs
 
 
 def apply_strategy(source: str, target: str, strategy: str, rng: random.Random) -> str:
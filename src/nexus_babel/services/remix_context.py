@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Iterator
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from nexus_babel.models import Atom, Branch, Document
-from nexus_babel.services.remix_types import RemixContext
+from nexus_babel.services.evolution_text import materialize_branch_text
+from nexus_babel.services.remix_types import AtomRow, RemixContext
+
+ATOM_STREAM_BATCH_SIZE = 5000
 
 
 def resolve_context(
@@ -14,6 +19,7 @@ def resolve_context(
     document_id: str | None,
     branch_id: str | None,
     atom_levels: list[str],
+    branch_text_fn: Callable[[Session, Branch], str] = materialize_branch_text,
 ) -> RemixContext:
     text = ""
     root_document_id: str | None = None
@@ -23,7 +29,7 @@ def resolve_context(
         branch = session.scalar(select(Branch).where(Branch.id == branch_id))
         if not branch:
             raise LookupError(f"{role} branch {branch_id} not found")
-        text = str((branch.state_snapshot or {}).get("current_text", ""))
+        text = branch_text_fn(session, branch)
         root_document_id = branch.root_document_id
     if document_id:
         document = session.scalar(select(Document).where(Document.id == document_id))
@@ -33,15 +39,23 @@ def resolve_context(
             text = str((document.provenance or {}).get("extracted_text", ""))
         root_document_id = root_document_id or document.id
 
-    atoms_by_level: dict[str, list[Atom]] = {}
-    if document and atom_levels:
-        atoms = session.scalars(
-            select(Atom)
-            .where(Atom.document_id == document.id, Atom.atom_level.in_(atom_levels))
-            .order_by(Atom.atom_level, Atom.ordinal, Atom.id)
-        ).all()
-        for atom in atoms:
-            atoms_by_level.setdefault(atom.atom_level, []).append(atom)
+    # Only which levels exist is checked here; a level's atoms are streamed once a strategy picks it.
+    available_levels: list[str] = []
+    atom_document_id = document.id if document else None
+    if atom_document_id and atom_levels:
+        available_levels = [
+            level
+            for level in dict.fromkeys(atom_levels)
+            if session.scalar(
+                select(Atom.id).where(Atom.document_id == atom_document_id, Atom.atom_level == level).limit(1)
+            )
+            is not None
+        ]
+
+    def atom_rows(level: str) -> Iterator[AtomRow]:
+        if atom_document_id is None or level not in available_levels:
+            return iter(())
+        return iter_atom_rows(session, atom_document_id, [level])
 
     return {
         "role": role,
@@ -49,10 +63,34 @@ def resolve_context(
         "branch_id": branch_id,
         "root_document_id": root_document_id,
         "text": text,
-        "atoms_by_level": atoms_by_level,
+        "atom_levels": available_levels,
+        "atom_rows": atom_rows,
     }
 
 
+def iter_atom_rows(
+    session: Session,
+    document_id: str,
+    atom_levels: list[str],
+    *,
+    batch_size: int = ATOM_STREAM_BATCH_SIZE,
+) -> Iterator[AtomRow]:
+    """Stream a document's atoms in (atom_level, ordinal, id) order as plain rows.
+
+    Only the four columns a remix reads are selected, so no ORM objects or metadata JSON are built,
+    and rows are fetched ``batch_size`` at a time. The order is served by the
+    (document_id, atom_level, ordinal) index.
+    """
+    result = session.execute(
+        select(Atom.id, Atom.atom_level, Atom.ordinal, Atom.content)
+        .where(Atom.document_id == document_id, Atom.atom_level.in_(atom_levels))
+        .order_by(Atom.atom_level, Atom.ordinal, Atom.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for atom_id, atom_level, ordinal, content in result:
+        yield AtomRow(atom_id, atom_level, ordinal, content)
+
+
 def preferred_levels_for_strategy(strategy: str) -> list[str]:
     if strategy == "thematic_blend":
         return ["sentence", "word", "paragraph", "glyph-seed", "syllable"]
@@ -63,28 +101,35 @@ def preferred_levels_for_strategy(strategy: str) -> list[str]:
     return ["word", "sentence", "paragraph", "glyph-seed", "syllable"]
 
 
-def pick_atom_level(atoms_by_level: dict[str, list[Atom]], preferred_levels: list[str]) -> str | None:
+def pick_atom_level(available_levels: list[str], preferred_levels: list[str]) -> str | None:
     for level in preferred_levels:
-        if atoms_by_level.get(level):
+        if level in available_levels:
             return level
     return None
 
 
-def join_atoms_for_strategy(atoms: list[Atom], atom_level: str) -> str:
+def atom_separator(atom_level: str) -> str:
     if atom_level == "paragraph":
-        return "\n\n".join(a.content for a in atoms)
-    if atom_level == "sentence":
-        return " ".join(a.content for a in atoms)
+        return "\n\n"
     if atom_level == "glyph-seed":
-        return "".join(a.content for a in atoms)
-    return " ".join(a.content for a in atoms)
+        return ""
+    return " "
+
+
+def join_atoms_for_strategy(atoms: Iterable[AtomRow], atom_level: str) -> str:
+    return atom_separator(atom_level).join(a.content for a in atoms)
 
 
-def resolve_text(session: Session, document_id: str | None, branch_id: str | None) -> str:
+def resolve_text(
+    session: Session,
+    document_id: str | None,
+    branch_id: str | None,
+    branch_text_fn: Callable[[Session, Branch], str] = materialize_branch_text,
+) -> str:
     if branch_id:
         branch = session.scalar(select(Branch).where(Branch.id == branch_id))
         if branch:
-            return str((branch.state_snapshot or {}).get("current_text", ""))
+            return branch_text_fn(session, branch)
     if document_id:
         doc = session.scalar(select(Document).where(Document.id == document_id))
         if doc:
@@ -17,15 +17,32 @@ def build_rng_seed_hex(
     target_text: str,
     atom_levels: list[str],
 ) -> str:
-    seed_input = (
-        f"remix:{strategy}:{seed}:"
-        f"{sha256_text(source_text)}:"
-        f"{sha256_text(target_text)}:"
-        f"{','.join(atom_levels)}"
+    return build_rng_seed_hex_from_hashes(
+        strategy=strategy,
+        seed=seed,
+        source_hash=sha256_text(source_text),
+        target_hash=sha256_text(target_text),
+        atom_levels=atom_levels,
     )
+
+
+def build_rng_seed_hex_from_hashes(
+    *,
+    strategy: str,
+    seed: int,
+    source_hash: str,
+    target_hash: str,
+    atom_levels: list[str],
+) -> str:
+    # Lets callers that remix the same inputs many times hash the texts once.
+    seed_input = f"remix:{strategy}:{seed}:{source_hash}:{target_hash}:{','.join(atom_levels)}"
     return hashlib.sha256(seed_input.encode("utf-8")).hexdigest()
 
 
+def rng_from_seed_hex(rng_seed_hex: str) -> random.Random:
+    return random.Random(int(rng_seed_hex, 16) % (2**32))
+
+
 def build_remix_rng(
     *,
     strategy: str,
@@ -41,8 +58,7 @@ def build_remix_rng(
         target_text=target_text,
         atom_levels=atom_levels,
     )
-    rng = random.Random(int(rng_seed_hex, 16) % (2**32))
-    return rng, rng_seed_hex
+    return rng_from_seed_hex(rng_seed_hex), rng_seed_hex
 
 
 def build_payload_hash(
@@ -69,3 +85,34 @@ def build_payload_hash(
         "text_hash": text_hash,
     }
     return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def build_request_key(
+    *,
+    strategy: str,
+    seed: int,
+    mode: str,
+    source_document_id: str | None,
+    source_branch_id: str | None,
+    target_document_id: str | None,
+    target_branch_id: str | None,
+    atom_levels: list[str],
+    source_fingerprint: str,
+    target_fingerprint: str,
+    policy_fingerprint: str,
+) -> str:
+    # Everything a compose result depends on, known before any text is resolved.
+    payload = {
+        "strategy": strategy,
+        "seed": int(seed),
+        "mode": mode.upper(),
+        "source_document_id": source_document_id,
+        "source_branch_id": source_branch_id,
+        "target_document_id": target_document_id,
+        "target_branch_id": target_branch_id,
+        "atom_levels": atom_levels,
+        "source_fingerprint": source_fingerprint,
+        "target_fingerprint": target_fingerprint,
+        "policy_fingerprint": policy_fingerprint,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from nexus_babel.services import remix_strategies
+from nexus_babel.services.remix_hashing import rng_from_seed_hex
+
+MAX_SWEEP_COMBINATIONS = 10_000
+# Below this many combinations, spawning workers costs more than remixing in-process.
+MIN_POOL_COMBINATIONS = 32
+CHUNKS_PER_WORKER = 4
+# Combinations remixed between progress reports when the sweep runs in-process.
+IN_PROCESS_CHUNK = 256
+
+# Strategy -> (source_text, target_text), installed once per worker process by ``_init_worker``.
+_WORKER_TEXTS: dict[str, tuple[str, str]] = {}
+
+
+def sweep_combinations(strategies: list[str], seeds: list[int]) -> list[tuple[str, int]]:
+    """The cross product of strategies and seeds, strategy-major, with duplicates removed."""
+    unique_strategies = list(dict.fromkeys(strategies))
+    unique_seeds = list(dict.fromkeys(int(seed) for seed in seeds))
+    if not unique_strategies or not unique_seeds:
+        raise ValueError("A sweep needs at least one strategy and one seed")
+    combination_count = len(unique_strategies) * len(unique_seeds)
+    if combination_count > MAX_SWEEP_COMBINATIONS:
+        raise ValueError(f"Sweep of {combination_count} combinations exceeds the limit of {MAX_SWEEP_COMBINATIONS}")
+    return [(strategy, seed) for strategy in unique_strategies for seed in unique_seeds]
+
+
+def remix_one(strategy_texts: dict[str, tuple[str, str]], strategy: str, rng_seed_hex: str) -> str:
+    source_text, target_text = strategy_texts[strategy]
+    return remix_strategies.apply_strategy(
+        source=source_text,
+        target=target_text,
+        strategy=strategy,
+        rng=rng_from_seed_hex(rng_seed_hex),
+    )
+
+
+def _init_worker(strategy_texts: dict[str, tuple[str, str]]) -> None:
+    _WORKER_TEXTS.clear()
+    _WORKER_TEXTS.update(strategy_texts)
+
+
+def _remix_chunk_in_worker(chunk: list[tuple[str, str]]) -> list[str]:
+    return [remix_one(_WORKER_TEXTS, strategy, rng_seed_hex) for strategy, rng_seed_hex in chunk]
+
+
+def run_sweep(
+    strategy_texts: dict[str, tuple[str, str]],
+    items: list[tuple[str, str]],
+    *,
+    workers: int = 1,
+    progress: Callable[[int], Any] | None = None,
+) -> tuple[list[str], int]:
+    """Remix every ``(strategy, rng_seed_hex)`` item, returning texts in item order and the workers used.
+
+    The input texts are shipped to each worker once, through the pool initializer, rather than with
+    every item. Items run in chunks, and ``progress`` is called with the number of items done after
+    each chunk completes.
+    """
+    texts: list[str] = []
+    if workers <= 1 or len(items) < MIN_POOL_COMBINATIONS:
+        for start in range(0, len(items), IN_PROCESS_CHUNK):
+            texts.extend(
+                remix_one(strategy_texts, strategy, rng_seed_hex)
+                for strategy, rng_seed_hex in items[start : start + IN_PROCESS_CHUNK]
+            )
+            if progress is not None:
+                progress(len(texts))
+        return texts, 1
+    pool_workers = min(workers, len(items))
+    chunksize = max(len(items) // (pool_workers * CHUNKS_PER_WORKER), 1)
+    chunks = [items[start : start + chunksize] for start in range(0, len(items), chunksize)]
+    with ProcessPoolExecutor(
+        max_workers=pool_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(strategy_texts,),
+    ) as pool:
+        # map() yields chunk results in order as they finish, so progress advances while the pool runs.
+        for chunk_texts in pool.map(_remix_chunk_in_worker, chunks):
+            texts.extend(chunk_texts)
+            if progress is not None:
+                progress(len(texts))
+    return texts, pool_workers
+
+
+def summarize(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    by_strategy: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        bucket = by_strategy.setdefault(row["strategy"], {"combinations": 0, "allowed": 0, "blocked": 0, "text_hashes": set()})
+        bucket["combinations"] += 1
+        if row["allow"] is not None:
+            bucket["allowed" if row["allow"] else "blocked"] += 1
+        bucket["text_hashes"].add(row["text_hash"])
+    return {
+        "allowed": sum(bucket["allowed"] for bucket in by_strategy.values()),
+        "blocked": sum(bucket["blocked"] for bucket in by_strategy.values()),
+        "distinct_text_count": len({row["text_hash"] for row in rows}),
+        "by_strategy": {
+            strategy: {
+                "combinations": bucket["combinations"],
+                "distinct_texts": len(bucket["text_hashes"]),
+                "allowed": bucket["allowed"],
+                "blocked": bucket["blocked"],
+            }
+            for strategy, bucket in by_strategy.items()
+        },
+    }
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from typing import Any, TypedDict
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple, TypedDict
 
-from nexus_babel.models import Atom
+
+class AtomRow(NamedTuple):
+    """The atom columns a remix reads, without ORM state or metadata."""
+
+    id: str
+    atom_level: str
+    ordinal: int
+    content: str
 
 
 class RemixAtomRef(TypedDict):
@@ -18,7 +26,9 @@ class RemixContext(TypedDict):
     branch_id: str | None
     root_document_id: str | None
     text: str
-    atoms_by_level: dict[str, list[Atom]]
+    # Requested levels the document has atoms at; ``atom_rows`` streams one level's atoms in order.
+    atom_levels: list[str]
+    atom_rows: Callable[[str], Iterable[AtomRow]]
 
 
 class GovernanceTraceResult(TypedDict, total=False):
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session, aliased
+
+from nexus_babel.config import Settings
+from nexus_babel.models import AuditLog, Base, Job, JobArtifact, JobAttempt, JobProgress, PolicyDecision, utcnow
+from nexus_babel.services.jobs import TERMINAL_JOB_STATUSES
+
+
+@dataclass(frozen=True)
+class RetentionTarget:
+    table: str
+    model: type[Base]
+    timestamp: Any
+    eligible: Callable[[], tuple] = tuple
+
+
+def _finished_jobs() -> tuple:
+    # Never archive a job that is still live or that still has live children.
+    child = aliased(Job)
+    active_children = select(child.id).where(child.parent_job_id == Job.id, child.status.not_in(TERMINAL_JOB_STATUSES))
+    return (Job.status.in_(TERMINAL_JOB_STATUSES), ~active_children.exists())
+
+
+RETENTION_TARGETS: dict[str, RetentionTarget] = {
+    # Dependents first, so an aged job's attempts and artifacts are archived under their own tables.
+    "job_attempts": RetentionTarget(
+        "job_attempts",
+        JobAttempt,
+        JobAttempt.started_at,
+        lambda: (JobAttempt.finished_at.is_not(None),),
+    ),
+    "job_artifacts": RetentionTarget("job_artifacts", JobArtifact, JobArtifact.created_at),
+    "jobs": RetentionTarget("jobs", Job, Job.created_at, _finished_jobs),
+    "audit_logs": RetentionTarget("audit_logs", AuditLog, AuditLog.created_at),
+    "policy_decisions": RetentionTarget("policy_decisions", PolicyDecision, PolicyDecision.created_at),
+}
+
+# Rows removed together with an archived job (no ORM cascade on bulk deletes, nor FK enforcement on SQLite).
+_JOB_DEPENDENTS: tuple[tuple[str, type[Base], Any], ...] = (
+    ("job_attempts", JobAttempt, JobAttempt.job_id),
+    ("job_artifacts", JobArtifact, JobArtifact.job_id),
+    ("job_progress", JobProgress, JobProgress.job_id),
+)
+
+
+def _row_payload(row: Base) -> dict[str, Any]:
+    return {column.name: getattr(row, column.key) for column in row.__table__.columns}
+
+
+class RetentionService:
+    """Archives rows past their table's TTL to gzip NDJSON and deletes them in bounded batches.
+
+    Each batch is written to its own archive file and then deleted and committed before the next
+    batch is selected, so no sweep holds locks on a table for longer than one batch.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+    @property
+    def archive_root(self) -> Path:
+        return self.settings.object_storage_root / "archive"
+
+    def sweep(
+        self,
+        session: Session,
+        *,
+        ttl_days: dict[str, float] | None = None,
+        batch_size: int | None = None,
+        dry_run: bool = False,
+        progress: Callable[..., Any] | None = None,
+    ) -> dict[str, Any]:
+        ttl_days = {**self.settings.retention_ttl_days, **(ttl_days or {})}
+        unknown = sorted(set(ttl_days) - set(RETENTION_TARGETS))
+        if unknown:
+            raise ValueError(f"Unknown retention tables: {', '.join(unknown)}")
+        batch_size = max(int(batch_size or self.settings.retention_batch_size), 1)
+        run_id = uuid4().hex[:12]
+        now = utcnow()
+
+        tables: dict[str, dict[str, Any]] = {}
+        archived_total = 0
+        for name, target in RETENTION_TARGETS.items():
+            if ttl_days.get(name) is None:
+                continue
+            cutoff = now - timedelta(days=float(ttl_days[name]))
+            stats = {"cutoff": cutoff.isoformat(), "archived": 0, "batches": 0, "files": []}
+            tables[name] = stats
+            while True:
+                rows = session.scalars(
+                    select(target.model)
+                    .where(target.timestamp < cutoff, *target.eligible())
+                    .order_by(target.timestamp)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                stats["archived"] += len(rows)
+                stats["batches"] += 1
+                if dry_run:
+                    # Nothing is deleted, so re-selecting would return the same batch forever.
+                    break
+                stats["files"].append(self._archive_and_delete(session, target, rows, run_id=run_id, batch=stats["batches"]))
+                session.commit()
+                archived_total += len(rows)
+                if progress is not None:
+                    progress(archived_total, None, unit="rows", message=f"archived {name} batch {stats['batches']}")
+
+        return {"run_id": run_id, "dry_run": dry_run, "batch_size": batch_size, "tables": tables}
+
+    def _archive_and_delete(
+        self,
+        session: Session,
+        target: RetentionTarget,
+        rows: list[Base],
+        *,
+        run_id: str,
+        batch: int,
+    ) -> str:
+        records = {target.table: [_row_payload(row) for row in rows]}
+        ids = [row.id for row in rows]
+        if target.model is Job:
+            for table, model, job_fk in _JOB_DEPENDENTS:
+                dependents = session.scalars(select(model).where(job_fk.in_(ids))).all()
+                if dependents:
+                    records[table] = [_row_payload(row) for row in dependents]
+
+        path = self.archive_root / target.table / f"{utcnow():%Y%m%d}" / f"{target.table}-{run_id}-{batch:05d}.ndjson.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            for table, payloads in records.items():
+                for payload in payloads:
+                    handle.write(json.dumps({"table": table, "row": payload}, default=str, sort_keys=True) + "\n")
+
+        if target.model is Job:
+            for _table, model, job_fk in _JOB_DEPENDENTS:
+                session.execute(delete(model).where(job_fk.in_(ids)).execution_options(synchronize_session=False))
+        session.execute(delete(target.model).where(target.model.id.in_(ids)).execution_options(synchronize_session=False))
+        return str(path)
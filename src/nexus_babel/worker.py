@@ -1,46 +1,232 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import threading
 import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
 
 from nexus_babel.main import create_app
+from nexus_babel.services.job_heartbeat import JobHeartbeat
+
+IDLE_BACKOFF_START_SECONDS = 0.05
+
+logger = logging.getLogger(__name__)
+
+
+class _JobBudget:
+    """Shared max-jobs counter so concurrent worker slots never overshoot the cap."""
+
+    def __init__(self, max_jobs: int | None):
+        self.max_jobs = max_jobs
+        self.processed = 0
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, count: int) -> int:
+        with self._lock:
+            granted = count if self.max_jobs is None else max(min(count, self.max_jobs - self._reserved), 0)
+            self._reserved += granted
+            return granted
+
+    def release(self, count: int) -> None:
+        with self._lock:
+            self._reserved -= count
+
+    def settle(self, *, did_work: bool) -> None:
+        with self._lock:
+            if did_work:
+                self.processed += 1
+            else:
+                self._reserved -= 1
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self.max_jobs is not None and self.processed >= self.max_jobs
+
 
+def _in_session(app: FastAPI, fn: Callable[[Session], Any], default: Any = None) -> Any:
+    session = app.state.db.session()
+    try:
+        result = fn(session)
+        session.commit()
+        return result
+    except Exception:
+        session.rollback()
+        logger.warning("Worker bookkeeping call failed", exc_info=True)
+        return default
+    finally:
+        session.close()
 
-def run_worker(*, once: bool = False, max_jobs: int | None = None) -> int:
-    app = create_app()
-    processed = 0
 
-    while True:
-        session = app.state.db.session()
-        did_work = False
-        try:
-            app.state.job_service.complete_stale_leases(session, app.state.settings.worker_name)
-            job = app.state.job_service.process_next(session, app.state.settings.worker_name)
-            if job:
-                did_work = True
-                processed += 1
+def _run_leased_job(app: FastAPI, job_id: str, worker_name: str, prefetched_job_ids: list[str]) -> bool:
+    job_service = app.state.job_service
+    # Commit the attempt start first so heartbeats from a separate session can renew the lease
+    # without waiting on the job's own transaction.
+    attempt_id = _in_session(app, lambda s: job_service.begin_leased(s, job_id, worker_name))
+    if attempt_id is None:
+        return False
+
+    session = app.state.db.session()
+    try:
+        with JobHeartbeat(
+            db=app.state.db,
+            job_service=job_service,
+            job_id=job_id,
+            worker_name=worker_name,
+            interval_seconds=app.state.settings.worker_heartbeat_seconds,
+            prefetched_job_ids=prefetched_job_ids,
+        ) as heartbeat:
+            job = job_service.execute_leased(session, job_id, worker_name, attempt_id=attempt_id)
+            heartbeat.stop()
             session.commit()
-        except Exception:
-            session.rollback()
-        finally:
-            session.close()
+        return job is not None
+    except Exception:
+        session.rollback()
+        logger.exception("Worker %s failed to run job %s", worker_name, job_id)
+        return False
+    finally:
+        session.close()
+
+
+def _worker_loop(
+    app: FastAPI,
+    worker_name: str,
+    *,
+    once: bool,
+    budget: _JobBudget,
+    prefetch: int,
+    queues: list[str] | None = None,
+) -> None:
+    job_service = app.state.job_service
+    settings = app.state.settings
+    renew_interval = max(settings.worker_lease_seconds / 2.0, 0.1)
+    buffer: deque[str] = deque()
+    last_stale_sweep = float("-inf")
+    last_renewal = time.monotonic()
+    listener = app.state.job_wakeup.listener(app.state.db.engine)
+    # With a wakeup channel the poll is only a safety net, so idle workers can back off much further.
+    idle_cap = settings.worker_idle_max_seconds if listener.wakes_on_submit else settings.worker_poll_seconds
+    idle_delay = IDLE_BACKOFF_START_SECONDS
+
+    try:
+        while True:
+            now = time.monotonic()
+            if now - last_stale_sweep >= settings.worker_stale_recovery_seconds:
+                _in_session(app, lambda s: job_service.complete_stale_leases(s, worker_name))
+                _in_session(app, job_service.schedule_retention)
+                last_stale_sweep = now
+
+            if not buffer:
+                granted = budget.reserve(1 if once else prefetch)
+                if not granted:
+                    break
+                leased = _in_session(
+                    app,
+                    lambda s, granted=granted: [
+                        job.id for job in job_service.lease_batch(s, worker_name, limit=granted, queues=queues)
+                    ],
+                    default=[],
+                )
+                budget.release(granted - len(leased))
+                buffer.extend(leased)
+                last_renewal = time.monotonic()
+            elif now - last_renewal >= renew_interval:
+                pending = list(buffer)
+                _in_session(app, lambda s, pending=pending: job_service.renew_leases(s, worker_name, pending))
+                last_renewal = now
+
+            did_work = False
+            if buffer:
+                job_id = buffer.popleft()
+                did_work = _run_leased_job(app, job_id, worker_name, list(buffer))
+                budget.settle(did_work=did_work)
+
+            if once:
+                break
+            if budget.exhausted():
+                # Wake sibling slots parked on the channel so they notice the budget is spent.
+                app.state.job_wakeup.signal()
+                break
+            if did_work or buffer:
+                idle_delay = IDLE_BACKOFF_START_SECONDS
+                continue
+
+            timeout = idle_delay
+            due_in = _in_session(app, lambda s: job_service.seconds_until_next_due(s, queues))
+            if due_in is not None:
+                timeout = max(min(timeout, due_in), IDLE_BACKOFF_START_SECONDS)
+            if listener.wait(timeout):
+                idle_delay = IDLE_BACKOFF_START_SECONDS
+            else:
+                idle_delay = min(idle_delay * 2, max(idle_cap, IDLE_BACKOFF_START_SECONDS))
+    finally:
+        listener.close()
+        if buffer:
+            pending = list(buffer)
+            _in_session(app, lambda s: job_service.release_leases(s, worker_name, pending))
+            budget.release(len(pending))
+
+
+def run_worker(
+    *,
+    once: bool = False,
+    max_jobs: int | None = None,
+    concurrency: int = 1,
+    prefetch: int | None = None,
+    queues: list[str] | None = None,
+    app: FastAPI | None = None,
+) -> int:
+    app = app or create_app()
+    budget = _JobBudget(max_jobs)
+    worker_name = app.state.settings.worker_name
+    concurrency = max(int(concurrency), 1)
+    prefetch = max(int(prefetch if prefetch is not None else app.state.settings.worker_prefetch_count), 1)
+    queues = list(queues or app.state.settings.worker_queues) or None
 
-        if once:
-            break
-        if max_jobs is not None and processed >= max_jobs:
-            break
-        if not did_work:
-            time.sleep(max(app.state.settings.worker_poll_seconds, 0.1))
+    if concurrency == 1:
+        _worker_loop(app, worker_name, once=once, budget=budget, prefetch=prefetch, queues=queues)
+        return budget.processed
 
-    return processed
+    # Each slot leases under its own name so lease ownership stays attributable per thread.
+    threads = [
+        threading.Thread(
+            target=_worker_loop,
+            args=(app, f"{worker_name}-{slot}"),
+            kwargs={"once": once, "budget": budget, "prefetch": prefetch, "queues": queues},
+            name=f"{worker_name}-{slot}",
+            daemon=True,
+        )
+        for slot in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return budget.processed
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Nexus Babel async worker")
     parser.add_argument("--once", action="store_true", help="Process at most one eligible job and exit")
     parser.add_argument("--max-jobs", type=int, default=None, help="Exit after processing N jobs")
+    parser.add_argument("--concurrency", type=int, default=1, help="Run N jobs in parallel worker threads")
+    parser.add_argument("--prefetch", type=int, default=None, help="Lease up to K jobs per queue round trip")
+    parser.add_argument("--queues", default=None, help="Comma-separated job queues to consume (default: all)")
     args = parser.parse_args()
-    processed = run_worker(once=args.once, max_jobs=args.max_jobs)
+    queues = [q.strip() for q in args.queues.split(",") if q.strip()] if args.queues else None
+    processed = run_worker(
+        once=args.once,
+        max_jobs=args.max_jobs,
+        concurrency=args.concurrency,
+        prefetch=args.prefetch,
+        queues=queues,
+    )
     print(f"processed_jobs={processed}")
 
 
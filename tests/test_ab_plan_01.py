@@ -8,9 +8,11 @@
 import sys
 from types import ModuleType
 
-from sqlalchemy import select
+from sqlalchemy import func, inspect, select
 
 from nexus_babel.models import Atom, IngestJob, RemixArtifact
+from nexus_babel.services.remix_context import iter_atom_rows, resolve_context
+from nexus_babel.services.remix_types import AtomRow
 from nexus_babel.services.seed_corpus import load_ingest_profile
 from nexus_babel.services.text_utils import ATOM_FILENAME_SCHEMA_VERSION
 
@@ -226,6 +228,162 @@ def test_ab01_t006_remix_persistence_and_retrieval_contract(client, auth_headers
         session.close()
 
 
+def test_remix_compose_reuses_results_of_identical_requests(client, auth_headers, tmp_path: Path):
+    left_id, right_id = _ingest_two_texts_for_remix(client, auth_headers, tmp_path)
+    req = {
+        "source_document_id": left_id,
+        "target_document_id": right_id,
+        "strategy": "thematic_blend",
+        "seed": 5,
+        "atom_levels": ["word"],
+        "create_branch": False,
+        "persist_artifact": False,
+    }
+
+    def _compose(**overrides):
+        response = client.post("/api/v1/remix/compose", headers=auth_headers["operator"], json={**req, **overrides})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    cold, warm = _compose(), _compose()
+    assert (cold["cache_hit"], warm["cache_hit"]) == (False, True)
+    assert warm["remixed_text"] == cold["remixed_text"]
+    assert warm["payload_hash"] == cold["payload_hash"]
+    assert warm["source_atom_refs"] == cold["source_atom_refs"]
+    assert _compose(seed=6)["cache_hit"] is False
+
+    persisted = _compose(persist_artifact=True)
+    assert persisted["cache_hit"] is False
+    again = _compose(persist_artifact=True)
+    assert again["cache_hit"] is True
+    assert again["remix_artifact_id"] == persisted["remix_artifact_id"]
+    assert again["governance_decision_id"] == persisted["governance_decision_id"]
+    assert again["source_atom_refs"] == persisted["source_atom_refs"]
+    assert again["new_branch_id"] is None
+
+    # The reused artifact had no branch yet: one is created and attached, then returned on later hits.
+    branched = _compose(persist_artifact=True, create_branch=True)
+    assert branched["cache_hit"] is True
+    assert branched["remix_artifact_id"] == persisted["remix_artifact_id"]
+    assert branched["new_branch_id"]
+    assert _compose(persist_artifact=True, create_branch=True)["new_branch_id"] == branched["new_branch_id"]
+    fresh_branches = {_compose(create_branch=True)["new_branch_id"] for _ in range(2)}
+    assert len(fresh_branches) == 2
+
+    session = client.app.state.db.session()
+    try:
+        artifacts = session.scalars(select(RemixArtifact)).all()
+        assert [artifact.id for artifact in artifacts] == [persisted["remix_artifact_id"]]
+        assert artifacts[0].branch_id == branched["new_branch_id"]
+        assert artifacts[0].create_branch is True
+        assert artifacts[0].request_key
+        assert "request_key" not in artifacts[0].artifact_metadata
+    finally:
+        session.close()
+
+    stats = client.app.state.remix_service.result_cache.stats()
+    assert (stats["hits"], stats["artifact_hits"], stats["misses"]) == (6, 3, 3)
+    counters = client.get("/metrics").json()["counters"]
+    assert counters["remix.compose.cache_hit"] == 6
+    assert counters["remix.compose.cache_miss"] == 3
+
+
+def test_remix_context_streams_projected_atom_rows_in_index_order(client, auth_headers, tmp_path: Path):
+    left_id, _ = _ingest_two_texts_for_remix(client, auth_headers, tmp_path)
+    session = client.app.state.db.session()
+    try:
+        expected = session.scalars(
+            select(Atom)
+            .where(Atom.document_id == left_id, Atom.atom_level.in_(["word", "glyph-seed"]))
+            .order_by(Atom.atom_level, Atom.ordinal, Atom.id)
+        ).all()
+        rows = list(iter_atom_rows(session, left_id, ["word", "glyph-seed"], batch_size=3))
+        assert {row.atom_level for row in rows} == {"word", "glyph-seed"}
+        assert all(type(row) is AtomRow for row in rows)
+        assert rows == [(atom.id, atom.atom_level, atom.ordinal, atom.content) for atom in expected]
+
+        ctx = resolve_context(
+            session=session, role="source", document_id=left_id, branch_id=None, atom_levels=["word", "no-such-level"]
+        )
+        assert ctx["atom_levels"] == ["word"]
+        assert list(ctx["atom_rows"]("word")) == [row for row in rows if row.atom_level == "word"]
+        assert list(ctx["atom_rows"]("no-such-level")) == []
+
+        indexes = {index["name"]: index["column_names"] for index in inspect(session.get_bind()).get_indexes("atoms")}
+        assert indexes["ix_atoms_document_level_ordinal"] == ["document_id", "atom_level", "ordinal"]
+    finally:
+        session.close()
+
+
+def test_remix_sweep_matches_compose_and_reuses_artifacts(client, auth_headers, tmp_path: Path):
+    left_id, right_id = _ingest_two_texts_for_remix(client, auth_headers, tmp_path)
+    ids = {"source_document_id": left_id, "target_document_id": right_id, "atom_levels": ["word"]}
+
+    def _compose(strategy: str, seed: int, **overrides):
+        response = client.post(
+            "/api/v1/remix/compose",
+            headers=auth_headers["operator"],
+            json={**ids, "strategy": strategy, "seed": seed, "create_branch": False, **overrides},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    earlier = _compose("thematic_blend", 2)
+    sweep = client.post(
+        "/api/v1/remix/sweep",
+        headers=auth_headers["operator"],
+        json={**ids, "strategies": ["interleave", "thematic_blend"], "seeds": [1, 2, 3, 2], "include_results": True},
+    )
+    assert sweep.status_code == 200, sweep.text
+    body = sweep.json()
+    summary = body["summary"]
+    assert body["status"] == "completed" and body["job_id"] is None
+    assert (summary["combination_count"], summary["seed_count"], summary["persisted"], summary["reused"]) == (6, 3, 5, 1)
+    assert summary["allowed"] == 6
+    assert set(summary["by_strategy"]) == {"interleave", "thematic_blend"}
+    assert summary["distinct_text_count"] == len({row["text_hash"] for row in body["results"]})
+
+    results = {(row["strategy"], row["seed"]): row for row in body["results"]}
+    assert len(results) == 6
+    reused = results[("thematic_blend", 2)]
+    assert reused["reused"] is True
+    assert reused["remix_artifact_id"] == earlier["remix_artifact_id"]
+    for (strategy, seed), row in results.items():
+        single = _compose(strategy, seed, persist_artifact=False)
+        assert (row["remixed_text"], row["text_hash"], row["payload_hash"]) == (
+            single["remixed_text"],
+            single["text_hash"],
+            single["payload_hash"],
+        )
+
+    # Sweep artifacts carry compose's request keys, so compose reuses them.
+    again = _compose("interleave", 3)
+    assert again["cache_hit"] is True
+    assert again["remix_artifact_id"] == results[("interleave", 3)]["remix_artifact_id"]
+    artifact = client.get(f"/api/v1/remix/{again['remix_artifact_id']}", headers=auth_headers["viewer"]).json()
+    assert artifact["branch_id"] is None
+    assert {link["role"]: link["atom_level"] for link in artifact["source_links"]} == {"source": "word", "target": "word"}
+
+    rerun = client.post(
+        "/api/v1/remix/sweep",
+        headers=auth_headers["operator"],
+        json={**ids, "strategies": ["interleave", "thematic_blend"], "seeds": [1, 2, 3]},
+    ).json()
+    assert (rerun["summary"]["persisted"], rerun["summary"]["reused"], rerun["results"]) == (0, 6, [])
+    session = client.app.state.db.session()
+    try:
+        assert session.scalar(select(func.count(RemixArtifact.id))) == 6
+    finally:
+        session.close()
+
+    too_many = client.post(
+        "/api/v1/remix/sweep",
+        headers=auth_headers["operator"],
+        json={**ids, "strategies": ["interleave"], "seeds": list(range(10_001)), "execution_mode": "async"},
+    )
+    assert too_many.status_code == 400
+
+
 def test_ab01_t006_alembic_upgrade_downgrade_contract(tmp_path: Path):
     repo_root = _repo_root()
     db_path = tmp_path / "ab01_t006_migrate.db"
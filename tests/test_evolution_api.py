@@ -5,9 +5,13 @@
 
 import pytest
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, event, func, select
 
-from nexus_babel.models import Branch, BranchEvent, Document
+from nexus_babel.models import Branch, BranchAncestry, BranchCheckpoint, BranchEvent, Document
+from nexus_babel.services import evolution_ancestry, evolution_replay
+from nexus_babel.services.evolution import EvolutionService
+from nexus_babel.services.evolution_checkpoints import CheckpointPolicy
+from nexus_babel.services.evolution_text import TextLRUCache
 
 
 def _ingest_one(client, sample_corpus, headers) -> str:
@@ -338,6 +342,285 @@ def _slow_apply(text: str, event_type: str, event_payload: dict):
     assert checkpoint_elapsed < full_elapsed
 
 
+def test_lineage_and_event_counts_resolve_in_one_query(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    service = client.app.state.evolution_service
+
+    chain: list[str] = []
+    for seed in range(6):
+        chain.append(
+            _evolve(
+                client,
+                auth_headers["operator"],
+                root_document_id=doc_id if not chain else None,
+                parent_branch_id=chain[-1] if chain else None,
+                event_type="natural_drift",
+                event_payload={"seed": seed},
+            )
+        )
+
+    engine = client.app.state.db.engine
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _params, _context, _executemany):
+        statements.append(statement)
+
+    session = client.app.state.db.session()
+    try:
+        tip = session.scalar(select(Branch).where(Branch.id == chain[-1]))
+        assert tip is not None
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            lineage_nodes = service._lineage(session, tip)
+            lineage_statements = len(statements)
+            event_count = service._lineage_event_count(session, tip)
+            count_statements = len(statements) - lineage_statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        # Custom lineage hooks are still honoured.
+        assert evolution_replay.lineage_event_count(session, tip, lineage_fn=lambda _s, _b: lineage_nodes[-2:]) == 2
+    finally:
+        session.close()
+
+    assert [node.id for node in lineage_nodes] == chain
+    assert event_count == 6
+    assert lineage_statements == 1
+    assert count_statements == 1
+
+
+def test_branch_ancestry_closure_answers_lca_depth_and_descendants(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    root = _evolve(client, headers, root_document_id=doc_id, event_type="natural_drift", event_payload={"seed": 1})
+    trunk = _evolve(client, headers, parent_branch_id=root, event_type="natural_drift", event_payload={"seed": 2})
+    left = _evolve(client, headers, parent_branch_id=trunk, event_type="natural_drift", event_payload={"seed": 3})
+    right = _evolve(client, headers, parent_branch_id=trunk, event_type="reverse_drift", event_payload={"seed": 4})
+    right_tip = _evolve(client, headers, parent_branch_id=right, event_type="natural_drift", event_payload={"seed": 5})
+
+    session = client.app.state.db.session()
+    try:
+        assert evolution_ancestry.find_lca(session, left, right_tip).id == trunk
+        assert evolution_ancestry.is_ancestor(session, root, right_tip)
+        assert not evolution_ancestry.is_ancestor(session, left, right_tip)
+        assert evolution_ancestry.lineage_depth(session, right_tip) == 4
+        assert evolution_ancestry.descendant_ids(session, trunk) == sorted([left, right]) + [right_tip]
+        assert [node.id for node in evolution_ancestry.ancestors(session, right_tip)] == [root, trunk, right, right_tip]
+
+        # Branches that predate the closure table are indexed lazily from their lineage.
+        session.execute(delete(BranchAncestry))
+        evolution_ancestry.ensure_ancestry(session, right_tip)
+        assert evolution_ancestry.lineage_depth(session, right_tip) == 4
+        assert evolution_ancestry.lineage_depth(session, left) == 0
+        lca = client.app.state.evolution_service._find_lca(
+            session,
+            session.get(Branch, left),
+            session.get(Branch, right_tip),
+        )
+        assert lca is not None and lca.id == trunk
+        session.rollback()
+    finally:
+        session.close()
+
+
+def test_branch_text_is_delta_encoded_and_materializes_identically(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    service = client.app.state.evolution_service
+
+    event_cycle = [
+        ("natural_drift", {}),
+        ("glyph_fusion", {"left": "t", "right": "h", "fused": "þ"}),
+        ("synthetic_mutation", {"mutation_rate": 0.05}),
+        ("phase_shift", {"phase": "peak"}),
+    ]
+    chain: list[str] = []
+    for seed in range(12):
+        event_type, payload = event_cycle[seed % len(event_cycle)]
+        chain.append(
+            _evolve(
+                client,
+                headers,
+                root_document_id=doc_id if not chain else None,
+                parent_branch_id=chain[-1] if chain else None,
+                event_type=event_type,
+                event_payload={**payload, "seed": seed},
+            )
+        )
+
+    session = client.app.state.db.session()
+    try:
+        branches = [session.get(Branch, branch_id) for branch_id in chain]
+        assert "current_text" in branches[0].state_snapshot
+        assert branches[9].state_snapshot["text_delta"]["op"] == "checkpoint"
+        assert all("current_text" not in node.state_snapshot for node in branches[1:])
+
+        warm = [service.branch_text(session, node) for node in branches]
+        service.text_cache.clear()
+        cold = [service.branch_text(session, node) for node in branches]
+        replayed = [service._replay_lineage_text(session, node, use_checkpoints=False)[0] for node in branches]
+    finally:
+        session.close()
+
+    assert warm == cold == replayed
+    for node, text in zip(branches, replayed):
+        assert node.state_snapshot["text_hash"] == hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_replay_cache_serves_repeat_timelines_and_persists(client, sample_corpus, auth_headers, monkeypatch, tmp_path):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    service = client.app.state.evolution_service
+
+    tip = None
+    for seed in range(4):
+        tip = _evolve(
+            client,
+            headers,
+            root_document_id=doc_id if tip is None else None,
+            parent_branch_id=tip,
+            event_type="natural_drift",
+            event_payload={"seed": seed},
+        )
+
+    first = client.get(f"/api/v1/branches/{tip}/timeline", headers=auth_headers["viewer"])
+    assert first.status_code == 200, first.text
+
+    calls = {"apply": 0}
+    original_apply = service._apply_event
+
+    def _counting_apply(text: str, event_type: str, event_payload: dict):
+        calls["apply"] += 1
+        return original_apply(text, event_type, event_payload)
+
+    monkeypatch.setattr(service, "_apply_event", _counting_apply)
+    hits_before = service.replay_cache.hits
+    second = client.get(f"/api/v1/branches/{tip}/timeline", headers=auth_headers["viewer"])
+    replay = client.post(f"/api/v1/branches/{tip}/replay", headers=auth_headers["viewer"])
+    assert second.status_code == 200 and replay.status_code == 200
+    assert second.json()["replay_snapshot"] == first.json()["replay_snapshot"]
+    assert replay.json()["text_hash"] == first.json()["replay_snapshot"]["text_hash"]
+    assert calls["apply"] == 0
+    assert service.replay_cache.hits == hits_before + 2
+
+    # Hits for replay and compare are served before the lineage or its events are read.
+    def _no_lineage(*_args, **_kwargs):
+        raise AssertionError("lineage walked on a replay cache hit")
+
+    monkeypatch.setattr(service, "_lineage", _no_lineage)
+    monkeypatch.setattr(service, "_collect_lineage_events", _no_lineage)
+    monkeypatch.setattr(service, "_lineage_overridden", lambda: False)
+    assert client.post(f"/api/v1/branches/{tip}/replay", headers=auth_headers["viewer"]).status_code == 200
+    compare = client.get(f"/api/v1/branches/{tip}/compare/{tip}", headers=auth_headers["viewer"])
+    assert compare.status_code == 200, compare.text
+    assert compare.json()["same"] is True
+    monkeypatch.undo()
+    monkeypatch.setattr(service, "_apply_event", _counting_apply)
+
+    session = client.app.state.db.session()
+    try:
+        branch = session.get(Branch, tip)
+        writer = EvolutionService()
+        writer.replay_cache = TextLRUCache(persist_dir=tmp_path)
+        text, _, _ = writer._replay_lineage_text(session, branch)
+
+        reader = EvolutionService()
+        reader.replay_cache = TextLRUCache(persist_dir=tmp_path)
+        monkeypatch.setattr(reader, "_apply_event", _counting_apply)
+        assert reader._replay_lineage_text(session, branch)[0] == text
+    finally:
+        session.close()
+    assert calls["apply"] == 0
+
+
+def test_checkpoints_follow_replay_cost_not_a_fixed_interval(client, sample_corpus, auth_headers, monkeypatch):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    service = client.app.state.evolution_service
+    monkeypatch.setattr(
+        service,
+        "checkpoint_policy",
+        CheckpointPolicy(target_replay_ms=100.0, max_events=50, event_cost_ms_per_mchar={"natural_drift": 1e9, "glyph_fusion": 0.0}),
+    )
+
+    sequence = ["glyph_fusion", "glyph_fusion", "glyph_fusion", "natural_drift", "glyph_fusion", "glyph_fusion"]
+    chain: list[str] = []
+    for seed, event_type in enumerate(sequence):
+        chain.append(
+            _evolve(
+                client,
+                headers,
+                root_document_id=doc_id if not chain else None,
+                parent_branch_id=chain[-1] if chain else None,
+                event_type=event_type,
+                event_payload={"seed": seed},
+            )
+        )
+
+    session = client.app.state.db.session()
+    try:
+        checkpoints = session.scalars(select(BranchCheckpoint).where(BranchCheckpoint.branch_id.in_(chain))).all()
+        assert [(checkpoint.branch_id, checkpoint.event_index) for checkpoint in checkpoints] == [(chain[3], 4)]
+        tip = session.get(Branch, chain[-1])
+        assert tip.state_snapshot["replay_debt"]["events"] == 2
+        full_text, _, _ = service._replay_lineage_text(session, tip, use_checkpoints=False)
+        service.replay_cache.clear()
+        checkpoint_text, _, _ = service._replay_lineage_text(session, tip, use_checkpoints=True)
+    finally:
+        session.close()
+    assert checkpoint_text == full_text
+
+
+def test_multi_evolve_batched_chain_matches_sequential_evolution(client, sample_corpus, auth_headers, monkeypatch):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    service = client.app.state.evolution_service
+    # Measured apply time never decides a checkpoint here, so both paths place them identically.
+    monkeypatch.setattr(service, "checkpoint_policy", CheckpointPolicy(target_replay_ms=1e9, max_events=3))
+
+    events = [
+        {"event_type": event_type, "event_payload": {"seed": seed}}
+        for seed, event_type in enumerate(["natural_drift", "synthetic_mutation", "phase_shift", "reverse_drift"] * 3)
+    ]
+    root = _evolve(client, headers, root_document_id=doc_id, event_type="glyph_fusion", event_payload={"seed": 0})
+    response = client.post(
+        "/api/v1/evolve/multi",
+        headers=headers,
+        json={"parent_branch_id": root, "mode": "PUBLIC", "events": events},
+    )
+    assert response.status_code == 200, response.text
+    batched = response.json()["branch_ids"]
+
+    sequential = [root]
+    for item in events:
+        sequential.append(_evolve(client, headers, parent_branch_id=sequential[-1], **item))
+    sequential = sequential[1:]
+
+    session = client.app.state.db.session()
+    try:
+        def chain_state(chain):
+            branches = [session.get(Branch, branch_id) for branch_id in chain]
+            checkpoints = session.scalars(select(BranchCheckpoint).where(BranchCheckpoint.branch_id.in_(chain))).all()
+            return (
+                [branch.state_snapshot["text_hash"] for branch in branches],
+                [branch.branch_version for branch in branches],
+                sorted(checkpoint.event_index for checkpoint in checkpoints),
+            )
+
+        assert chain_state(batched) == chain_state(sequential)
+        assert chain_state(batched)[2] == [3, 6, 9, 12]
+        tip = session.get(Branch, batched[-1])
+        assert [branch.id for branch in evolution_ancestry.ancestors(session, tip.id)] == [root, *batched]
+        assert evolution_ancestry.lineage_depth(session, tip.id) == len(events) + 1
+        service.text_cache.clear()
+        service.replay_cache.clear()
+        replayed, _, _ = service._replay_lineage_text(session, tip, use_checkpoints=False)
+        assert service.branch_text(session, tip) == replayed
+        assert hashlib.sha256(replayed.encode("utf-8")).hexdigest() == tip.state_snapshot["text_hash"]
+    finally:
+        session.close()
+
+
 def test_branch_merge_interleave(client, sample_corpus, auth_headers):
     doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
     left_branch = _evolve(
@@ -443,6 +726,13 @@ def test_branch_visualization_includes_merge_secondary_parent_edges(client, samp
     assert merge_resp.status_code == 200, merge_resp.text
     merged_branch_id = merge_resp.json()["new_branch_id"]
 
+    session = client.app.state.db.session()
+    try:
+        merge_event = session.scalar(select(BranchEvent).where(BranchEvent.branch_id == merged_branch_id))
+        assert merge_event.merge_right_branch_id == right_tip
+    finally:
+        session.close()
+
     viz_resp = client.get(f"/api/v1/branches/{merged_branch_id}/visualization", headers=auth_headers["viewer"])
     assert viz_resp.status_code == 200, viz_resp.text
     payload = viz_resp.json()
@@ -460,6 +750,151 @@ def test_branch_visualization_includes_merge_secondary_parent_edges(client, samp
     )
 
 
+def test_branch_visualization_bulk_loads_cached_paged_and_depth_limited(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    service = client.app.state.evolution_service
+
+    def _merge(left, right):
+        response = client.post(
+            "/api/v1/branches/merge",
+            headers=headers,
+            json={"left_branch_id": left, "right_branch_id": right, "strategy": "interleave", "mode": "PUBLIC"},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["new_branch_id"]
+
+    left = _evolve(client, headers, root_document_id=doc_id, event_type="natural_drift", event_payload={"seed": 1})
+    left = _evolve(client, headers, parent_branch_id=left, event_type="phase_shift", event_payload={"phase": "peak", "seed": 2})
+    right = _evolve(client, headers, root_document_id=doc_id, event_type="reverse_drift", event_payload={"seed": 3})
+    side = _evolve(client, headers, root_document_id=doc_id, event_type="glyph_fusion", event_payload={"seed": 4})
+    side = _evolve(client, headers, parent_branch_id=side, event_type="natural_drift", event_payload={"seed": 5})
+    inner_merge = _merge(left, right)
+    outer_merge = _merge(inner_merge, side)
+    tip = _evolve(client, headers, parent_branch_id=outer_merge, event_type="glyph_fusion", event_payload={"seed": 6})
+
+    engine = client.app.state.db.engine
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _params, _context, _executemany):
+        statements.append(statement)
+
+    session = client.app.state.db.session()
+    try:
+        tip_branch = session.get(Branch, tip)
+        reference = service._walk_visualization_graph(session, tip_branch)
+        service.visualization_cache.clear()
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            graph = service.get_visualization(session, tip)
+            cold_statements = len(statements)
+            cached = service.get_visualization(session, tip)
+            warm_statements = len(statements) - cold_statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert graph["nodes"] == reference["nodes"]
+        assert graph["edges"] == reference["edges"]
+        assert graph["summary"] == reference["summary"]
+        assert graph["summary"]["secondary_lineage_branch_count"] == 3
+        assert graph["summary"]["merge_secondary_edge_count"] == 2
+        assert graph["total"] == 8
+        assert cold_statements == 5
+        assert warm_statements == 3
+        assert cached["nodes"] == graph["nodes"]
+        assert service.visualization_cache.hits == 1
+
+        limited = service.get_visualization(session, tip, max_depth=1)
+        assert {node["branch_id"] for node in limited["nodes"]} == {tip, outer_merge}
+        assert limited["summary"]["depth_truncated"] is True
+        assert limited["summary"]["lineage_depth"] == 2
+        assert service.get_visualization(session, tip, max_depth=10)["summary"]["depth_truncated"] is False
+
+        pages = [service.get_visualization(session, tip, offset=offset, limit=3) for offset in (0, 3, 6)]
+        assert [node for page in pages for node in page["nodes"]] == graph["nodes"]
+        assert sorted(edge["id"] for page in pages for edge in page["edges"]) == sorted(edge["id"] for edge in graph["edges"])
+        assert all(page["total"] == 8 and page["limit"] == 3 for page in pages)
+    finally:
+        session.close()
+
+    response = client.get(f"/api/v1/branches/{tip}/visualization?max_depth=1&limit=1", headers=auth_headers["viewer"])
+    assert response.status_code == 200, response.text
+    assert len(response.json()["nodes"]) == 1
+    assert response.json()["summary"]["depth_truncated"] is True
+
+
+def test_compare_and_merge_diff_full_texts_past_the_preview(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    base_text = " ".join(f"verse{index} of the long song" for index in range(200))
+    changed_at = base_text.index("verse150 ")
+    variant_text = base_text[:changed_at] + "VERSE150" + base_text[changed_at + len("verse150") :]
+    assert base_text[:500] == variant_text[:500]
+
+    left = _evolve(client, headers, root_document_id=doc_id, event_type="remix", event_payload={"remixed_text": base_text})
+    right = _evolve(client, headers, root_document_id=doc_id, event_type="remix", event_payload={"remixed_text": variant_text})
+
+    response = client.get(f"/api/v1/branches/{left}/compare/{right}", headers=auth_headers["viewer"])
+    assert response.status_code == 200, response.text
+    payload = response.json()
+    assert payload["same"] is False
+    assert payload["preview_left"] == payload["preview_right"]
+    assert payload["distance"] == 5
+    assert payload["distance_exact"] is True
+    assert payload["diff"]["hunk_count"] == 1
+    assert payload["diff"]["changed_spans"] == [
+        {
+            "left_start": changed_at,
+            "left_end": changed_at + len("verse150"),
+            "right_start": changed_at,
+            "right_end": changed_at + len("VERSE150"),
+            "left_text": "verse150",
+            "right_text": "VERSE150",
+        }
+    ]
+
+    merge = client.post(
+        "/api/v1/branches/merge",
+        headers=headers,
+        json={"left_branch_id": left, "right_branch_id": right, "strategy": "left_wins", "mode": "PUBLIC"},
+    )
+    assert merge.status_code == 200, merge.text
+    conflict_semantics = merge.json()["conflict_semantics"]
+    assert conflict_semantics["edit_distance"] == 5
+    assert conflict_semantics["conflict_region_count"] == 1
+    assert conflict_semantics["conflict_regions"][0]["right_text"] == "VERSE150"
+
+
+def test_three_way_merge_applies_both_sides_against_the_common_ancestor(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    base_text = "the fox jumps over the lazy dog. the bird sings at dawn."
+    root = _evolve(client, headers, root_document_id=doc_id, event_type="remix", event_payload={"remixed_text": base_text})
+    left = _evolve(
+        client, headers, parent_branch_id=root, event_type="remix", event_payload={"remixed_text": base_text.replace("fox", "red fox")}
+    )
+    right = _evolve(
+        client, headers, parent_branch_id=root, event_type="remix", event_payload={"remixed_text": base_text.replace("dawn", "dusk")}
+    )
+
+    merge = client.post(
+        "/api/v1/branches/merge",
+        headers=headers,
+        json={"left_branch_id": left, "right_branch_id": right, "strategy": "three_way", "mode": "PUBLIC"},
+    )
+    assert merge.status_code == 200, merge.text
+    payload = merge.json()
+    assert payload["lca_branch_id"] == root
+    assert payload["conflict_semantics"]["resolution"] == "three_way_clean"
+    assert payload["conflict_semantics"]["three_way"]["conflict_hunk_count"] == 0
+    assert payload["conflict_semantics"]["drops_non_selected_input"] is False
+
+    replay = client.post(f"/api/v1/branches/{payload['new_branch_id']}/replay", headers=auth_headers["viewer"])
+    assert replay.status_code == 200, replay.text
+    merged_text = base_text.replace("fox", "red fox").replace("dawn", "dusk")
+    assert replay.json()["text_hash"] == hashlib.sha256(merged_text.encode("utf-8")).hexdigest()
+
+
 def test_branch_merge_requires_operator(client, sample_corpus, auth_headers):
     doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
     left_branch = _evolve(
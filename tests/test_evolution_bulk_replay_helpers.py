@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import hashlib
+
+from nexus_babel.services.evolution_bulk_replay import ReplayUnit, replay_unit
+from nexus_babel.services.evolution_types import DriftResult
+
+
+def _append(text: str, event_type: str, payload: dict) -> DriftResult:
+    return DriftResult(f"{text}{payload['suffix']}", {"event": event_type})
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_replay_unit_replays_each_node_from_its_parent_text():
+    unit = ReplayUnit(
+        start_text="base",
+        nodes=[
+            ("a", "outside", [("append", {"suffix": "-a"})]),
+            ("b", "a", [("append", {"suffix": "-b"}), ("append", {"suffix": "!"})]),
+            ("c", "b", [("append", {"suffix": "-c"})]),
+            ("d", "a", [("append", {"suffix": "-d"})]),
+            ("e", "d", []),
+        ],
+    )
+
+    hashes = replay_unit(unit, _append)
+
+    assert hashes == {
+        "a": _hash("base-a"),
+        "b": _hash("base-a-b!"),
+        "c": _hash("base-a-b!-c"),
+        "d": _hash("base-a-d"),
+        "e": _hash("base-a-d"),
+    }
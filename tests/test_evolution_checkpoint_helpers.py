@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from nexus_babel.services.evolution_checkpoints import CheckpointPolicy
+
+
+def test_checkpoint_policy_triggers_on_replay_cost_or_event_count():
+    policy = CheckpointPolicy(target_replay_ms=50.0, max_events=4)
+    debt = {"events": 0, "cost_ms": 0.0}
+    debt = policy.next_debt(debt, 10.0)
+    assert debt == {"events": 1, "cost_ms": 10.0}
+    assert not policy.should_checkpoint(debt)
+    assert policy.should_checkpoint(policy.next_debt(debt, 45.0))
+
+    cheap = {"events": 3, "cost_ms": 0.3}
+    assert policy.should_checkpoint(policy.next_debt(cheap, 0.1))
+
+
+def test_checkpoint_policy_cost_floor_scales_with_text_size_and_event_type():
+    policy = CheckpointPolicy()
+    assert policy.event_cost_ms("natural_drift", 1_000_000, 1.0) == 500.0
+    assert policy.event_cost_ms("merge", 1_000_000, 7.5) == 7.5
+    assert policy.event_cost_ms("unknown_event", 500_000, 0.0) == 50.0
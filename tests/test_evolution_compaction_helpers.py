@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from nexus_babel.services.evolution_compaction import BranchRow, SquashChain, plan_squash_chains
+
+
+def _rows(*specs: tuple[str, str | None, str, bool]) -> list[BranchRow]:
+    return [BranchRow(id=branch_id, parent_id=parent_id, mode=mode, expired=expired) for branch_id, parent_id, mode, expired in specs]
+
+
+def test_plan_squash_chains_stops_at_forks_references_modes_and_fresh_branches():
+    rows = _rows(
+        ("a1", None, "PUBLIC", True),
+        ("a2", "a1", "PUBLIC", True),
+        ("a3", "a2", "PUBLIC", True),
+        ("a4", "a3", "PUBLIC", True),
+        # a4 forks, so it is the tip of a1..a3.
+        ("b1", "a4", "PUBLIC", True),
+        ("b2", "b1", "PUBLIC", True),
+        ("b3", "b2", "RAW", True),
+        ("b4", "b3", "RAW", True),
+        ("b5", "b4", "RAW", True),
+        ("c1", "a4", "PUBLIC", True),
+        ("c2", "c1", "PUBLIC", True),
+        ("c3", "c2", "PUBLIC", False),
+        ("c4", "c3", "PUBLIC", True),
+    )
+
+    chains = plan_squash_chains(rows, protected=set(), min_chain_length=3)
+
+    assert chains == [
+        SquashChain(branch_ids=("a1", "a2", "a3"), tip_id="a4"),
+        # The mode change makes b2 the tip; b3 starts a RAW run of its own.
+        SquashChain(branch_ids=("b3", "b4"), tip_id="b5"),
+        SquashChain(branch_ids=("c1", "c2"), tip_id="c3"),
+    ]
+    # A referenced branch is never folded away, so it splits the run around it.
+    assert plan_squash_chains(rows, protected={"a2"}, min_chain_length=2)[:3] == [
+        SquashChain(branch_ids=("a1",), tip_id="a2"),
+        SquashChain(branch_ids=("a3",), tip_id="a4"),
+        SquashChain(branch_ids=("b1",), tip_id="b2"),
+    ]
+    assert plan_squash_chains(rows, protected=set(), min_chain_length=4) == [SquashChain(branch_ids=("a1", "a2", "a3"), tip_id="a4")]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+
+from nexus_babel.services.evolution_diff import compare_texts, diff_texts, edit_distance
+
+
+def _levenshtein(left: str, right: str) -> int:
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, 1):
+        current = [i]
+        for j, right_char in enumerate(right, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (left_char != right_char)))
+        previous = current
+    return previous[-1]
+
+
+def _apply_hunks(left: str, right: str) -> str:
+    out: list[str] = []
+    at = 0
+    for hunk in diff_texts(left, right).hunks:
+        assert hunk.left_start >= at
+        out.append(left[at : hunk.left_start])
+        out.append(right[hunk.right_start : hunk.right_end])
+        at = hunk.left_end
+    out.append(left[at:])
+    return "".join(out)
+
+
+def test_diff_hunks_rebuild_the_right_text_and_distance_is_exact_levenshtein():
+    rng = random.Random(7)
+    words = ["the", "fox", "jumps", "over", "lazy", "dog", ",", ".", "mythic"]
+    for _ in range(500):
+        left = " ".join(rng.choice(words) for _ in range(rng.randint(0, 25)))
+        chars = list(left)
+        for _ in range(rng.randint(0, 6)):
+            if chars and rng.random() < 0.5:
+                del chars[rng.randrange(len(chars))]
+            else:
+                chars.insert(rng.randint(0, len(chars)), rng.choice("xyz ."))
+        right = "".join(chars)
+        assert _apply_hunks(left, right) == right
+        assert edit_distance(left, right) == (_levenshtein(left, right), True)
+
+
+def test_large_texts_split_at_patience_anchors_and_bound_reported_spans():
+    rng = random.Random(3)
+    tokens = [f"w{index}" for index in range(60_000)]
+    changed = list(tokens)
+    for index in rng.sample(range(len(tokens)), 150):
+        changed[index] = "CHANGED"
+    left, right = " ".join(tokens), " ".join(changed)
+
+    diff = diff_texts(left, right)
+    assert len(diff.hunks) == 150
+    assert diff.approximate is False
+    assert _apply_hunks(left, right) == right
+
+    report = compare_texts(left, right, max_spans=10)
+    assert report["hunk_count"] == 150
+    assert len(report["changed_spans"]) == 10
+    assert report["spans_truncated"] is True
+    assert report["distance"] >= 150
+
+
+def test_unrelated_large_texts_split_at_shared_tokens_instead_of_one_block():
+    vocab = [f"w{index}" for index in range(40)]
+    left_rng, right_rng = random.Random(11), random.Random(12)
+    left = " ".join(left_rng.choice(vocab) for _ in range(12_000))
+    right = " ".join(right_rng.choice(vocab) for _ in range(12_000))
+
+    diff = diff_texts(left, right)
+    assert diff.approximate is True
+    assert len(diff.hunks) > 1_000
+    assert _apply_hunks(left, right) == right
+
+    distance, exact = edit_distance(left, right, diff=diff, max_cells=1_000_000)
+    assert exact is False
+    assert distance < max(len(left), len(right))
+
+
+def test_edit_distance_caps_the_length_of_either_side():
+    long_text = "x" * 5_000
+
+    assert edit_distance(long_text, "abc", max_chars=1_000) == (5_000, False)
+    assert edit_distance(long_text, "", max_chars=1_000) == (5_000, True)
+    assert edit_distance(long_text, "abc") == (5_000, True)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import random
+import re
+import sys
+
 import pytest
 
+from nexus_babel.services import evolution_drift, evolution_kernels
 from nexus_babel.services.evolution_events import (
     GLYPH_POOL,
     MERGE_STRATEGIES,
@@ -102,3 +108,72 @@ def test_apply_event_merge_diff_summary_contains_contract_keys():
         "after_chars",
     }.issubset(result.diff_summary.keys())
     assert result.diff_summary["event"] == "merge"
+
+
+def test_single_scan_drift_matches_sequential_cascade(monkeypatch):
+    monkeypatch.setattr(evolution_drift, "MIN_CASCADE_CHARS", 0)
+    rng = random.Random(40)
+    alphabet = "thaeplckionxwgrusfbmTHAEPLCKIONXWGRUSFBM þæÞÆİıſKΣσß.,;\n-'"
+    samples = ["", "Though the knight's phoenix ACTION knew", "þe Æther fiſh İLIGHT Knight"]
+    samples += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 400))) for _ in range(200)]
+    for text in samples:
+        assert evolution_drift.natural_drift(text, NATURAL_MAP) == evolution_drift.sequential_natural_drift(text, NATURAL_MAP)
+        assert evolution_drift.reverse_drift(text, REVERSE_NATURAL_MAP) == evolution_drift.sequential_reverse_drift(
+            text, REVERSE_NATURAL_MAP
+        )
+
+
+def test_drift_alphabet_matches_a_scan_of_every_code_point():
+    every_char = "".join(map(chr, range(sys.maxunicode + 1)))
+    for drift_map in (NATURAL_MAP, REVERSE_NATURAL_MAP, {"µſ": "", "ϑΩṡт": ""}):
+        pattern_chars = frozenset("".join(drift_map))
+        probe = re.compile("[" + "".join(re.escape(char) for char in sorted(pattern_chars)) + "]", re.IGNORECASE)
+        expected = set(probe.findall(every_char))
+        expected.update(
+            char for char in every_char if char.lower() != char and not pattern_chars.isdisjoint(char.lower())
+        )
+        assert evolution_drift.active_chars(pattern_chars) == "".join(sorted(expected))
+
+
+def test_short_texts_skip_the_run_cascade():
+    evolution_drift._natural_cascade.cache_clear()
+    text = "Though the knight's phoenix ACTION knew"
+    expected = evolution_drift.sequential_natural_drift(text, NATURAL_MAP)
+    assert evolution_drift.natural_drift(text, NATURAL_MAP) == expected
+    assert evolution_drift._natural_cascade.cache_info().currsize == 0
+
+
+def test_drift_falls_back_to_sequential_cascade_for_regex_keys():
+    regex_map = {"t.": "T", "a": "b"}
+    text = "that tall cat"
+    assert evolution_drift.natural_drift(text, regex_map) == evolution_drift.sequential_natural_drift(text, regex_map)
+
+
+def test_linear_mutation_kernels_match_reference_rng_consumption():
+    rng = random.Random(41)
+    alphabet = "aeiouAEIOUbcdxyz _-9.,\nİıéÅ∆"
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+        seed = rng.randint(0, 2**32)
+        probability = rng.random()
+        assert evolution_kernels.drop_vowels(text, random.Random(seed), probability) == evolution_kernels.drop_vowels_reference(
+            text, random.Random(seed), probability
+        )
+        assert evolution_kernels.mutate_words(text, random.Random(seed), probability, GLYPH_POOL) == (
+            evolution_kernels.mutate_words_reference(text, random.Random(seed), probability, GLYPH_POOL)
+        )
+
+
+def test_mutation_kernels_keep_golden_outputs():
+    # Hashes recorded from the original list.pop()/findall kernels; they pin event_hash compatibility.
+    text = "The quick brown fox jumps over the lazy dog. " * 40
+    golden = {
+        ("phase_shift", "compression"): "151bcb3ff0a4558515f3a04526bd8bbfd5e90afa1b948596637d2bd81376cc6c",
+        ("phase_shift", "rebirth"): "7dc34c015544a30ad0bda1d03f851c85a0300d956576ba1342cff44d716321b0",
+        ("synthetic_mutation", None): "5611f74d2a1f3c766f04e4f014cda1bc20e56882b4e4a4d32fabfa755b63c882",
+    }
+    for (event_type, phase), expected in golden.items():
+        payload = {"seed": 3, "phase": phase} if phase else {"seed": 3, "mutation_rate": 0.3}
+        result = _apply(text, event_type, payload)
+        assert hashlib.sha256(result.output_text.encode("utf-8")).hexdigest() == expected
+    assert _apply(text, "synthetic_mutation", {"seed": 3, "mutation_rate": 0.3}).diff_summary["mutations"] == 103
@@ -9,6 +9,7 @@
     find_lca,
     merge_texts,
     simple_distance,
+    three_way_merge,
 )
 
 
@@ -22,6 +23,7 @@ def test_merge_texts_strategies():
     assert merge_texts("left", "right", "left_wins") == "left"
     assert merge_texts("left", "right", "right_wins") == "right"
     assert merge_texts("one two", "alpha beta gamma", "interleave") == "one alpha two beta gamma"
+    assert merge_texts("a b X", "Y b c", "three_way", base_text="a b c") == "Y b X"
 
 
 def test_merge_conflict_semantics_resolution_labels_and_keyset():
@@ -89,3 +91,31 @@ def _lineage(_session, branch):
 
     assert find_lca(None, left, right, lineage_fn=_lineage).id == "root"  # type: ignore[arg-type]
     assert find_lca(None, left, other_root, lineage_fn=_lineage) is None  # type: ignore[arg-type]
+
+
+def test_three_way_merge_applies_disjoint_hunks_and_records_conflicts():
+    base = "the fox jumps over the lazy dog. the bird sings at dawn."
+    left = "the red fox jumps over the lazy dog. the bird sings at dawn."
+    right = "the fox jumps over the lazy cat. the bird sings at dusk!"
+
+    clean = three_way_merge(base, left, right)
+    assert clean.merged_text == "the red fox jumps over the lazy cat. the bird sings at dusk!"
+    assert clean.conflicts == []
+    assert (clean.applied_left, clean.applied_right) == (1, clean.right_hunk_count)
+
+    both = three_way_merge(base, left, left.replace("dawn", "noon"))
+    assert both.identical_changes == 1
+    assert both.merged_text == left.replace("dawn", "noon")
+
+    conflicting = three_way_merge(base, base.replace("lazy", "sleepy"), base.replace("lazy", "busy"))
+    assert conflicting.merged_text == base.replace("lazy", "sleepy")
+    assert conflicting.conflicts == [
+        {
+            "base_start": base.index("lazy"),
+            "base_end": base.index("lazy") + len("lazy"),
+            "base_text": "lazy",
+            "left_text": "sleepy",
+            "right_text": "busy",
+            "resolution": "left",
+        }
+    ]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from nexus_babel.services.evolution_text import TextLRUCache, apply_splice, encode_text_delta
+
+
+def test_text_delta_splice_round_trip():
+    base = "the quick brown fox jumps over the lazy dog " * 20
+    edited = base[:100] + "GLYPH" + base[107:]
+    delta = encode_text_delta("parent", base, edited)
+    assert delta["op"] == "splice"
+    assert delta["base_branch_id"] == "parent"
+    assert len(delta["insert"]) <= 8
+    assert apply_splice(base, delta) == edited
+
+    assert apply_splice(base, encode_text_delta("parent", base, base)) == base
+    assert apply_splice("aaaa", encode_text_delta("parent", "aaaa", "aa")) == "aa"
+
+
+def test_text_delta_falls_back_to_event_replay_for_global_rewrites():
+    base = "the quick brown fox " * 50
+    delta = encode_text_delta("parent", base, base.upper())
+    assert delta == {"op": "replay", "base_branch_id": "parent"}
+
+
+def test_text_lru_cache_is_bounded_by_characters():
+    cache = TextLRUCache(max_chars=10)
+    cache.put(("a", "h"), "12345")
+    cache.put(("b", "h"), "12345")
+    assert cache.get(("a", "h")) == "12345"
+    cache.put(("c", "h"), "123")
+    # "b" was least recently used once "a" was read back.
+    assert cache.get(("b", "h")) is None
+    assert cache.get(("a", "h")) == "12345"
+    assert cache.size_chars == 8
+    cache.put(("huge", "h"), "x" * 11)
+    assert cache.get(("huge", "h")) is None
+    assert len(cache) == 2
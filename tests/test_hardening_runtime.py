@@ -11,7 +11,7 @@
 from nexus_babel.main import create_app
 from nexus_babel.models import ApiKey, ModePolicy
 
-API_V1_OPERATION_COUNT = 31
+API_V1_OPERATION_COUNT = 33
 MVP_NEXT_ROADMAP_BASELINE_TEST_COUNT = 129
 
 
@@ -3,9 +3,20 @@
 import random
 from dataclasses import dataclass
 
+import pytest
+
+from nexus_babel.services import remix_sweep
+from nexus_babel.services.remix_cache import RemixResultCache
 from nexus_babel.services.remix_compose import compose_text
 from nexus_babel.services.remix_context import join_atoms_for_strategy, preferred_levels_for_strategy
-from nexus_babel.services.remix_hashing import build_payload_hash, build_remix_rng
+from nexus_babel.services.remix_hashing import (
+    build_payload_hash,
+    build_remix_rng,
+    build_request_key,
+    build_rng_seed_hex_from_hashes,
+    sha256_text,
+)
+from nexus_babel.services.remix_sweep import remix_one, run_sweep, sweep_combinations
 
 
 @dataclass
@@ -79,7 +90,8 @@ def test_compose_text_uses_atom_levels_and_returns_refs():
         "branch_id": None,
         "root_document_id": "src",
         "text": "ignored source text",
-        "atoms_by_level": {"word": source_atoms},
+        "atom_levels": ["word"],
+        "atom_rows": {"word": source_atoms}.get,
     }
     target_ctx = {
         "role": "target",
@@ -87,7 +99,8 @@ def test_compose_text_uses_atom_levels_and_returns_refs():
         "branch_id": None,
         "root_document_id": "tgt",
         "text": "ignored target text",
-        "atoms_by_level": {"word": target_atoms},
+        "atom_levels": ["word"],
+        "atom_rows": {"word": target_atoms}.get,
     }
 
     remixed, refs = compose_text(
@@ -103,3 +116,89 @@ def test_compose_text_uses_atom_levels_and_returns_refs():
     assert remixed == "one alpha two beta"
     assert [r["atom_id"] for r in refs] == ["s1", "s2", "t1", "t2"]
     assert [r["role"] for r in refs] == ["source", "source", "target", "target"]
+
+
+def test_request_key_tracks_inputs_and_result_cache_evicts_lru():
+    kwargs = {
+        "strategy": "interleave",
+        "seed": 1,
+        "mode": "public",
+        "source_document_id": "doc-a",
+        "source_branch_id": None,
+        "target_document_id": "doc-b",
+        "target_branch_id": None,
+        "atom_levels": ["word"],
+        "source_fingerprint": "document:doc-a:sum-a",
+        "target_fingerprint": "document:doc-b:sum-b",
+        "policy_fingerprint": "1:",
+    }
+    key = build_request_key(**kwargs)
+    assert key == build_request_key(**{**kwargs, "mode": "PUBLIC"})
+    assert key != build_request_key(**{**kwargs, "source_fingerprint": "document:doc-a:sum-c"})
+    assert key != build_request_key(**{**kwargs, "policy_fingerprint": "2:"})
+
+    cache = RemixResultCache(max_entries=2)
+    cache.put("a", {"text_hash": "1"})
+    cache.put("b", {"text_hash": "2"})
+    assert cache.get("a") == {"text_hash": "1"}
+    cache.put("c", {"text_hash": "3"})
+    assert cache.get("b") is None
+    cache.get("a")["text_hash"] = "mutated"
+    assert cache.get("a") == {"text_hash": "1"}
+    cache.record(hit=True, artifact=True)
+    cache.record(hit=False)
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 1, "artifact_hits": 1, "misses": 1}
+
+
+def test_run_sweep_reports_progress_per_chunk(monkeypatch):
+    monkeypatch.setattr(remix_sweep, "IN_PROCESS_CHUNK", 4)
+    strategy_texts = {"interleave": ("alpha beta", "gamma delta")}
+    items = [("interleave", f"{seed:064x}") for seed in range(10)]
+    reported: list[int] = []
+
+    texts, workers = run_sweep(strategy_texts, items, progress=reported.append)
+
+    assert workers == 1
+    assert texts == [remix_one(strategy_texts, strategy, seed_hex) for strategy, seed_hex in items]
+    assert reported == [4, 8, 10]
+
+
+def test_sweep_remixes_match_compose_text_and_combinations_are_bounded():
+    source_atoms = {"word": [_AtomStub("s1", "word", 0, "alpha"), _AtomStub("s2", "word", 1, "beta")]}
+    target_atoms = {"word": [_AtomStub("t1", "word", 0, "gamma"), _AtomStub("t2", "word", 1, "delta")]}
+    source_ctx = {"atom_levels": ["word"], "atom_rows": source_atoms.get}
+    target_ctx = {"atom_levels": ["word"], "atom_rows": target_atoms.get}
+    strategy_texts = {"thematic_blend": ("alpha beta", "gamma delta")}
+    for seed in (0, 1, 2):
+        rng, seed_hex = build_remix_rng(
+            strategy="thematic_blend", seed=seed, source_text="A B", target_text="C D", atom_levels=["word"]
+        )
+        assert seed_hex == build_rng_seed_hex_from_hashes(
+            strategy="thematic_blend",
+            seed=seed,
+            source_hash=sha256_text("A B"),
+            target_hash=sha256_text("C D"),
+            atom_levels=["word"],
+        )
+        expected, _ = compose_text(
+            source_text="A B",
+            target_text="C D",
+            strategy="thematic_blend",
+            rng=rng,
+            source_ctx=source_ctx,
+            target_ctx=target_ctx,
+            atom_levels=["word"],
+        )
+        assert remix_one(strategy_texts, "thematic_blend", seed_hex) == expected
+        assert run_sweep(strategy_texts, [("thematic_blend", seed_hex)], workers=4) == ([expected], 1)
+
+    assert sweep_combinations(["interleave", "glyph_collide", "interleave"], [2, 1, 2]) == [
+        ("interleave", 2),
+        ("interleave", 1),
+        ("glyph_collide", 2),
+        ("glyph_collide", 1),
+    ]
+    with pytest.raises(ValueError, match="at least one strategy and one seed"):
+        sweep_combinations(["interleave"], [])
+    with pytest.raises(ValueError, match="exceeds the limit"):
+        sweep_combinations(["interleave", "glyph_collide"], list(range(5001)))
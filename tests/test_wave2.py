@@ -1,8 +1,27 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+import asyncio
+import gzip
+import json
+import time
+from datetime import timedelta
 
-from nexus_babel.models import AnalysisRun
+from sqlalchemy import func, select
+
+from nexus_babel.api.routes.jobs import _job_event_stream
+from nexus_babel.models import (
+    AnalysisRun,
+    AuditLog,
+    Branch,
+    BranchAncestry,
+    BranchCheckpoint,
+    BranchEvent,
+    Job,
+    JobAttempt,
+    utcnow,
+)
+from nexus_babel.services.job_queues import WeightedQueueScheduler
+from nexus_babel.worker import run_worker
 
 
 def _ingest_one(client, sample_corpus, headers):
@@ -149,3 +168,744 @@ def test_hypergraph_query_and_audit_decisions(client, sample_corpus, auth_header
     rows = audit.json()["decisions"]
     assert rows
     assert "decision_trace" in rows[0]
+
+
+def _submit_analyze_jobs(client, headers, doc_id: str, count: int) -> list[str]:
+    job_ids = []
+    for _ in range(count):
+        submit = client.post(
+            "/api/v1/jobs/submit",
+            headers=headers,
+            json={"job_type": "analyze", "execution_mode": "async", "payload": {"document_id": doc_id, "mode": "PUBLIC"}},
+        )
+        assert submit.status_code == 200, submit.text
+        job_ids.append(submit.json()["job_id"])
+    return job_ids
+
+
+def test_lease_next_claims_each_job_once(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    job_ids = _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 2)
+    job_service = client.app.state.job_service
+
+    leased = []
+    for worker_name in ("worker-a", "worker-b", "worker-c"):
+        session = client.app.state.db.session()
+        try:
+            job = job_service.lease_next(session, worker_name)
+            leased.append((worker_name, job.id if job else None, job.lease_owner if job else None))
+            session.commit()
+        finally:
+            session.close()
+
+    assert [row[1] for row in leased[:2]] == job_ids
+    assert [row[2] for row in leased[:2]] == ["worker-a", "worker-b"]
+    assert leased[2][1] is None
+
+
+def test_run_worker_concurrency_processes_all_jobs(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    job_ids = _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 4)
+    client.app.state.settings.worker_poll_seconds = 0.1
+
+    processed = run_worker(app=client.app, max_jobs=4, concurrency=2)
+    assert processed == 4
+
+    for job_id in job_ids:
+        status = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers["viewer"])
+        assert status.json()["status"] == "succeeded"
+
+
+def test_lease_batch_renew_and_release(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    job_ids = _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 3)
+    job_service = client.app.state.job_service
+
+    session = client.app.state.db.session()
+    try:
+        leased = job_service.lease_batch(session, "prefetch-worker", limit=2)
+        assert [job.id for job in leased] == job_ids[:2]
+        assert {job.lease_owner for job in leased} == {"prefetch-worker"}
+        first_expiry = leased[0].lease_expires_at
+        session.commit()
+
+        assert job_service.renew_leases(session, "other-worker", [job.id for job in leased]) == 0
+        assert job_service.renew_leases(session, "prefetch-worker", [job.id for job in leased]) == 2
+        session.commit()
+        probe = job_service.lease_batch(session, "probe-worker", limit=5)
+        assert [job.id for job in probe] == [job_ids[2]]
+
+        assert job_service.release_leases(session, "prefetch-worker", [leased[1].id]) == 1
+        session.commit()
+        session.expire_all()
+        released = job_service.get_job(session, leased[1].id)
+        assert released["status"] == "queued"
+        assert released["lease_owner"] is None
+        assert released["attempt_count"] == 0
+        assert job_service.get_job(session, leased[0].id)["lease_expires_at"] >= first_expiry
+    finally:
+        session.close()
+
+
+def test_lease_batch_orders_by_queue_weight_and_priority(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    headers = auth_headers["operator"]
+    job_service = client.app.state.job_service
+
+    def _submit(job_type: str, payload: dict, **extra) -> dict:
+        response = client.post("/api/v1/jobs/submit", headers=headers, json={"job_type": job_type, "payload": payload, **extra})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    audit = _submit("integrity_audit", {})
+    plain, urgent = (
+        _submit("analyze", {"document_id": doc_id, "mode": "PUBLIC"}),
+        _submit("analyze", {"document_id": doc_id, "mode": "PUBLIC"}, priority=5),
+    )
+    assert audit["queue"] == "bulk"
+    assert plain["queue"] == urgent["queue"] == "interactive"
+    bad = client.post("/api/v1/jobs/submit", headers=headers, json={"job_type": "analyze", "queue": "nope"})
+    assert bad.status_code == 400
+
+    session = client.app.state.db.session()
+    try:
+        first = job_service.lease_batch(session, "worker-a", limit=1)
+        assert [job.id for job in first] == [urgent["job_id"]]
+        bulk_only = job_service.lease_batch(session, "bulk-worker", limit=5, queues=["bulk"])
+        assert [job.id for job in bulk_only] == [audit["job_id"]]
+        assert job_service.seconds_until_next_due(session, ["bulk"]) is None
+        rest = job_service.lease_batch(session, "worker-a", limit=5)
+        assert [job.id for job in rest] == [plain["job_id"]]
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_weighted_queue_scheduler_interleaves_by_weight():
+    scheduler = WeightedQueueScheduler({"interactive": 4, "bulk": 1})
+    assert scheduler.allocate(["interactive", "bulk"], 5) == [("interactive", 4), ("bulk", 1)]
+    picks = [scheduler.allocate(["interactive", "bulk"], 1)[0][0] for _ in range(10)]
+    assert picks.count("bulk") == 2
+    assert scheduler.allocate(["bulk"], 3) == [("bulk", 3)]
+
+
+def test_run_worker_prefetch_respects_job_budget(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    job_ids = _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 5)
+    client.app.state.settings.worker_poll_seconds = 0.1
+
+    assert run_worker(app=client.app, max_jobs=5, prefetch=2) == 5
+    statuses = [client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers["viewer"]).json()["status"] for job_id in job_ids]
+    assert statuses == ["succeeded"] * 5
+
+    more_ids = _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 3)
+    assert run_worker(app=client.app, once=True, prefetch=3) == 1
+    statuses = [client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers["viewer"]).json()["status"] for job_id in more_ids]
+    assert statuses == ["succeeded", "queued", "queued"]
+
+
+def test_job_submit_wakes_idle_listener_after_commit(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    job_service = client.app.state.job_service
+    listener = client.app.state.job_wakeup.listener(client.app.state.db.engine)
+    try:
+        assert listener.wakes_on_submit
+        assert listener.wait(0.01) is False
+
+        session = client.app.state.db.session()
+        try:
+            assert job_service.seconds_until_next_due(session) is None
+            job_service.submit(session, job_type="analyze", payload={"document_id": doc_id})
+            session.rollback()
+        finally:
+            session.close()
+        assert listener.wait(0.05) is False
+
+        _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 1)
+        started = time.perf_counter()
+        assert listener.wait(2.0) is True
+        assert time.perf_counter() - started < 0.5
+
+        session = client.app.state.db.session()
+        try:
+            assert job_service.seconds_until_next_due(session) == 0.0
+        finally:
+            session.close()
+    finally:
+        listener.close()
+
+
+def test_complete_stale_leases_distinguishes_slow_from_crashed_workers(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    slow_id, crashed_id = _submit_analyze_jobs(client, auth_headers["operator"], doc_id, 2)
+    job_service = client.app.state.job_service
+
+    session = client.app.state.db.session()
+    try:
+        for job_id, worker_name in ((slow_id, "slow-worker"), (crashed_id, "crashed-worker")):
+            job_service.lease_next(session, worker_name)
+            assert job_service.begin_leased(session, job_id, worker_name)
+            assert job_service.heartbeat(session, job_id, worker_name) is True
+        assert job_service.heartbeat(session, slow_id, "crashed-worker") is False
+        session.commit()
+
+        now = utcnow()
+        slow = session.get(Job, slow_id)
+        slow.lease_expires_at = now - timedelta(seconds=1)
+        crashed = session.get(Job, crashed_id)
+        crashed.lease_expires_at = now - timedelta(seconds=1)
+        crashed.heartbeat_at = now - timedelta(seconds=client.app.state.settings.worker_heartbeat_timeout_seconds + 5)
+        session.commit()
+
+        assert job_service.complete_stale_leases(session, "recovery-worker") == 1
+        session.commit()
+
+        slow_view = job_service.get_job(session, slow_id)
+        crashed_view = job_service.get_job(session, crashed_id)
+        assert slow_view["status"] == "running"
+        assert slow_view["lease_owner"] == "slow-worker"
+        assert crashed_view["status"] == "retry_wait"
+        assert "crashed-worker stopped heartbeating" in crashed_view["error_text"]
+        assert [a["status"] for a in crashed_view["attempts"]] == ["abandoned"]
+    finally:
+        session.close()
+
+
+def test_worker_heartbeats_long_running_job(client, monkeypatch):
+    job_service = client.app.state.job_service
+    client.app.state.settings.worker_heartbeat_seconds = 0.05
+
+    def _slow_dispatch(_session, _job, _checkpoint=None):
+        time.sleep(0.4)
+        return {"ok": True}
+
+    monkeypatch.setattr(job_service, "_dispatch", _slow_dispatch)
+    session = client.app.state.db.session()
+    try:
+        job_id = job_service.submit(session, job_type="integrity_audit", payload={}).id
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, max_jobs=1) == 1
+
+    session = client.app.state.db.session()
+    try:
+        job = session.get(Job, job_id)
+        assert job.status == "succeeded"
+        assert job.lease_owner is None
+        attempt = session.scalar(select(JobAttempt).where(JobAttempt.job_id == job_id))
+        assert attempt.status == "succeeded"
+        assert job.heartbeat_at is not None
+        assert job.heartbeat_at > attempt.started_at
+    finally:
+        session.close()
+
+
+def test_ingest_batch_fans_out_chunk_jobs_and_reduces(client, sample_corpus, auth_headers):
+    headers = auth_headers["operator"]
+    job_service = client.app.state.job_service
+    paths = [str(sample_corpus["text"]), str(sample_corpus["clean_yaml"]), str(sample_corpus["pdf"])]
+    submit = client.post(
+        "/api/v1/jobs/submit",
+        headers=headers,
+        json={"job_type": "ingest_batch", "payload": {"source_paths": paths, "parse_options": {"atomize": True}}},
+    )
+    assert submit.status_code == 200, submit.text
+    assert run_worker(app=client.app, once=True) == 1
+
+    parent = client.get(f"/api/v1/jobs/{submit.json()['job_id']}", headers=headers).json()
+    assert parent["status"] == "waiting"
+    assert parent["artifacts"] == []
+    assert parent["result"]["fan_out"] is True
+    reducer_id = parent["result"]["reducer_job_id"]
+    chunk_ids = parent["result"]["child_job_ids"]
+    assert len(chunk_ids) == 3
+
+    session = client.app.state.db.session()
+    try:
+        leased = [job.id for job in job_service.lease_batch(session, "probe", limit=10)]
+        assert sorted(leased) == sorted(chunk_ids)
+        job_service.release_leases(session, "probe", leased)
+        job_service.cancel(session, chunk_ids[2])
+        session.commit()
+    finally:
+        session.close()
+
+    reducer = client.get(f"/api/v1/jobs/{reducer_id}", headers=headers).json()
+    assert reducer["parent_job_id"] == parent["job_id"]
+    assert reducer["child_status_counts"] == {"queued": 2, "cancelled": 1}
+
+    assert run_worker(app=client.app, max_jobs=3) == 3
+    reducer = client.get(f"/api/v1/jobs/{reducer_id}", headers=headers).json()
+    assert reducer["status"] == "succeeded"
+    assert reducer["result"]["chunk_count"] == 3
+
+    ingest = client.get(f"/api/v1/ingest/jobs/{parent['result']['ingest_job_id']}", headers=headers).json()
+    assert ingest["status"] == "completed_with_errors"
+    assert [f["path"] for f in ingest["files"]] == paths
+    assert ingest["files"][2]["status"] == "error"
+    assert ingest["documents_ingested"] == 2
+    assert ingest["provenance_digest"] == reducer["result"]["provenance_digest"]
+
+    # The parent finishes with the reducer and keeps the synchronous result contract.
+    parent = client.get(f"/api/v1/jobs/{parent['job_id']}", headers=headers).json()
+    assert parent["status"] == "succeeded"
+    assert parent["result"]["documents_ingested"] == 2
+    assert parent["result"]["provenance_digest"] == reducer["result"]["provenance_digest"]
+    assert parent["result"]["atoms_created"] == reducer["result"]["atoms_created"]
+    assert [a["artifact_payload"]["documents_ingested"] for a in parent["artifacts"]] == [2]
+
+
+def test_cancelling_a_fanned_out_ingest_batch_cancels_its_pending_chunks(client, sample_corpus, auth_headers):
+    headers = auth_headers["operator"]
+    paths = [str(sample_corpus["text"]), str(sample_corpus["clean_yaml"])]
+    submit = client.post(
+        "/api/v1/jobs/submit",
+        headers=headers,
+        json={"job_type": "ingest_batch", "payload": {"source_paths": paths}},
+    )
+    assert submit.status_code == 200, submit.text
+    assert run_worker(app=client.app, once=True) == 1
+    parent = client.get(f"/api/v1/jobs/{submit.json()['job_id']}", headers=headers).json()
+    assert parent["status"] == "waiting"
+
+    cancelled = client.post(f"/api/v1/jobs/{parent['job_id']}/cancel", headers=headers)
+    assert cancelled.status_code == 200, cancelled.text
+    assert cancelled.json()["status"] == "cancelled"
+    for job_id in [parent["result"]["reducer_job_id"], *parent["result"]["child_job_ids"]]:
+        assert client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()["status"] == "cancelled"
+    assert run_worker(app=client.app, once=True) == 0
+
+
+def test_integrity_audit_resumes_from_committed_checkpoint(client, sample_corpus, auth_headers):
+    paths = [str(sample_corpus[key]) for key in ("text", "clean_yaml", "pdf")]
+    ingest = client.post("/api/v1/ingest/batch", headers=auth_headers["operator"], json={"source_paths": paths})
+    assert ingest.status_code == 200, ingest.text
+    hypergraph = client.app.state.hypergraph
+    real_integrity = hypergraph.integrity_for_documents
+    pages: list[int] = []
+
+    def _flaky_integrity(rows):
+        pages.append(len(rows))
+        if len(pages) == 2:
+            raise RuntimeError("neo4j unavailable")
+        return real_integrity(rows)
+
+    hypergraph.integrity_for_documents = _flaky_integrity
+    session = client.app.state.db.session()
+    try:
+        job_id = client.app.state.job_service.submit(session, job_type="integrity_audit", payload={"page_size": 1}).id
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, once=True) == 1
+    session = client.app.state.db.session()
+    try:
+        job = session.get(Job, job_id)
+        assert job.status == "retry_wait"
+        assert job.result["complete"] is False
+        assert job.result["document_count"] == 1
+        checkpoint_id = job.result["checkpoint"]["after_document_id"]
+        job.next_run_at = utcnow()
+        job.lease_expires_at = None
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, once=True) == 1
+    status = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers["viewer"]).json()
+    assert status["status"] == "succeeded"
+    assert status["result"]["complete"] is True
+    assert status["result"]["document_count"] == status["result"]["total_documents"] == 3
+    assert status["result"]["resumed_from"] == checkpoint_id
+    assert pages == [1, 1, 1, 1]
+
+
+def test_integrity_for_documents_verifies_page_in_one_neo4j_query(client):
+    hypergraph = client.app.state.hypergraph
+    queries: list[dict] = []
+
+    class _Result:
+        def __init__(self, ids):
+            self.ids = ids
+
+        def data(self):
+            return [{"id": i, "document_nodes": 1, "atom_nodes": 2, "contains_edges": 2 if i == "a" else 1} for i in self.ids]
+
+    class _Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_exc):
+            return False
+
+        def run(self, query, **params):
+            queries.append(params)
+            return _Result(params["ids"])
+
+    class _Driver:
+        def session(self):
+            return _Session()
+
+    hypergraph._driver = _Driver()
+    try:
+        rows = [
+            {"id": doc_id, "atom_count": 2, "graph_projected_atom_count": 2, "graph_projection_status": "complete"}
+            for doc_id in ("a", "b")
+        ]
+        reports = hypergraph.integrity_for_documents(rows)
+    finally:
+        hypergraph._driver = None
+
+    assert queries == [{"ids": ["a", "b"]}]
+    assert [r["neo4j_verified"] for r in reports] == [True, True]
+    assert [r["consistent"] for r in reports] == [True, False]
+
+
+def test_job_progress_record_and_event_stream(client, sample_corpus, auth_headers):
+    paths = [str(sample_corpus[key]) for key in ("text", "clean_yaml", "pdf")]
+    ingest = client.post("/api/v1/ingest/batch", headers=auth_headers["operator"], json={"source_paths": paths})
+    assert ingest.status_code == 200, ingest.text
+    client.app.state.settings.job_progress_interval_seconds = 0.0
+    session = client.app.state.db.session()
+    try:
+        job_id = client.app.state.job_service.submit(session, job_type="integrity_audit", payload={"page_size": 1}).id
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, once=True) == 1
+    status = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers["viewer"]).json()
+    progress = status["progress"]
+    assert progress["done"] == progress["total"] == 3
+    assert progress["unit"] == "documents"
+    assert progress["percent"] == 100.0
+    assert progress["eta_seconds"] == 0.0
+
+    with client.stream("GET", f"/api/v1/jobs/{job_id}/events", headers=auth_headers["viewer"]) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    events = [block.split("\n") for block in body.strip().split("\n\n")]
+    assert [lines[0] for lines in events] == ["event: progress", "event: result"]
+    assert '"status": "succeeded"' in events[1][1]
+
+    missing = client.get("/api/v1/jobs/does-not-exist/events", headers=auth_headers["viewer"])
+    assert missing.status_code == 404
+
+
+def test_sqlite_ingest_progress_is_written_inside_the_job_transaction(client, sample_corpus, auth_headers):
+    client.app.state.settings.job_progress_interval_seconds = 0.0
+    paths = [str(sample_corpus[key]) for key in ("text", "clean_yaml")]
+    submit = client.post(
+        "/api/v1/jobs/submit",
+        headers=auth_headers["operator"],
+        json={"job_type": "ingest_batch", "payload": {"source_paths": paths, "fan_out": False}},
+    )
+    assert submit.status_code == 200, submit.text
+    assert run_worker(app=client.app, once=True) == 1
+
+    # The ingest transaction holds SQLite's write lock, so progress lands with the job's commit.
+    status = client.get(f"/api/v1/jobs/{submit.json()['job_id']}", headers=auth_headers["viewer"]).json()
+    assert status["status"] == "succeeded"
+    assert status["progress"]["done"] == status["progress"]["total"] == 2
+
+
+def test_job_event_stream_ends_when_the_job_is_deleted(client):
+    session = client.app.state.db.session()
+    try:
+        job_id = client.app.state.job_service.submit(session, job_type="integrity_audit", payload={}).id
+        session.commit()
+    finally:
+        session.close()
+
+    class _Request:
+        app = client.app
+
+        async def is_disconnected(self) -> bool:
+            return False
+
+    async def _collect() -> list[str]:
+        events = []
+        stream = _job_event_stream(_Request(), job_id, 0.05)
+        events.append(await stream.__anext__())
+        session = client.app.state.db.session()
+        try:
+            session.delete(session.get(Job, job_id))
+            session.commit()
+        finally:
+            session.close()
+        events.extend([event async for event in stream])
+        return events
+
+    events = asyncio.run(_collect())
+    assert [event.split("\n")[0] for event in events] == ["event: progress", "event: result"]
+    assert '"status": "deleted"' in events[1]
+
+
+def test_retention_sweep_archives_and_deletes_in_batches(client):
+    job_service = client.app.state.job_service
+    old = utcnow() - timedelta(days=400)
+    session = client.app.state.db.session()
+    try:
+        finished = [Job(job_type="analyze", status="succeeded", created_at=old) for _ in range(3)]
+        live = Job(job_type="analyze", status="running", created_at=old)
+        session.add_all([*finished, live])
+        session.flush()
+        session.add_all(
+            [JobAttempt(job_id=job.id, attempt_number=1, status="succeeded", started_at=old, finished_at=old) for job in finished]
+        )
+        session.add_all([AuditLog(action="old", mode="PUBLIC", created_at=old) for _ in range(3)])
+        session.add(AuditLog(action="fresh", mode="PUBLIC"))
+        session.commit()
+        live_id, finished_ids = live.id, sorted(job.id for job in finished)
+
+        preview = job_service.submit(session, job_type="retention_sweep", payload={"dry_run": True}, execution_mode="sync")
+        job_service.execute(session, preview)
+        session.commit()
+        assert preview.result["tables"]["jobs"]["archived"] == 3
+        assert session.scalar(select(func.count()).select_from(Job).where(Job.created_at < old + timedelta(days=1))) == 4
+
+        sweep_id = job_service.submit(session, job_type="retention_sweep", payload={"batch_size": 2}).id
+        assert job_service.schedule_retention(session) is None
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, once=True) == 1
+    session = client.app.state.db.session()
+    try:
+        result = session.get(Job, sweep_id).result
+        assert result["tables"]["job_attempts"]["archived"] == 3
+        assert result["tables"]["jobs"]["archived"] == 3
+        assert result["tables"]["jobs"]["batches"] == 2
+        assert result["tables"]["audit_logs"]["archived"] == 3
+        assert session.get(Job, live_id) is not None
+        assert [row.action for row in session.scalars(select(AuditLog)).all()] == ["fresh"]
+        remaining_old = session.scalars(select(Job).where(Job.created_at < old + timedelta(days=1))).all()
+        assert [job.id for job in remaining_old] == [live_id]
+
+        archived_rows = []
+        for path in result["tables"]["jobs"]["files"]:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                archived_rows += [json.loads(line) for line in handle]
+        assert sorted(row["row"]["id"] for row in archived_rows if row["table"] == "jobs") == finished_ids
+    finally:
+        session.close()
+
+    client.app.state.settings.retention_interval_hours = 24
+    session = client.app.state.db.session()
+    try:
+        first = job_service.schedule_retention(session)
+        assert job_service.schedule_retention(session).id == first.id
+    finally:
+        session.close()
+
+
+def test_branch_replay_batch_replays_shared_prefixes_once_and_reports_mismatches(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+
+    def _evolve(parent=None, **event):
+        response = client.post(
+            "/api/v1/evolve/branch",
+            headers=auth_headers["operator"],
+            json={"root_document_id": None if parent else doc_id, "parent_branch_id": parent, "mode": "PUBLIC", **event},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["new_branch_id"]
+
+    root = _evolve(event_type="natural_drift", event_payload={"seed": 1})
+    trunk = _evolve(root, event_type="phase_shift", event_payload={"phase": "peak", "seed": 2})
+    leaves = [
+        _evolve(trunk, event_type="synthetic_mutation", event_payload={"seed": 3, "mutation_rate": 0.2}),
+        _evolve(trunk, event_type="reverse_drift", event_payload={"seed": 4}),
+        _evolve(_evolve(trunk, event_type="glyph_fusion", event_payload={"seed": 5}), event_type="natural_drift", event_payload={"seed": 6}),
+    ]
+    merge = client.post(
+        "/api/v1/branches/merge",
+        headers=auth_headers["operator"],
+        json={"left_branch_id": leaves[0], "right_branch_id": leaves[1], "strategy": "interleave", "mode": "PUBLIC"},
+    )
+    assert merge.status_code == 200, merge.text
+    leaves.append(merge.json()["new_branch_id"])
+
+    job_service = client.app.state.job_service
+    session = client.app.state.db.session()
+    try:
+        job = job_service.submit(session, job_type="branch_replay_batch", payload={"branch_ids": leaves}, execution_mode="sync")
+        job_service.execute(session, job)
+        session.commit()
+        report = job.result
+        assert job.status == "succeeded"
+        assert report["deterministic"] is True
+        assert report["matched"] == 4
+        # root, trunk, the glyph-fusion step, the four leaves: every shared prefix replayed once.
+        assert report["replayed_branch_count"] == 7
+        assert report["workers"] == 1
+
+        tampered = session.get(Branch, leaves[2])
+        tampered.state_snapshot = {**tampered.state_snapshot, "text_hash": "0" * 64}
+        session.commit()
+        pooled_id = job_service.submit(session, job_type="branch_replay_batch", payload={"root_document_id": doc_id, "workers": 2}).id
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, once=True) == 1
+    session = client.app.state.db.session()
+    try:
+        pooled = session.get(Job, pooled_id)
+        assert pooled.status == "succeeded", pooled.error_text
+        report = pooled.result
+        assert report["workers"] == 2
+        assert report["branch_count"] == 7
+        assert report["deterministic"] is False
+        assert report["mismatches"] == [
+            {"branch_id": leaves[2], "expected_hash": "0" * 64, "replayed_hash": report["mismatches"][0]["replayed_hash"]}
+        ]
+        assert report["matched"] == 6
+    finally:
+        session.close()
+
+
+def test_branch_compaction_collects_abandoned_leaves_and_squashes_chains(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+
+    def _evolve(parent=None, seed=1):
+        response = client.post(
+            "/api/v1/evolve/branch",
+            headers=auth_headers["operator"],
+            json={
+                "root_document_id": None if parent else doc_id,
+                "parent_branch_id": parent,
+                "mode": "PUBLIC",
+                "event_type": "synthetic_mutation",
+                "event_payload": {"seed": seed, "mutation_rate": 0.1},
+            },
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["new_branch_id"]
+
+    root = _evolve()
+    chain = [_evolve(root, seed=2)]
+    for seed in (3, 4, 5):
+        chain.append(_evolve(chain[-1], seed=seed))
+    tip = chain.pop()
+    kept = [_evolve(tip, seed=6), _evolve(tip, seed=7)]
+    abandoned = [_evolve(root, seed=8)]
+    abandoned.append(_evolve(abandoned[0], seed=9))
+    merge_source = _evolve(root, seed=10)
+    merge = client.post(
+        "/api/v1/branches/merge",
+        headers=auth_headers["operator"],
+        json={"left_branch_id": kept[0], "right_branch_id": merge_source, "strategy": "left_wins", "mode": "PUBLIC"},
+    )
+    assert merge.status_code == 200, merge.text
+    kept.append(merge.json()["new_branch_id"])
+
+    job_service = client.app.state.job_service
+    session = client.app.state.db.session()
+    try:
+        aged = [root, *chain, tip, *abandoned, merge_source]
+        for offset, branch_id in enumerate(aged):
+            session.get(Branch, branch_id).created_at = utcnow() - timedelta(days=400 - offset)
+        session.commit()
+        expected_hashes = {branch_id: session.get(Branch, branch_id).state_snapshot["text_hash"] for branch_id in [tip, *kept]}
+
+        preview = job_service.submit(
+            session, job_type="branch_compaction", payload={"dry_run": True, "min_chain_length": 3}, execution_mode="sync"
+        )
+        job_service.execute(session, preview)
+        session.commit()
+        assert preview.result["leaf_branches_deleted"] == 1
+        assert preview.result["chains_squashed"] == 1
+        assert session.scalar(select(func.count()).select_from(Branch)) == 11
+
+        job_id = job_service.submit(session, job_type="branch_compaction", payload={"min_chain_length": 3, "batch_size": 1}).id
+        session.commit()
+    finally:
+        session.close()
+
+    assert run_worker(app=client.app, once=True) == 1
+    session = client.app.state.db.session()
+    try:
+        job = session.get(Job, job_id)
+        assert job.status == "succeeded", job.error_text
+        assert job.result["leaf_branches_deleted"] == 2
+        assert job.result["leaf_batches"] == 2
+        assert job.result["chains_squashed"] == 1
+        assert job.result["chain_branches_removed"] == 3
+        assert job.result["events_moved"] == 3
+        assert job.result["chains_skipped"] == []
+
+        remaining = set(session.scalars(select(Branch.id)).all())
+        assert remaining == {root, tip, merge_source, *kept}
+        folded = session.get(Branch, tip)
+        assert folded.parent_branch_id == root
+        assert folded.state_snapshot["text_delta"] == {"op": "checkpoint", "event_index": 5}
+        assert [event.event_index for event in session.scalars(select(BranchEvent).where(BranchEvent.branch_id == tip)).all()] == [1, 2, 3, 4]
+        assert session.scalar(select(BranchCheckpoint.event_index).where(BranchCheckpoint.branch_id == tip)) == 5
+        assert session.scalar(
+            select(BranchAncestry.depth).where(BranchAncestry.ancestor_id == root, BranchAncestry.descendant_id == kept[2])
+        ) == 3
+        assert session.scalar(select(func.count()).select_from(BranchAncestry).where(BranchAncestry.ancestor_id.in_(chain))) == 0
+
+        report = client.app.state.evolution_service.replay_branches(session, [tip, *kept])
+        assert report["deterministic"] is True
+    finally:
+        session.close()
+
+    client.app.state.evolution_service.text_cache.clear()
+    client.app.state.evolution_service.replay_cache.clear()
+    for branch_id, text_hash in expected_hashes.items():
+        replay = client.post(f"/api/v1/branches/{branch_id}/replay", headers=auth_headers["viewer"])
+        assert replay.status_code == 200, replay.text
+        assert replay.json()["text_hash"] == text_hash
+    assert _evolve(kept[1], seed=11)
+
+
+def test_remix_sweep_job_runs_the_cross_product_in_a_process_pool(client, sample_corpus, auth_headers):
+    doc_id = _ingest_one(client, sample_corpus, auth_headers["operator"])
+    seeds = list(range(20))
+    submitted = client.post(
+        "/api/v1/remix/sweep",
+        headers=auth_headers["operator"],
+        json={
+            "source_document_id": doc_id,
+            "target_document_id": doc_id,
+            "strategies": ["thematic_blend", "glyph_collide"],
+            "seeds": seeds,
+            "execution_mode": "async",
+            "include_results": True,
+            "workers": 2,
+        },
+    )
+    assert submitted.status_code == 200, submitted.text
+    job_id = submitted.json()["job_id"]
+    assert submitted.json()["summary"] == {}
+
+    assert run_worker(app=client.app, once=True) == 1
+    job = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers["viewer"]).json()
+    assert job["status"] == "succeeded", job
+    summary = job["result"]["summary"]
+    assert (summary["combination_count"], summary["persisted"], summary["workers"]) == (40, 40, 2)
+    assert job["artifacts"][0]["artifact_payload"]["combination_count"] == 40
+    assert (job["progress"]["done"], job["progress"]["total"], job["progress"]["unit"]) == (40, 40, "combinations")
+
+    # Pooled results are the ones a single compose produces.
+    row = job["result"]["results"][25]
+    single = client.post(
+        "/api/v1/remix/compose",
+        headers=auth_headers["operator"],
+        json={
+            "source_document_id": doc_id,
+            "target_document_id": doc_id,
+            "strategy": row["strategy"],
+            "seed": row["seed"],
+            "create_branch": False,
+        },
+    ).json()
+    assert single["cache_hit"] is True
+    assert (single["remix_artifact_id"], single["text_hash"]) == (row["remix_artifact_id"], row["text_hash"])